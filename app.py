@@ -1,17 +1,32 @@
 import streamlit as st
 st.set_page_config(layout="wide", page_title="Intelligent Resume Prioritization")
 
-import pandas as pd
 import os
-import io
+import time
 import uuid
-import re
 
-# Import your core logic modules from src
-from src.ml.resume_parser import ResumeParser
-from src.ml.skill_matcher import SkillMatcher
-from src.ml.ranker import ResumeRanker
-from src.nlp.text_cleaner import TextCleaner
+from src.utils.startup import STARTUP_TIMINGS, timed
+from src.utils.metrics import REGISTRY, observe_span
+
+# Import your core logic modules from src.
+# Heavy libraries (torch, transformers, sklearn, nltk, pdfminer, pandas) are imported lazily,
+# so the first page renders before they are loaded.
+with timed("import app modules"):
+    from src.ml.resume_parser import ResumeParser
+    from src.ml.parse_cache import ParseCache
+    from src.ml.skill_matcher import SkillMatcher
+    from src.ml.ranker import ResumeRanker
+    from src.ml.feature_store import ResumeFeatureStore
+    from src.ml.job_description import process_job_description
+    from src.nlp.text_cleaner import TextCleaner
+    from src.nlp.near_duplicates import DEFAULT_DUPLICATE_THRESHOLD, NearDuplicateDetector
+    from src.utils.extraction_pool import ExtractionPool
+
+# Fast startup (default): load the skill model in a background thread while the UI is already
+# interactive; until it is ready, skill matching uses the keyword fallback. Set FAST_STARTUP=0
+# to block on the model load instead.
+FAST_STARTUP = os.environ.get("FAST_STARTUP", "1") != "0"
+RESULTS_PAGE_SIZES = (10, 25, 50, 100)
 # from src.utils.gcp_utils import download_blob_to_memory # Uncomment if you enable GCS fetching
 
 # --- Initialize Core Components (Load models/resources once) ---
@@ -23,42 +38,35 @@ def load_ml_components():
     when the app starts, improving performance.
     """
     st.write("Initializing ML components... (This runs once on app startup)")
-    parser = ResumeParser()
+    parser = ResumeParser(cache=ParseCache()) # Reuses parse results for files uploaded before
     # The SkillMatcher and Ranker could internally make calls to Vertex AI Endpoints
     # For this deployable example, they operate locally.
-    matcher = SkillMatcher() # This will attempt to load a Sentence Transformer model
+    matcher = SkillMatcher(load_in_background=FAST_STARTUP) # This will attempt to load a Sentence Transformer model
     ranker = ResumeRanker()
-    cleaner = TextCleaner() # This will attempt to load NLTK data and SpaCy model
+    cleaner = TextCleaner() # NLTK data is loaded on first use
     return parser, matcher, ranker, cleaner
 
-parser, matcher, ranker, cleaner = load_ml_components()
+with timed("initialize components"):
+    parser, matcher, ranker, cleaner = load_ml_components()
 
-# --- Utility Function for Job Description Processing ---
-def process_job_description(job_description_text: str) -> dict:
-    """
-    Processes the job description to extract requirements.
-    In a real application, this would use more sophisticated NLP/ML
-    (e.g., Named Entity Recognition for specific skills, experience ranges).
+@st.cache_resource
+def load_extraction_pool():
+    """Worker process pool for PDF/DOCX text extraction, shared across reruns.
+    Concurrency, per-file timeout and per-worker memory ceiling come from
+    EXTRACTION_WORKERS, EXTRACTION_TIMEOUT_SECONDS and EXTRACTION_MAX_WORKER_RSS_MB.
     """
-    lower_case_jd = job_description_text.lower()
+    max_workers = int(os.environ.get("EXTRACTION_WORKERS", 0)) or None # Default: one worker per core
+    return ExtractionPool(max_workers=max_workers)
 
-    # Simple extraction of required skills (can be expanded with more NLP)
-    # This regex is a basic example; a real system would use a pre-trained NER model
-    # or a comprehensive skill taxonomy.
-    job_skills_keywords = re.findall(r'\b(python|machine learning|data science|rpa|vertex ai|tensorflow|pytorch|sql|java|javascript|react|cloud|aws|azure|gcp|nlp|deep learning|statistics|docker|kubernetes|ai|ml|big data|spark|hadoop)\b', lower_case_jd)
+extraction_pool = load_extraction_pool()
 
-    # Simple estimation of min experience (e.g., looking for "X years experience")
-    min_experience_match = re.search(r'(\d+)\+\s*years?\s*experience', lower_case_jd)
-    min_experience_years = int(min_experience_match.group(1)) if min_experience_match else 0
-
-    # Simple extraction of required education keywords
-    required_education_keywords = re.findall(r'\b(bachelor\'?s|master\'?s|ph\.?d\.?|degree|b\.\s*tech|m\.\s*tech|mba|computer science|engineering|statistics|mathematics)\b', lower_case_jd)
-
-    return {
-        "required_skills": list(set(job_skills_keywords)), # Get unique skills
-        "min_experience_years": min_experience_years,
-        "required_education": list(set(required_education_keywords))
-    }
+# --- Model status & startup timings ---
+if matcher.is_loading:
+    st.sidebar.info("Semantic skill model is warming up; skill matching uses keyword matching until it is ready.")
+elif not matcher.model_loaded:
+    st.sidebar.warning("Semantic skill model unavailable; skill matching uses keyword matching.")
+with st.sidebar.expander("Startup timings"):
+    st.json(STARTUP_TIMINGS)
 
 # --- Streamlit UI Layout ---
 st.title("🎯 Intelligent Resume Prioritization System")
@@ -77,7 +85,7 @@ job_description = st.text_area(
     placeholder="E.g., 'Seeking a Senior Data Scientist with 5+ years experience in Python, Machine Learning, and Vertex AI. Master's degree in CS preferred...'"
 )
 # Process JD immediately to show detected requirements
-job_requirements = process_job_description(job_description)
+job_requirements = process_job_description(job_description, parser.taxonomy)
 
 st.markdown(f"""
     **Detected Job Requirements:**
@@ -123,6 +131,14 @@ elif resume_upload_method == "Upload Files (PDF/DOCX)":
     )
     st.info("Note: Full text extraction from PDF/DOCX is handled by `pdfminer.six` and `python-docx` in the backend.")
 
+# Repeat applications and lightly edited resubmissions are scored once, with the copies listed under the original
+dedup_columns = st.columns(2)
+dedup_enabled = dedup_columns[0].checkbox("Group near-duplicate resumes", value=True, key="dedup_enabled")
+# The range stretches down to a DUPLICATE_THRESHOLD below 0.5 rather than rejecting it
+dedup_threshold = dedup_columns[1].slider("Near-duplicate similarity threshold", min(0.5, DEFAULT_DUPLICATE_THRESHOLD), 1.0,
+                                          DEFAULT_DUPLICATE_THRESHOLD, 0.01,
+                                          key="dedup_threshold", disabled=not dedup_enabled)
+
 
 # --- Process Button ---
 st.markdown("---")
@@ -134,93 +150,187 @@ if st.button("🚀 Process Resumes", type="primary", use_container_width=True):
         st.warning("No resumes provided. Please paste text or upload files.")
         st.stop()
 
-    processed_resumes = []
+    # Collect the text of every resume first: near-duplicates are clustered before parsing,
+    # so only one representative per cluster is parsed and scored.
+    documents = [] # {"resume_id", "original_source", "text", "parsed_data" (cached or None), "file_bytes"}
 
-    # Process pasted text resumes
+    # Pasted text resumes
     if raw_resumes_text.strip():
         individual_resumes = raw_resumes_text.split('---NEW RESUME---')
         for i, text in enumerate(individual_resumes):
             text = text.strip()
             if text:
-                parsed_data = parser.parse_text(text)
-                processed_resumes.append({
-                    "resume_id": f"pasted_resume_{i+1}",
-                    "original_source": "Pasted Text",
-                    "parsed_data": parsed_data
-                })
+                documents.append({"resume_id": f"pasted_resume_{i+1}", "original_source": "Pasted Text",
+                                  "text": text, "parsed_data": None, "file_bytes": None})
 
-    # Process uploaded files
-    for uploaded_file in uploaded_files:
-        try:
-            file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-            resume_text = ""
-            if file_extension == ".pdf":
-                # Pass BytesIO object to parser
-                resume_text = parser.parse_pdf(io.BytesIO(uploaded_file.getvalue()))
-            elif file_extension == ".docx":
-                # Pass BytesIO object to parser
-                resume_text = parser.parse_docx(io.BytesIO(uploaded_file.getvalue()))
-            else: # Assume .txt or similar
-                resume_text = uploaded_file.getvalue().decode('utf-8', errors='ignore')
-
-            if resume_text:
-                parsed_data = parser.parse_text(resume_text)
-                processed_resumes.append({
-                    "resume_id": str(uuid.uuid4()),
-                    "original_source": uploaded_file.name,
-                    "parsed_data": parsed_data
-                })
-        except Exception as e:
-            st.error(f"Error processing '{uploaded_file.name}': {e}. Ensure it's a valid PDF/DOCX or plain text.")
-            continue
+    # Uploaded files: text extraction runs in worker processes (one slow or malformed
+    # file can't stall the batch); results stream back in completion order.
+    # Files uploaded before are served from the content-addressed parse cache and skip extraction.
+    if uploaded_files:
+        file_bytes = [uploaded_file.getvalue() for uploaded_file in uploaded_files]
+        extracted_by_index = {}
+        to_extract = []
+        for i, uploaded_file in enumerate(uploaded_files):
+            cached = parser.get_cached(file_bytes[i])
+            if cached is not None:
+                extracted_by_index[i] = cached
+            else:
+                to_extract.append(i)
+
+        if to_extract:
+            progress = st.progress(0.0, text="Extracting text from uploaded files...")
+            documents_to_extract = ((uploaded_files[i].name, file_bytes[i]) for i in to_extract)
+            for done, result in enumerate(extraction_pool.extract(documents_to_extract), start=1):
+                progress.progress(done / len(to_extract), text=f"Extracted {result['file_name']}")
+                if not result["ok"]:
+                    st.error(f"Error processing '{result['file_name']}': {result['error']} Ensure it's a valid PDF/DOCX or plain text.")
+                    continue
+                extracted_by_index[to_extract[result["index"]]] = (result["text"], None)
+            progress.empty()
+
+        # Keep upload order so ranking ties break the same way on every run
+        for i in sorted(extracted_by_index):
+            text, parsed_data = extracted_by_index[i]
+            documents.append({"resume_id": str(uuid.uuid4()), "original_source": uploaded_files[i].name,
+                              "text": text, "parsed_data": parsed_data, "file_bytes": file_bytes[i]})
+
+    representatives, clusters = range(len(documents)), {}
+    if dedup_enabled and len(documents) > 1:
+        detector = NearDuplicateDetector(dedup_threshold, cleaner=cleaner)
+        representatives, clusters = detector.group([document["text"] for document in documents])
+    duplicates = {
+        documents[representative]["resume_id"]: [{"resume_id": documents[i]["resume_id"], "original_source": documents[i]["original_source"],
+                                                   "similarity": similarity} for i, similarity in members]
+        for representative, members in clusters.items()
+    }
+
+    processed_resumes = []
+    for i in representatives:
+        document = documents[i]
+        parsed_data = document["parsed_data"]
+        if parsed_data is None:
+            parsed_data = parser.parse_text(document["text"])
+            if document["file_bytes"] is not None:
+                parser.store_cached(document["file_bytes"], document["text"], parsed_data)
+        processed_resumes.append({
+            "resume_id": document["resume_id"],
+            "original_source": document["original_source"],
+            "parsed_data": parsed_data
+        })
 
     if not processed_resumes:
         st.warning("No valid resumes were successfully processed from your input. Please check the format.")
+        st.session_state.pop("feature_store", None)
     else:
-        st.success(f"Successfully processed {len(processed_resumes)} resumes.")
-        with st.spinner("Ranking candidates..."):
-            # Rank the parsed resumes using the ML models
-            # This call can implicitly trigger API calls to Vertex AI Endpoints if configured in matcher/ranker
-            ranked_candidates = ranker.rank_resumes(processed_resumes, job_requirements, matcher)
-
-        st.subheader("📊 Ranked Candidates")
-        if ranked_candidates:
-            # Prepare data for display
-            display_data = []
-            for cand in ranked_candidates:
-                display_data.append({
-                    "Rank": ranked_candidates.index(cand) + 1,
-                    "Score (0-100)": cand['score'],
-                    "Skill Match (%)": cand['skill_match_score'],
-                    "Resume ID": cand['resume_id'],
-                    "Source File": cand['original_source'],
-                    "Extracted Skills": ", ".join(cand['parsed_data']['skills']),
-                    "Estimated Experience": f"{ranker.estimate_experience_years(cand['parsed_data'].get('experience', [])):.1f} years", # Show estimated years
-                    "Education KWs": ", ".join(cand['parsed_data']['education']), # Use 'education' from parsed_data
-                    "Email": cand['parsed_data']['contact']['email'] or 'N/A',
-                    "Phone": cand['parsed_data']['contact']['phone'] or 'N/A'
-                })
+        duplicate_count = len(documents) - len(processed_resumes)
+        st.success(f"Successfully processed {len(processed_resumes)} resumes" +
+                   (f" ({duplicate_count} near-duplicates attached to their original)." if duplicate_count else "."))
+        # Parsed data, skill embeddings and experience years are kept for this candidate pool,
+        # so later weight or job description changes re-rank without re-parsing or re-embedding.
+        # The pool is stored compactly, with raw resume text in a memory-mapped file.
+        st.session_state["feature_store"] = ResumeFeatureStore(processed_resumes, ranker)
+        st.session_state["duplicates"] = duplicates
+
+# --- Ranking ---
+# Runs on every rerun once resumes have been processed: a weight change only redoes the weighted
+# combination and sort; a job description edit recomputes just the affected feature columns.
+feature_store = st.session_state.get("feature_store")
+if feature_store is not None:
+    st.header("3. Ranking Weights")
+    weight_columns = st.columns(3)
+    skill_weight = weight_columns[0].slider("Skill weight", 0.0, 1.0, ranker.skill_weight, 0.05, key="skill_weight")
+    experience_weight = weight_columns[1].slider("Experience weight", 0.0, 1.0, ranker.experience_weight, 0.05, key="experience_weight")
+    education_weight = weight_columns[2].slider("Education weight", 0.0, 1.0, ranker.education_weight, 0.05, key="education_weight")
+    weighted_ranker = ResumeRanker(skill_weight, experience_weight, education_weight) # Per-run: `ranker` is shared across sessions
+
+    with st.spinner("Ranking candidates..."):
+        # This call can implicitly trigger API calls to Vertex AI Endpoints if configured in matcher/ranker
+        ranked_candidates = feature_store.rank(job_requirements, matcher, weighted_ranker)
+    recomputed = ", ".join(feature_store.last_recomputed) or "none, weights only"
+    st.caption(f"Ranked {len(feature_store)} candidates in {feature_store.last_rank_seconds * 1000:.0f} ms (recomputed features: {recomputed}).")
+
+    render_started = time.perf_counter()
+    st.subheader("📊 Ranked Candidates")
+    if ranked_candidates:
+        # One pass builds the id lookup; rows are then rendered for the current page only,
+        # so render cost stays flat however many candidates were ranked.
+        rank_by_id = {cand['resume_id']: rank for rank, cand in enumerate(ranked_candidates, start=1)}
+        duplicates = st.session_state.get("duplicates", {})
 
-            df = pd.DataFrame(display_data)
-            st.dataframe(df, use_container_width=True, height=300) # Fixed height for better table display
-
-            st.markdown("---")
-            st.subheader("🔍 Detailed Resume Insights")
-            # --- FIX APPLIED HERE ---
-            for cand_display in display_data: # Iterate over display_data which contains the 'Rank'
-                with st.expander(f"Candidate {cand_display['Rank']} (ID: {cand_display['Resume ID']}) - Score: {cand_display['Score (0-100)']}/100 - {cand_display['Source File']}"):
-                    st.json({
-                        "resume_id": cand_display['Resume ID'], # Use key from display_data
-                        "score": cand_display['Score (0-100)'], # Use key from display_data
-                        "skill_match_score": cand_display['Skill Match (%)'], # Use key from display_data
-                        "estimated_experience_years": ranker.estimate_experience_years(next((rc['parsed_data'] for rc in ranked_candidates if rc['resume_id'] == cand_display['Resume ID']), {}).get('experience', [])), # Retrieve original parsed_data for experience
-                        "parsed_data": next((rc['parsed_data'] for rc in ranked_candidates if rc['resume_id'] == cand_display['Resume ID']), {}) # Retrieve original parsed_data
-                    })
-                    st.markdown("**Raw Content:**")
-                    st.text(next((rc['parsed_data'] for rc in ranked_candidates if rc['resume_id'] == cand_display['Resume ID']), {}).get('rawContent', ''))
-            # --- END FIX ---
+        page_size = st.selectbox("Candidates per page", RESULTS_PAGE_SIZES, index=1, key="results_page_size")
+        page_count = max(1, -(-len(ranked_candidates) // page_size))
+        if st.session_state.get("results_page", 1) > page_count:
+            st.session_state["results_page"] = 1 # The result set shrank under the current page
+        page = st.number_input(f"Page (1-{page_count})", min_value=1, max_value=page_count, step=1, key="results_page")
+        first = (page - 1) * page_size
+        page_candidates = ranked_candidates[first:first + page_size]
+
+        display_data = []
+        for rank, cand in enumerate(page_candidates, start=first + 1):
+            parsed_data = cand['parsed_data']
+            display_data.append({
+                "Rank": rank,
+                "Score (0-100)": cand['score'],
+                "Skill Match (%)": cand['skill_match_score'],
+                "Resume ID": cand['resume_id'],
+                "Source File": cand['original_source'],
+                "Extracted Skills": ", ".join(parsed_data['skills']),
+                "Estimated Experience": f"{cand['estimated_experience_years']:.1f} years", # Already computed by the ranker
+                "Education KWs": ", ".join(parsed_data['education']),
+                "Email": parsed_data['contact']['email'] or 'N/A',
+                "Phone": parsed_data['contact']['phone'] or 'N/A',
+                "Near-duplicates": len(duplicates.get(cand['resume_id'], []))
+            })
+
+        import pandas as pd # Deferred: only needed once there are results to show
+        st.caption(f"Showing {first + 1}-{first + len(page_candidates)} of {len(ranked_candidates)} candidates.")
+        st.dataframe(pd.DataFrame(display_data), use_container_width=True, height=300, hide_index=True)
+
+        st.markdown("---")
+        st.subheader("🔍 Detailed Resume Insights")
+        lookup_id = st.text_input("Jump to a candidate by Resume ID:", key="results_lookup_id").strip()
+        if lookup_id:
+            if lookup_id in rank_by_id:
+                detail_candidates = [(rank_by_id[lookup_id], ranked_candidates[rank_by_id[lookup_id] - 1])]
+            else:
+                st.warning(f"No ranked candidate with ID '{lookup_id}'.")
+                detail_candidates = []
         else:
-            st.warning("No candidates were ranked. Ensure resumes contain relevant information.")
+            detail_candidates = list(enumerate(page_candidates, start=first + 1))
+        for rank, cand in detail_candidates:
+            with st.expander(f"Candidate {rank} (ID: {cand['resume_id']}) - Score: {cand['score']}/100 - {cand['original_source']}"):
+                st.json({
+                    "resume_id": cand['resume_id'],
+                    "score": cand['score'],
+                    "skill_match_score": cand['skill_match_score'],
+                    "estimated_experience_years": cand['estimated_experience_years'],
+                    "parsed_data": {key: value for key, value in cand['parsed_data'].items() if key != 'rawContent'}
+                })
+                if cand['resume_id'] in duplicates:
+                    st.caption("Near-duplicates of this resume (not scored separately): " + ", ".join(
+                        f"{duplicate['resume_id']} ({duplicate['original_source']}, {duplicate['similarity']:.0%} similar)" for duplicate in duplicates[cand['resume_id']]))
+                # Raw resume text is read from the candidate store's blob file (and sent to the
+                # browser) only for candidates the recruiter opens
+                if st.checkbox("Show raw content", key=f"raw_content_{cand['resume_id']}"):
+                    candidates = feature_store.candidates
+                    st.text(candidates.raw_text(candidates.index_of(cand['resume_id'])))
+    else:
+        st.warning("No candidates were ranked. Ensure resumes contain relevant information.")
+    observe_span("render_results", time.perf_counter() - render_started)
+
+# --- Diagnostics (only when the app runs with RESUME_METRICS=1) ---
+# Rendered last so it includes the timings of this run.
+if REGISTRY.enabled:
+    with st.sidebar.expander("Diagnostics"):
+        metrics = REGISTRY.snapshot()
+        st.caption(f"Per-operation latency since startup ({metrics['uptime_seconds']:.0f}s ago); "
+                   "'per_second' is calls per second of time spent in the operation.")
+        if metrics["spans"]:
+            st.table([{"operation": name, **values} for name, values in metrics["spans"].items()])
+        st.json({"counters": metrics["counters"], "histograms": metrics["histograms"], "gauges": metrics["gauges"]})
+        st.download_button("Download Prometheus metrics", REGISTRY.to_prometheus(), file_name="metrics.prom")
+        if st.button("Reset metrics"):
+            REGISTRY.reset()
 
 st.markdown("---")
 st.caption("Developed with Python, Machine Learning, and integration potential with Vertex AI and RPA.")
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Multi-job batch matching: ranks one resume pool against many job descriptions in a single pass.
+
+    python -m src.batch_match --job-descriptions jobs/ --input resumes/ --top-k 50 --output-dir matches/
+
+Job descriptions are .txt files (or a directory of them); the file name without extension is the
+job id, so job ids must be unique across the inputs. Writes one ranked list per job (`<output-dir>/<job_id>.jsonl` or .csv) and
+`<output-dir>/best_jobs.jsonl` with each candidate's best-fit jobs.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import List, Tuple
+
+from src.batch_rank import iter_documents, iter_parsed_resumes, write_results
+from src.ml.candidate_store import CandidateStore
+from src.ml.feature_store import ResumeFeatureStore
+from src.ml.job_description import process_job_description
+from src.ml.parse_cache import ParseCache
+from src.ml.ranker import ResumeRanker
+from src.ml.resume_parser import ResumeParser
+from src.ml.skill_matcher import SkillMatcher
+
+
+def read_job_descriptions(paths: List[str]) -> List[Tuple[str, str]]:
+    """
+    Returns (job_id, text) for every .txt file given directly or found in a given directory.
+    Raises ValueError when two files share a job id, since their outputs would overwrite each other.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.lower().endswith(".txt"))
+        else:
+            files.append(path)
+    jobs, sources = [], {}
+    for file_path in files:
+        job_id = os.path.splitext(os.path.basename(file_path))[0]
+        if job_id == "best_jobs":
+            raise ValueError(f"{file_path}: the job id 'best_jobs' is reserved for the best-fit jobs output.")
+        if job_id in sources:
+            raise ValueError(f"{sources[job_id]} and {file_path} have the same job id '{job_id}'; rename one of them.")
+        sources[job_id] = file_path
+        with open(file_path, "r", encoding="utf-8") as f:
+            jobs.append((job_id, f.read()))
+    return jobs
+
+
+def main(argv: List[str] = None):
+    arg_parser = argparse.ArgumentParser(description="Rank a batch of resumes against many job descriptions at once.")
+    arg_parser.add_argument("--job-descriptions", nargs="+", required=True, help="Job description .txt files and/or directories of them.")
+    arg_parser.add_argument("--input", required=True, help="Directory, tarball, JSONL file ('-' for stdin) or gs://bucket/prefix of resumes.")
+    arg_parser.add_argument("--output-dir", required=True, help="Directory for the per-job rankings and best_jobs.jsonl.")
+    arg_parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="Format of the per-job rankings.")
+    arg_parser.add_argument("--top-k", type=int, default=100, help="Number of top candidates to keep per job.")
+    arg_parser.add_argument("--jobs-per-candidate", type=int, default=3, help="Best-fit jobs reported per candidate.")
+    arg_parser.add_argument("--workers", type=int, default=0, help="Extraction worker processes (0 = extract inline).")
+    arg_parser.add_argument("--parse-cache", help="Optional SQLite parse cache path to reuse parse results.")
+    args = arg_parser.parse_args(argv)
+
+    try:
+        jobs = read_job_descriptions(args.job_descriptions)
+    except ValueError as e:
+        arg_parser.error(str(e))
+    if not jobs:
+        arg_parser.error("No job descriptions found.")
+
+    parser = ResumeParser(cache=ParseCache(args.parse_cache) if args.parse_cache else None)
+    skill_matcher = SkillMatcher()
+    ranker = ResumeRanker()
+    job_requirements_list = [process_job_description(text, parser.taxonomy) for _, text in jobs]
+
+    # Every job needs the whole pool, so it is held in the compact candidate store
+    stats = {"failed": 0}
+    candidates = CandidateStore(ranker=ranker)
+    for resume in iter_parsed_resumes(iter_documents(args.input), parser, stats, workers=args.workers):
+        candidates.add(resume["resume_id"], resume["parsed_data"], resume["original_source"])
+
+    feature_store = ResumeFeatureStore(candidates, ranker)
+    result = feature_store.rank_jobs(job_requirements_list, skill_matcher, ranker, args.top_k, args.jobs_per_candidate)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    job_ids = [job_id for job_id, _ in jobs]
+    for job_id, ranked in zip(job_ids, result["rankings"]):
+        write_results(ranked, os.path.join(args.output_dir, f"{job_id}.{args.format}"), args.format)
+    with open(os.path.join(args.output_dir, "best_jobs.jsonl"), "w", encoding="utf-8") as f:
+        for candidate in result["best_jobs"]:
+            for job in candidate["jobs"]:
+                job["job"] = job_ids[job["job"]]
+            f.write(json.dumps(candidate) + "\n")
+    candidates.close()
+    print(f"Matched {len(candidates)} resumes ({stats['failed']} failed) against {len(jobs)} jobs "
+          f"in {feature_store.last_rank_seconds:.2f}s; wrote results to {args.output_dir}.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""
+Headless batch ranking: streams resumes from a directory, tarball or JSONL file through
+extract -> parse -> score and keeps only a bounded top-K heap in memory.
+
+    python -m src.batch_rank --job-description jd.txt --input resumes/ --top-k 100 --output top.jsonl
+
+JSONL input has one object per line with a "text" field and an optional "resume_id"/"id".
+"""
+import argparse
+import csv
+import heapq
+import json
+import os
+import sys
+import tarfile
+import time
+from typing import Dict, Iterator, List, Tuple
+
+from src.ml.job_description import process_job_description
+from src.ml.parse_cache import ParseCache
+from src.ml.ranker import ResumeRanker
+from src.ml.resume_parser import ResumeParser
+from src.ml.skill_matcher import SkillMatcher
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+PROGRESS_INTERVAL_SECONDS = 10.0 # Minimum time between "Scored N resumes" progress lines
+
+
+def iter_directory(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Yields (file_name, file_bytes) for every resume file under `path`, in sorted order."""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file_name in sorted(files):
+            if file_name.lower().endswith(RESUME_EXTENSIONS):
+                full_path = os.path.join(root, file_name)
+                with open(full_path, "rb") as f:
+                    yield os.path.relpath(full_path, path), f.read()
+
+
+def iter_tarball(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Yields resume files from a (optionally compressed) tarball without unpacking it to disk."""
+    with tarfile.open(path, mode="r|*") as archive: # Streaming mode: members are read sequentially
+        for member in archive:
+            if member.isfile() and member.name.lower().endswith(RESUME_EXTENSIONS):
+                yield member.name, archive.extractfile(member).read()
+
+
+def iter_jsonl(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Yields resumes from a JSONL stream ('-' for stdin); each line holds a "text" field."""
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            resume_id = record.get("resume_id") or record.get("id") or f"line_{line_number}"
+            yield f"{resume_id}.txt", record.get("text", "").encode("utf-8")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def iter_gcs(uri: str) -> Iterator[Tuple[str, bytes]]:
+    """Yields resumes under a gs://bucket/prefix, downloaded concurrently but emitted in listing order."""
+    from src.utils.gcs_ingest import GCSBucket, iter_bucket_documents
+    bucket_name, _, prefix = uri[len("gs://"):].partition("/")
+    for result in iter_bucket_documents(GCSBucket(bucket_name), prefix, ordered=True):
+        if not result["ok"]:
+            print(f"Error downloading '{result['name']}': {result['error']}", file=sys.stderr)
+            continue
+        yield result["name"], result["data"]
+
+
+def iter_documents(source: str) -> Iterator[Tuple[str, bytes]]:
+    """Picks the reader for `source` based on what it is."""
+    if source.startswith("gs://"):
+        return iter_gcs(source)
+    if source == "-" or source.lower().endswith((".jsonl", ".ndjson")):
+        return iter_jsonl(source)
+    if os.path.isdir(source):
+        return iter_directory(source)
+    if tarfile.is_tarfile(source):
+        return iter_tarball(source)
+    raise ValueError(f"Unsupported input '{source}': expected a directory, tarball, .jsonl file or gs:// prefix.")
+
+
+def iter_extracted(documents: Iterator[Tuple[str, bytes]], parser: ResumeParser, stats: Dict, workers: int = 0) -> Iterator[Tuple]:
+    """
+    Extracts text from each document, yielding (file_name, file_bytes, text, cached parsed_data or None)
+    in input order. With `workers` > 0, extraction runs in an ExtractionPool; otherwise inline.
+    Files seen before are served from the parser's parse cache, if it has one. Failures are reported and skipped.
+    """
+    def report_failure(file_name: str, error: str):
+        stats["failed"] = stats.get("failed", 0) + 1
+        print(f"Error processing '{file_name}': {error}", file=sys.stderr)
+
+    if workers <= 0:
+        for file_name, file_bytes in documents:
+            cached = parser.get_cached(file_bytes)
+            if cached is not None:
+                yield file_name, file_bytes, cached[0], cached[1]
+                continue
+            try:
+                text = parser.extract_text(file_name, file_bytes)
+            except Exception as e:
+                report_failure(file_name, str(e))
+                continue
+            if not text.strip():
+                report_failure(file_name, "No text could be extracted.")
+                continue
+            yield file_name, file_bytes, text, None
+        return
+
+    from src.utils.extraction_pool import ExtractionPool
+    with ExtractionPool(max_workers=workers) as pool:
+        # Work through bounded windows of documents so buffered results and bytes never pile up.
+        # Within a window, results are re-emitted in input order so ranking ties stay deterministic.
+        for window in iter_chunks(documents, workers * 8):
+            extracted = [None] * len(window)
+            misses = []
+            for position, (file_name, file_bytes) in enumerate(window):
+                cached = parser.get_cached(file_bytes)
+                if cached is not None:
+                    extracted[position] = (file_name, file_bytes, cached[0], cached[1])
+                else:
+                    misses.append(position)
+            for result in pool.extract(window[position] for position in misses):
+                if not result["ok"]:
+                    report_failure(result["file_name"], result["error"])
+                    continue
+                position = misses[result["index"]]
+                extracted[position] = (result["file_name"], window[position][1], result["text"], None)
+            yield from (item for item in extracted if item is not None)
+
+
+def resume_id_for(file_name: str) -> str:
+    return os.path.splitext(os.path.basename(file_name))[0]
+
+
+def to_resume(file_name: str, parsed_data: Dict) -> Dict:
+    parsed_data.pop("rawContent", None) # Only the ranked output is kept; drop the text early
+    return {"resume_id": resume_id_for(file_name), "original_source": file_name, "parsed_data": parsed_data}
+
+
+def iter_parsed_resumes(documents: Iterator[Tuple[str, bytes]], parser: ResumeParser, stats: Dict, workers: int = 0) -> Iterator[Dict]:
+    """
+    Extracts and parses each document (see `iter_extracted`), yielding processed resume dicts
+    without `rawContent`. New parse results are stored in the parser's parse cache.
+    """
+    for file_name, file_bytes, text, parsed_data in iter_extracted(documents, parser, stats, workers):
+        if parsed_data is None:
+            parsed_data = parser.parse_text(text)
+            parser.store_cached(file_bytes, text, parsed_data)
+        yield to_resume(file_name, parsed_data)
+
+
+def iter_deduplicated_resumes(documents: Iterator[Tuple[str, bytes]], parser: ResumeParser, detector, stats: Dict,
+                              workers: int = 0) -> Tuple[Iterator[Dict], Dict[str, List[Dict]]]:
+    """
+    Like `iter_parsed_resumes`, but near-duplicate documents are clustered first and only each
+    cluster's representative (its earliest document) is parsed. Returns (resumes, {representative
+    original_source: [{"resume_id", "original_source", "similarity"}, ...]}), keyed by source
+    because resume ids (file base names) repeat across directories. The extracted texts of the
+    whole batch are held in memory for clustering.
+    """
+    extracted = list(iter_extracted(documents, parser, stats, workers))
+    representatives, clusters = detector.group([text for _, _, text, _ in extracted])
+    stats["near_duplicates"] = len(extracted) - len(representatives)
+    duplicates = {}
+    for representative, members in clusters.items():
+        duplicates[extracted[representative][0]] = [
+            {"resume_id": resume_id_for(extracted[i][0]), "original_source": extracted[i][0], "similarity": similarity}
+            for i, similarity in members]
+        for i, _ in members:
+            extracted[i] = None # Duplicates are never parsed
+
+    def parse_representatives() -> Iterator[Dict]:
+        for i in representatives:
+            file_name, file_bytes, text, parsed_data = extracted[i]
+            extracted[i] = None # Release the text once it has been parsed
+            if parsed_data is None:
+                parsed_data = parser.parse_text(text)
+                parser.store_cached(file_bytes, text, parsed_data)
+            yield to_resume(file_name, parsed_data)
+
+    return parse_representatives(), duplicates
+
+
+def attach_duplicates(ranked: List[Dict], duplicates: Dict[str, List[Dict]]) -> List[Dict]:
+    """Lists each ranked representative's near-duplicates (see `iter_deduplicated_resumes`) under "duplicates"."""
+    for record in ranked:
+        record["duplicates"] = duplicates.get(record["original_source"], [])
+    return ranked
+
+
+def iter_chunks(items: Iterator, chunk_size: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def rank_stream(resumes: Iterator[Dict], job_requirements: Dict, ranker: ResumeRanker, skill_matcher, top_k: int,
+                chunk_size: int = 256, stats: Dict = None, prune: bool = False) -> List[Dict]:
+    """
+    Scores resumes chunk by chunk (so embeddings stay batched) and keeps only the best `top_k`
+    in a min-heap. Ties keep the resume seen first, matching `ResumeRanker.rank_resumes`.
+    With `prune`, resumes whose score upper bound can't reach the heap (or their chunk's K-th
+    best) skip semantic skill scoring; counts are reported in `stats["pruning"]`. Progress goes
+    to stderr at most every PROGRESS_INTERVAL_SECONDS.
+    """
+    stats = stats if stats is not None else {}
+    if prune:
+        stats.setdefault("pruning", {})
+    heap = [] # (score, -sequence, record); the root is the current K-th best
+    scored = 0
+    started = last_progress = time.monotonic()
+    for chunk in iter_chunks(resumes, chunk_size):
+        if prune:
+            min_score = heap[0][0] if heap and len(heap) >= top_k else None
+            indices, scores, features = ranker.top_k_pruned(chunk, job_requirements, skill_matcher, top_k, chunk_size, min_score,
+                                                            stats["pruning"])
+        else:
+            features = ranker.build_features(chunk, job_requirements, skill_matcher)
+            scores = ranker.combine_scores(features)
+            indices = ranker.top_k_indices(scores, top_k)
+        # Only a chunk's own top K can make it into the overall top K
+        for i in indices:
+            key = (int(scores[i]), -(scored + int(i)))
+            if len(heap) < top_k:
+                heapq.heappush(heap, key + (ranker.ranked_record(chunk[i], scores, features, i),))
+            elif key > heap[0][:2]:
+                heapq.heapreplace(heap, key + (ranker.ranked_record(chunk[i], scores, features, i),))
+        scored += len(chunk)
+        stats["scored"] = scored
+        now = time.monotonic()
+        if now - last_progress >= PROGRESS_INTERVAL_SECONDS:
+            print(f"Scored {scored} resumes ({scored / (now - started):.1f}/s)", file=sys.stderr)
+            last_progress = now
+    return [entry[2] for entry in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+OUTPUT_FIELDS = ["rank", "score", "skill_match_score", "estimated_experience_years", "resume_id", "original_source",
+                 "skills", "education", "email", "phone"]
+
+
+def to_output_row(rank: int, record: Dict) -> Dict:
+    parsed_data = record.get("parsed_data", {})
+    contact = parsed_data.get("contact", {})
+    row = {
+        "rank": rank,
+        "score": record["score"],
+        "skill_match_score": record["skill_match_score"],
+        "estimated_experience_years": record["estimated_experience_years"],
+        "resume_id": record["resume_id"],
+        "original_source": record["original_source"],
+        "skills": parsed_data.get("skills", []),
+        "education": parsed_data.get("education", []),
+        "email": contact.get("email"),
+        "phone": contact.get("phone"),
+    }
+    if "duplicates" in record: # Only present when near-duplicate detection ran
+        row["duplicates"] = record["duplicates"]
+    return row
+
+
+def write_results(ranked: List[Dict], output: str, output_format: str = None):
+    """Writes ranked records as JSONL or CSV (chosen from `output_format` or the file extension)."""
+    output_format = output_format or ("csv" if output.lower().endswith(".csv") else "jsonl")
+    stream = sys.stdout if output == "-" else open(output, "w", encoding="utf-8", newline="")
+    try:
+        if output_format == "csv":
+            with_duplicates = any("duplicates" in record for record in ranked)
+            writer = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS + (["duplicates"] if with_duplicates else []))
+            writer.writeheader()
+            for rank, record in enumerate(ranked, start=1):
+                row = to_output_row(rank, record)
+                row["skills"] = ", ".join(row["skills"])
+                row["education"] = ", ".join(row["education"])
+                if with_duplicates:
+                    row["duplicates"] = ", ".join(duplicate["resume_id"] for duplicate in row.get("duplicates", []))
+                writer.writerow(row)
+        else:
+            for rank, record in enumerate(ranked, start=1):
+                stream.write(json.dumps(to_output_row(rank, record)) + "\n")
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv: List[str] = None):
+    arg_parser = argparse.ArgumentParser(description="Rank a batch of resumes against a job description without the UI.")
+    arg_parser.add_argument("--job-description", required=True, help="Text file with the job description.")
+    arg_parser.add_argument("--input", required=True, help="Directory, tarball, JSONL file ('-' for stdin) or gs://bucket/prefix of resumes.")
+    arg_parser.add_argument("--output", default="-", help="Output file (.jsonl or .csv); '-' for stdout.")
+    arg_parser.add_argument("--format", choices=["jsonl", "csv"], help="Output format (default: from the output extension).")
+    arg_parser.add_argument("--top-k", type=positive_int, default=100, help="Number of top candidates to keep.")
+    arg_parser.add_argument("--chunk-size", type=positive_int, default=256, help="Resumes scored per embedding batch.")
+    arg_parser.add_argument("--workers", type=int, default=0, help="Extraction worker processes (0 = extract inline).")
+    arg_parser.add_argument("--parse-cache", help="Optional SQLite parse cache path to reuse parse results.")
+    arg_parser.add_argument("--prune", action="store_true", help="Skip semantic scoring for resumes that can't reach the top K (same results).")
+    arg_parser.add_argument("--dedup", action="store_true", help="Score one representative per cluster of near-duplicate resumes.")
+    arg_parser.add_argument("--dedup-threshold", type=float, help="Similarity (0-1] at which resumes count as near-duplicates "
+                                                                   "(default: DUPLICATE_THRESHOLD or 0.7).")
+    args = arg_parser.parse_args(argv)
+
+    with open(args.job_description, "r", encoding="utf-8") as f:
+        job_description_text = f.read()
+
+    parser = ResumeParser(cache=ParseCache(args.parse_cache) if args.parse_cache else None)
+    skill_matcher = SkillMatcher()
+    ranker = ResumeRanker()
+    job_requirements = process_job_description(job_description_text, parser.taxonomy)
+
+    stats = {"failed": 0}
+    if args.dedup:
+        from src.nlp.near_duplicates import DEFAULT_DUPLICATE_THRESHOLD, NearDuplicateDetector
+        detector = NearDuplicateDetector(args.dedup_threshold if args.dedup_threshold is not None else DEFAULT_DUPLICATE_THRESHOLD)
+        resumes, duplicates = iter_deduplicated_resumes(iter_documents(args.input), parser, detector, stats, workers=args.workers)
+    else:
+        resumes = iter_parsed_resumes(iter_documents(args.input), parser, stats, workers=args.workers)
+    ranked = rank_stream(resumes, job_requirements, ranker, skill_matcher, args.top_k, args.chunk_size, stats, args.prune)
+    if args.dedup:
+        attach_duplicates(ranked, duplicates)
+        print(f"Near-duplicates: {stats['near_duplicates']} resumes attached to their cluster representative instead of scored.", file=sys.stderr)
+    write_results(ranked, args.output, args.format)
+    print(f"Ranked {stats.get('scored', 0)} resumes ({stats['failed']} failed); wrote top {len(ranked)}.", file=sys.stderr)
+    if args.prune:
+        pruning = stats.get("pruning", {})
+        print(f"Pruning: {pruning.get('pruned', 0)} resumes skipped semantic scoring, "
+              f"{pruning.get('scored_from_cache', 0)} scored from cached embeddings.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Synthetic resume / job description generator for benchmarks.
+
+    python -m src.benchmarks.corpus --count 1000 --formats txt,pdf,docx --output bench_corpus/
+
+Output is fully determined by the seed, so two runs with the same arguments produce
+byte-identical corpora. PDF and DOCX files are written directly (no extra dependencies).
+"""
+import argparse
+import io
+import os
+import random
+import zipfile
+from typing import Dict, Iterator, List, Tuple
+
+from src.nlp.taxonomy import get_default_taxonomy
+
+FORMATS = ("txt", "pdf", "docx")
+# Number of filler paragraphs per resume, by size class
+RESUME_SIZES = {"short": 2, "medium": 6, "long": 20}
+SKILL_DISTRIBUTIONS = ("zipf", "uniform")
+
+_FIRST_NAMES = ["Asha", "Ben", "Chen", "Divya", "Elena", "Farid", "Grace", "Hiro", "Isabel", "Jamal", "Kavya", "Liam"]
+_LAST_NAMES = ["Rao", "Smith", "Wang", "Patel", "Garcia", "Khan", "Okafor", "Tanaka", "Silva", "Müller", "Reddy", "Brown"]
+_TITLES = ["Data Scientist", "Software Engineer", "ML Engineer", "Data Analyst", "Cloud Engineer", "RPA Specialist"]
+_SENIORITY = ["Junior", "Associate", "Senior", "Lead"]
+_DEGREES = ["Bachelor of Engineering in Computer Science", "B.Tech in Computer Science", "Master of Science in Statistics",
+            "MBA", "PhD in Mathematics", "Bachelor of Science in Mathematics", "M.Tech in Data Science"]
+_SCHOOLS = ["State University", "Institute of Technology", "City College", "National University"]
+_FILLER = [
+    "Developed data pipelines and reporting dashboards used by several business teams.",
+    "Implemented automated testing and continuous delivery for internal services.",
+    "Managed stakeholder requirements and translated them into technical designs.",
+    "Led code reviews and mentored new team members on best practices.",
+    "Worked as part of a cross-functional team delivering customer-facing features.",
+    "Improved model accuracy and reduced latency of batch scoring jobs.",
+    "Collaborated with product owners to prioritise the roadmap every quarter.",
+    "Documented architecture decisions and maintained the team's runbooks.",
+]
+
+
+def _skill_weights(skills: List[str], distribution: str) -> List[float]:
+    if distribution == "uniform":
+        return [1.0] * len(skills)
+    if distribution == "zipf":
+        # A few skills are very common and most are rare, as in real resume pools
+        return [1.0 / (rank + 1) for rank in range(len(skills))]
+    raise ValueError(f"Unknown skill distribution '{distribution}'; expected one of {SKILL_DISTRIBUTIONS}.")
+
+
+class CorpusGenerator:
+    """Deterministic generator of synthetic resumes and matching job descriptions."""
+
+    def __init__(self, seed: int = 0, size: str = "medium", skill_distribution: str = "zipf", skills: List[str] = None):
+        if size not in RESUME_SIZES:
+            raise ValueError(f"Unknown resume size '{size}'; expected one of {tuple(RESUME_SIZES)}.")
+        self.seed = seed
+        self.size = size
+        self.skills = skills or get_default_taxonomy().terms("skills")
+        self.weights = _skill_weights(self.skills, skill_distribution)
+
+    def _sample_skills(self, rng: random.Random, count: int) -> List[str]:
+        chosen = []
+        while len(chosen) < min(count, len(self.skills)):
+            skill = rng.choices(self.skills, weights=self.weights)[0]
+            if skill not in chosen:
+                chosen.append(skill)
+        return chosen
+
+    def resume_text(self, index: int) -> str:
+        """The synthetic resume number `index` (independent of how many others are generated)."""
+        rng = random.Random(f"{self.seed}:resume:{index}")
+        name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+        years = rng.randint(0, 15)
+        lines = [
+            name,
+            f"{name.lower().replace(' ', '.')}{index}@example.com | {rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+            "",
+            f"{rng.choice(_SENIORITY)} {rng.choice(_TITLES)} with {years} years experience.",
+            "",
+            "Skills: " + ", ".join(self._sample_skills(rng, rng.randint(3, 12))),
+            "",
+            "Experience",
+        ]
+        for _ in range(RESUME_SIZES[self.size]):
+            lines.append(" ".join(rng.sample(_FILLER, 3)))
+        lines.extend(["", "Education", f"{rng.choice(_DEGREES)}, {rng.choice(_SCHOOLS)}"])
+        return "\n".join(lines)
+
+    def near_duplicate_text(self, index: int, variant: int = 1) -> str:
+        """A lightly edited resubmission of resume `index`: new contact line, one sentence dropped, a typo."""
+        rng = random.Random(f"{self.seed}:duplicate:{index}:{variant}")
+        lines = self.resume_text(index).split("\n")
+        lines[1] = f"{lines[0].lower().replace(' ', '_')}{variant}@mail.example.org | {rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+        filler = [i for i, line in enumerate(lines) if line.count(".") >= 3]
+        if filler:
+            position = rng.choice(filler)
+            lines[position] = lines[position].split(". ", 1)[-1] # Drop the paragraph's first sentence
+        words = lines[-1].split()
+        if words:
+            position = rng.randrange(len(words))
+            words[position] = words[position][::-1]
+            lines[-1] = " ".join(words)
+        return "\n".join(lines)
+
+    def job_description(self, index: int) -> str:
+        rng = random.Random(f"{self.seed}:job:{index}")
+        skills = self._sample_skills(rng, rng.randint(3, 8))
+        return (f"We are hiring a {rng.choice(_SENIORITY)} {rng.choice(_TITLES)} with {rng.randint(1, 8)}+ years experience "
+                f"in {', '.join(skills)}. A {rng.choice(['Bachelor', 'Master', 'PhD'])} degree in Computer Science or "
+                f"Statistics is preferred.")
+
+    def iter_documents(self, count: int, file_format: str = "txt") -> Iterator[Tuple[str, bytes]]:
+        """Yields (file_name, file_bytes) for `count` resumes, generated lazily."""
+        render = {"txt": lambda text: text.encode("utf-8"), "pdf": render_pdf, "docx": render_docx}[file_format]
+        for index in range(count):
+            yield f"resume_{index:06d}.{file_format}", render(self.resume_text(index))
+
+
+def render_pdf(text: str) -> bytes:
+    """Renders plain text as a minimal multi-page PDF (Helvetica, one text object per page)."""
+    lines = text.split("\n")
+    lines_per_page = 60
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    def escape(line: str) -> str:
+        # Standard 14 fonts use Latin-1 (WinAnsi-compatible for these characters)
+        return line.encode("latin-1", "replace").decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        content = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(f"({escape(line)}) Tj T*" for line in page_lines) + " ET"
+        objects.append(f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref_offset = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+def render_docx(text: str) -> bytes:
+    """Renders plain text as a minimal DOCX (one paragraph per line)."""
+    from xml.sax.saxutils import escape
+    paragraphs = "".join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in text.split("\n"))
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{paragraphs}</w:body></w:document>')
+    content_types = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                     '<Default Extension="xml" ContentType="application/xml"/>'
+                     '<Override PartName="/word/document.xml" '
+                     'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+    relationships = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                     '<Relationship Id="rId1" Target="word/document.xml" '
+                     'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/></Relationships>')
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        # Fixed timestamps keep the output byte-identical across runs
+        for name, data in (("[Content_Types].xml", content_types), ("_rels/.rels", relationships), ("word/document.xml", document)):
+            archive.writestr(zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0)), data)
+    return out.getvalue()
+
+
+def write_corpus(output: str, count: int, formats: List[str], generator: CorpusGenerator, job_count: int = 5) -> Dict:
+    """Writes `count` resumes per format under `output/<format>/` and the job descriptions under `output/jobs/`."""
+    written = {}
+    for file_format in formats:
+        directory = os.path.join(output, file_format)
+        os.makedirs(directory, exist_ok=True)
+        for file_name, file_bytes in generator.iter_documents(count, file_format):
+            with open(os.path.join(directory, file_name), "wb") as f:
+                f.write(file_bytes)
+        written[file_format] = count
+    jobs_directory = os.path.join(output, "jobs")
+    os.makedirs(jobs_directory, exist_ok=True)
+    for index in range(job_count):
+        with open(os.path.join(jobs_directory, f"job_{index:03d}.txt"), "w", encoding="utf-8") as f:
+            f.write(generator.job_description(index))
+    written["jobs"] = job_count
+    return written
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate a synthetic resume corpus for benchmarks.")
+    arg_parser.add_argument("--output", required=True, help="Output directory.")
+    arg_parser.add_argument("--count", type=int, default=1000, help="Resumes per format.")
+    arg_parser.add_argument("--formats", default="txt", help=f"Comma-separated subset of {','.join(FORMATS)}.")
+    arg_parser.add_argument("--size", choices=list(RESUME_SIZES), default="medium")
+    arg_parser.add_argument("--skill-distribution", choices=SKILL_DISTRIBUTIONS, default="zipf")
+    arg_parser.add_argument("--jobs", type=int, default=5, help="Number of job descriptions.")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise SystemExit(f"Unknown format(s): {', '.join(sorted(unknown))}.")
+    generator = CorpusGenerator(args.seed, args.size, args.skill_distribution)
+    print(write_corpus(args.output, args.count, formats, generator, args.jobs))
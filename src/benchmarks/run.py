@@ -0,0 +1,346 @@
+"""
+Benchmark suite: per-stage microbenchmarks and an end-to-end pipeline run on a synthetic corpus.
+
+    python -m src.benchmarks.run run --scales 10,1000,100000 --output bench.json
+    python -m src.benchmarks.run run --stages parse_text,rank --scales 1000 --output bench.json
+    python -m src.benchmarks.run compare baseline.json bench.json --threshold 0.15
+
+Results are JSON: one entry per (stage, scale) with wall time, items/sec and peak RSS. Each
+stage runs in a fresh process, so its peak RSS doesn't depend on which stages ran before it
+(`--in-process` skips the isolation and the RSS numbers). `compare` exits with status 1 when any
+stage regressed beyond the threshold.
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.benchmarks.corpus import CorpusGenerator, RESUME_SIZES, SKILL_DISTRIBUTIONS
+from src.ml.skill_matcher import SkillMatcher
+
+STAGES = ("extract_pdf", "extract_docx", "parse_text", "clean_text", "dedup", "embed", "rank", "multi_job", "end_to_end")
+DEFAULT_SCALES = (10, 1000, 100000)
+# Openings ranked at once by the multi_job stage
+MULTI_JOB_COUNT = 30
+# Every DUPLICATE_EVERY-th document of the dedup stage is a lightly edited copy of an earlier one
+DUPLICATE_EVERY = 5
+# pdfminer/python-docx are orders of magnitude slower than the rest; their throughput is
+# measured on a sample of at most this many documents per scale
+MAX_EXTRACTION_SAMPLE = 500
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB (see `run_stage_isolated`)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def measure(fn: Callable[[], int], repeats: int = 1) -> Dict:
+    """Runs `fn` (which returns the number of items it processed) `repeats` times; reports the median run."""
+    timings = []
+    items = 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        items = fn()
+        timings.append(time.perf_counter() - started)
+    seconds = statistics.median(timings)
+    return {
+        "items": items,
+        "seconds": round(seconds, 4),
+        "items_per_second": round(items / seconds, 1) if seconds > 0 else 0.0,
+        "repeats": repeats,
+    }
+
+
+class BenchmarkSuite:
+    """Runs the benchmark stages over a deterministic synthetic corpus."""
+
+    def __init__(self, generator: CorpusGenerator, skill_matcher: SkillMatcher = None, job_index: int = 0, repeats: int = 3):
+        from src.ml.job_description import process_job_description
+        from src.ml.ranker import ResumeRanker
+        from src.ml.resume_parser import ResumeParser
+        self.generator = generator
+        self.parser = ResumeParser()
+        self.ranker = ResumeRanker()
+        # Without a matcher, scoring stages use a keyword-only one (the embedding model is never loaded)
+        self.skill_matcher = skill_matcher if skill_matcher is not None else SkillMatcher(cache_dir=None, load_model=False)
+        self.repeats = repeats
+        self.job_description = generator.job_description(job_index)
+        self.job_requirements = process_job_description(self.job_description, self.parser.taxonomy)
+
+    def _repeats_for(self, scale: int) -> int:
+        # Large scales are slow enough that a single run is representative
+        return self.repeats if scale <= 1000 else 1
+
+    def bench_extract_pdf(self, scale: int) -> Dict:
+        documents = list(self.generator.iter_documents(min(scale, MAX_EXTRACTION_SAMPLE), "pdf"))
+        return measure(lambda: sum(1 for name, data in documents if self.parser.extract_text(name, data) is not None), self._repeats_for(scale))
+
+    def bench_extract_docx(self, scale: int) -> Dict:
+        documents = list(self.generator.iter_documents(min(scale, MAX_EXTRACTION_SAMPLE), "docx"))
+        return measure(lambda: sum(1 for name, data in documents if self.parser.extract_text(name, data) is not None), self._repeats_for(scale))
+
+    def bench_parse_text(self, scale: int) -> Dict:
+        texts = [self.generator.resume_text(i) for i in range(scale)]
+        return measure(lambda: sum(1 for text in texts if self.parser.parse_text(text)), self._repeats_for(scale))
+
+    def bench_clean_text(self, scale: int) -> Dict:
+        from src.nlp.text_cleaner import TextCleaner
+        cleaner = TextCleaner()
+        cleaner.clean_text("warm up") # Loads the NLTK corpora outside the timed region
+        texts = [self.generator.resume_text(i) for i in range(scale)]
+        return measure(lambda: sum(1 for text in texts if cleaner.clean_text(text) is not None), self._repeats_for(scale))
+
+    def bench_dedup(self, scale: int) -> Dict:
+        """MinHash + LSH near-duplicate clustering of `scale` texts, one in DUPLICATE_EVERY an edited copy."""
+        from src.nlp.near_duplicates import NearDuplicateDetector
+        from src.nlp.text_cleaner import TextCleaner
+        cleaner = TextCleaner()
+        cleaner.clean_text("warm up") # Loads the NLTK corpora outside the timed region
+        detector = NearDuplicateDetector(cleaner=cleaner)
+        texts = [self.generator.near_duplicate_text(i - 1 - i % 3, i) if i % DUPLICATE_EVERY == DUPLICATE_EVERY - 1 else self.generator.resume_text(i)
+                 for i in range(scale)]
+        groups = []
+
+        def run() -> int:
+            groups.append(detector.group(texts))
+            return len(texts)
+
+        result = measure(run, self._repeats_for(scale))
+        representatives, duplicates = groups[-1]
+        representative_of = list(range(scale))
+        for representative, members in duplicates.items():
+            for i, _ in members:
+                representative_of[i] = representative
+        # A planted copy is found when it lands in the same cluster as the resume it was edited from
+        planted = [(i, i - 1 - i % 3) for i in range(scale) if i % DUPLICATE_EVERY == DUPLICATE_EVERY - 1]
+        result["clusters"] = len(representatives)
+        result["planted_duplicates"] = len(planted)
+        result["recall"] = sum(representative_of[copy] == representative_of[source] for copy, source in planted) / len(planted) if planted else 1.0
+        return result
+
+    def bench_embed(self, scale: int) -> Dict:
+        """Embeds `scale` distinct skill phrases with the cache bypassed (pure model throughput)."""
+        if not self.skill_matcher.model_loaded:
+            raise RuntimeError("the embedding model is not loaded")
+        skills = self.generator.skills
+        phrases = [f"{skills[i % len(skills)]} {i // len(skills)}" for i in range(scale)]
+        result = measure(lambda: len(self.skill_matcher.embed_texts(phrases, use_cache=False)), self._repeats_for(scale))
+        result["batch_size"] = 64
+        return result
+
+    def bench_rank(self, scale: int) -> Dict:
+        """Columnar scoring of `scale` pre-parsed resumes (embeddings warmed first)."""
+        resumes = [{"resume_id": f"resume_{i}", "original_source": "benchmark", "parsed_data": self.parser.parse_text(self.generator.resume_text(i))}
+                   for i in range(scale)]
+        self.skill_matcher.embed_skills(self.generator.skills)
+        return measure(lambda: len(self.ranker.rank_resumes_vectorized(resumes, self.job_requirements, self.skill_matcher)), self._repeats_for(scale))
+
+    def bench_multi_job(self, scale: int) -> Dict:
+        """Ranks `scale` pre-parsed resumes against MULTI_JOB_COUNT job descriptions in one pass (items = resume-job pairs)."""
+        from src.ml.feature_store import ResumeFeatureStore
+        from src.ml.job_description import process_job_description
+        resumes = [{"resume_id": f"resume_{i}", "original_source": "benchmark", "parsed_data": self.parser.parse_text(self.generator.resume_text(i))}
+                   for i in range(scale)]
+        jobs = [process_job_description(self.generator.job_description(n), self.parser.taxonomy) for n in range(MULTI_JOB_COUNT)]
+        feature_store = ResumeFeatureStore(resumes, self.ranker)
+        feature_store.rank_jobs(jobs[:1], self.skill_matcher, self.ranker, top_k=1) # Embeds the resume skills outside the timed region
+        result = measure(lambda: feature_store.rank_jobs(jobs, self.skill_matcher, self.ranker, top_k=100)["scores"].size, self._repeats_for(scale))
+        feature_store.candidates.close()
+        result["jobs"] = MULTI_JOB_COUNT
+        return result
+
+    def bench_end_to_end(self, scale: int) -> Dict:
+        """Streams `scale` text resumes through parse -> score -> top-100 (the `batch_rank` pipeline)."""
+        from src.batch_rank import iter_parsed_resumes, rank_stream
+
+        def run() -> int:
+            stats = {}
+            with contextlib.redirect_stderr(io.StringIO()): # rank_stream reports progress on stderr
+                resumes = iter_parsed_resumes(self.generator.iter_documents(scale, "txt"), self.parser, stats)
+                rank_stream(resumes, self.job_requirements, self.ranker, self.skill_matcher, top_k=100, stats=stats)
+            return stats.get("scored", 0)
+
+        return measure(run, 1)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "BenchmarkSuite":
+        """Builds a suite from plain settings (seed, size, skill_distribution, repeats, backend, no_model)."""
+        skill_matcher = None
+        if not config.get("no_model"):
+            # No disk cache, so embedding numbers reflect the model rather than a prebuilt store
+            skill_matcher = SkillMatcher(cache_dir=None, backend=config.get("backend"))
+        generator = CorpusGenerator(config.get("seed", 0), config.get("size", "medium"), config.get("skill_distribution", "zipf"))
+        return cls(generator, skill_matcher, repeats=config.get("repeats", 3))
+
+    @property
+    def backend(self):
+        """Embedding backend the scoring stages used (None for keyword scoring)."""
+        return self.skill_matcher.backend_name if self.skill_matcher.model_loaded else None
+
+    def run_stage(self, stage: str, scale: int) -> Dict:
+        entry = {"stage": stage, "scale": scale}
+        try:
+            entry.update(getattr(self, f"bench_{stage}")(scale))
+            if stage in ("extract_pdf", "extract_docx") and scale > MAX_EXTRACTION_SAMPLE:
+                entry["sampled"] = True
+        except Exception as e:
+            entry["skipped"] = str(e) or e.__class__.__name__
+        return entry
+
+    def run(self, stages: List[str], scales: List[int]) -> List[Dict]:
+        """Runs every stage in this process (no peak RSS: it would include every earlier stage)."""
+        results = []
+        for scale in scales:
+            for stage in stages:
+                entry = self.run_stage(stage, scale)
+                print(json.dumps(entry), file=sys.stderr)
+                results.append(entry)
+        return results
+
+
+def run_stage_isolated(config: Dict, stage: str, scale: int) -> Tuple[Dict, Optional[str]]:
+    """
+    Child-process entry point: builds a suite from `config` and runs one stage. The process is
+    fresh, so `peak_rss_mb` covers only this stage (plus imports, model and corpus setup).
+    """
+    suite = BenchmarkSuite.from_config(config)
+    entry = suite.run_stage(stage, scale)
+    entry["peak_rss_mb"] = peak_rss_mb()
+    return entry, suite.backend
+
+
+def run_isolated(config: Dict, stages: List[str], scales: List[int]) -> Tuple[List[Dict], Optional[str]]:
+    """Runs each (stage, scale) in its own spawned process; returns (results, backend used)."""
+    context = multiprocessing.get_context("spawn")
+    results, backend = [], None
+    for scale in scales:
+        for stage in stages:
+            with context.Pool(1) as pool:
+                entry, backend = pool.apply(run_stage_isolated, (config, stage, scale))
+            print(json.dumps(entry), file=sys.stderr)
+            results.append(entry)
+    return results, backend
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.15) -> List[Dict]:
+    """
+    Compares two result files stage by stage. A stage regresses when its throughput drops by
+    more than `threshold` (a fraction) or its peak RSS grows by more than `threshold` (only
+    checked when both runs measured it).
+    """
+    baseline_entries = {(e["stage"], e["scale"]): e for e in baseline["results"] if "skipped" not in e}
+    rows = []
+    for entry in current["results"]:
+        reference = baseline_entries.get((entry["stage"], entry["scale"]))
+        if reference is None or "skipped" in entry:
+            continue
+        throughput_change = (entry["items_per_second"] - reference["items_per_second"]) / reference["items_per_second"] if reference["items_per_second"] else 0.0
+        rss_change = (entry["peak_rss_mb"] - reference["peak_rss_mb"]) / reference["peak_rss_mb"] if entry.get("peak_rss_mb") and reference.get("peak_rss_mb") else 0.0
+        rows.append({
+            "stage": entry["stage"],
+            "scale": entry["scale"],
+            "baseline_items_per_second": reference["items_per_second"],
+            "items_per_second": entry["items_per_second"],
+            "throughput_change": round(throughput_change, 3),
+            "peak_rss_change": round(rss_change, 3),
+            "regressed": throughput_change < -threshold or rss_change > threshold,
+        })
+    return rows
+
+
+def _parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv: List[str] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Run or compare resume pipeline benchmarks.")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks and write a JSON result file.")
+    run_parser.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated subset of {','.join(STAGES)}.")
+    run_parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES), help="Comma-separated resume counts.")
+    run_parser.add_argument("--size", choices=list(RESUME_SIZES), default="medium")
+    run_parser.add_argument("--skill-distribution", choices=SKILL_DISTRIBUTIONS, default="zipf")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--repeats", type=int, default=3, help="Runs per stage at scales up to 1000 (median is reported).")
+    run_parser.add_argument("--backend", help="Skill embedding backend (fp32/int8/static).")
+    run_parser.add_argument("--no-model", action="store_true", help="Skip loading the embedding model (keyword scoring).")
+    run_parser.add_argument("--in-process", action="store_true", help="Run all stages in this process (faster; no peak RSS).")
+    run_parser.add_argument("--output", help="Result file (default: stdout).")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions against a baseline result file.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="Allowed fractional slowdown / RSS growth.")
+    args = arg_parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, "r", encoding="utf-8") as f:
+            current = json.load(f)
+        rows = compare_results(baseline, current, args.threshold)
+        for row in rows:
+            flag = "REGRESSION" if row["regressed"] else "ok"
+            print(f"{flag:<10} {row['stage']:<13} n={row['scale']:<7} {row['baseline_items_per_second']:>10.1f} -> {row['items_per_second']:>10.1f} items/s "
+                  f"({row['throughput_change']:+.1%}), peak RSS {row['peak_rss_change']:+.1%}")
+        return 1 if any(row["regressed"] for row in rows) else 0
+
+    stages = _parse_list(args.stages)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        arg_parser.error(f"Unknown stage(s): {', '.join(sorted(unknown))}.")
+    scales = [int(s) for s in _parse_list(args.scales)]
+
+    config = {"seed": args.seed, "size": args.size, "skill_distribution": args.skill_distribution, "repeats": args.repeats,
+              "backend": args.backend, "no_model": args.no_model}
+    if args.in_process:
+        suite = BenchmarkSuite.from_config(config)
+        results, backend = suite.run(stages, scales), suite.backend
+    else:
+        results, backend = run_isolated(config, stages, scales)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "resume_size": args.size,
+            "skill_distribution": args.skill_distribution,
+            "seed": args.seed,
+            "backend": backend,
+            "isolated": not args.in_process,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"Wrote benchmark results to {args.output}.", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
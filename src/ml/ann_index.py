@@ -0,0 +1,314 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalizes rows so squared L2 distance ranks exactly like cosine similarity."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _squared_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise squared L2 distances between rows of `a` and rows of `b`."""
+    return (np.sum(a * a, axis=1)[:, None] - 2.0 * (a @ b.T) + np.sum(b * b, axis=1)[None, :]).clip(min=0.0)
+
+
+def _assign(data: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+    """Index of the nearest centroid for every row, computed in chunks to bound memory."""
+    labels = np.empty(len(data), dtype=np.int64)
+    for start in range(0, len(data), chunk_size):
+        labels[start:start + chunk_size] = np.argmin(_squared_distances(data[start:start + chunk_size], centroids), axis=1)
+    return labels
+
+
+def kmeans(data: np.ndarray, k: int, iterations: int = 20, seed: int = 0) -> np.ndarray:
+    """Plain Lloyd's k-means; empty clusters are re-seeded from random points."""
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(data, centroids)
+        counts = np.bincount(labels, minlength=k)
+        empty = counts == 0
+        # Per-cluster sums via one sort + segmented reduction (much faster than np.add.at)
+        order = np.argsort(labels, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[~empty]
+        centroids[~empty] = np.add.reduceat(data[order], starts, axis=0) / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = data[rng.choice(len(data), size=int(empty.sum()), replace=False)]
+    return centroids
+
+
+class IVFPQIndex:
+    """
+    Approximate nearest-neighbour index (inverted file + product quantization), pure NumPy.
+    Vectors are L2-normalized, assigned to the nearest of `n_lists` coarse centroids, and their
+    residuals are compressed to `n_subvectors` one-byte codes. A search scans only the `n_probe`
+    closest lists using precomputed distance tables; raising `n_probe` (and `rerank`, which
+    re-scores the best candidates with exact vectors) trades latency for recall.
+    """
+
+    def __init__(self, dim: int, n_lists: int = 256, n_subvectors: int = 8, store_vectors: bool = True):
+        if dim % n_subvectors:
+            raise ValueError(f"dim ({dim}) must be divisible by n_subvectors ({n_subvectors}).")
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_subvectors = n_subvectors
+        self.store_vectors = store_vectors
+        self.coarse_centroids: Optional[np.ndarray] = None # (n_lists, dim)
+        self.codebooks: Optional[np.ndarray] = None # (n_subvectors, n_codes, dim / n_subvectors)
+        self.codes = np.zeros((0, n_subvectors), dtype=np.uint8)
+        self.list_assignments = np.zeros(0, dtype=np.int32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.vectors = np.zeros((0, dim), dtype=np.float16) # kept for exact re-ranking
+        self._list_rows: Optional[List[np.ndarray]] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.coarse_centroids is not None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def train(self, vectors: np.ndarray, max_training_points: int = 65536, seed: int = 0):
+        """Learns the coarse centroids and PQ codebooks from a sample of `vectors`."""
+        data = _normalize(vectors)
+        if not len(data):
+            raise ValueError("Cannot train an index on zero vectors.")
+        rng = np.random.default_rng(seed)
+        if len(data) > max_training_points:
+            data = data[rng.choice(len(data), size=max_training_points, replace=False)]
+        self.n_lists = min(self.n_lists, len(data))
+        self.coarse_centroids = kmeans(data, self.n_lists, seed=seed)
+        residuals = data - self.coarse_centroids[_assign(data, self.coarse_centroids)]
+        n_codes = min(256, len(data))
+        sub_dim = self.dim // self.n_subvectors
+        self.codebooks = np.stack([
+            kmeans(np.ascontiguousarray(residuals[:, j * sub_dim:(j + 1) * sub_dim]), n_codes, seed=seed + j)
+            for j in range(self.n_subvectors)
+        ])
+
+    def _encode(self, residuals: np.ndarray) -> np.ndarray:
+        sub_dim = self.dim // self.n_subvectors
+        codes = np.empty((len(residuals), self.n_subvectors), dtype=np.uint8)
+        for j in range(self.n_subvectors):
+            codes[:, j] = _assign(np.ascontiguousarray(residuals[:, j * sub_dim:(j + 1) * sub_dim]), self.codebooks[j])
+        return codes
+
+    def add(self, vectors: np.ndarray, ids: np.ndarray):
+        """Inserts vectors incrementally (the index must be trained first)."""
+        if not self.is_trained:
+            raise RuntimeError("Train the index before adding vectors.")
+        data = _normalize(vectors)
+        lists = _assign(data, self.coarse_centroids)
+        codes = self._encode(data - self.coarse_centroids[lists])
+        # np.concatenate also copies memory-mapped arrays into memory before they are extended
+        self.codes = np.concatenate([self.codes, codes])
+        self.list_assignments = np.concatenate([self.list_assignments, lists.astype(np.int32)])
+        self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+        if self.store_vectors:
+            self.vectors = np.concatenate([self.vectors, data.astype(np.float16)])
+        self._list_rows = None
+
+    def _rows_by_list(self) -> List[np.ndarray]:
+        if self._list_rows is None:
+            order = np.argsort(self.list_assignments, kind="stable")
+            boundaries = np.searchsorted(self.list_assignments[order], np.arange(self.n_lists + 1))
+            self._list_rows = [order[boundaries[i]:boundaries[i + 1]] for i in range(self.n_lists)]
+        return self._list_rows
+
+    def search(self, query: np.ndarray, k: int = 10, n_probe: int = 8, rerank: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (ids, cosine similarities) of the approximate `k` nearest vectors to `query`.
+        With `rerank` > 0, the best `rerank * k` PQ candidates are re-scored exactly.
+        """
+        if len(self.ids) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        q = _normalize(query.reshape(1, -1))[0]
+        coarse_distances = _squared_distances(q[None, :], self.coarse_centroids)[0]
+        probed = np.argsort(coarse_distances)[:n_probe]
+        list_rows = self._rows_by_list()
+
+        sub_dim = self.dim // self.n_subvectors
+        row_chunks, distance_chunks = [], []
+        subvector_index = np.arange(self.n_subvectors)[None, :]
+        for list_id in probed:
+            rows = list_rows[list_id]
+            if len(rows) == 0:
+                continue
+            # Asymmetric distance: table[j, c] = ||residual_j(query) - codebook[j][c]||^2
+            residual = (q - self.coarse_centroids[list_id]).reshape(self.n_subvectors, 1, sub_dim)
+            table = np.sum((residual - self.codebooks) ** 2, axis=2)
+            distance_chunks.append(table[subvector_index, self.codes[rows]].sum(axis=1))
+            row_chunks.append(rows)
+        if not row_chunks:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        rows = np.concatenate(row_chunks)
+        distances = np.concatenate(distance_chunks)
+
+        n_candidates = min(len(rows), k * max(rerank, 1))
+        best = np.argpartition(distances, n_candidates - 1)[:n_candidates]
+        rows, distances = rows[best], distances[best]
+        if rerank and self.store_vectors and len(self.vectors):
+            distances = np.sum((np.asarray(self.vectors[rows], dtype=np.float32) - q) ** 2, axis=1)
+        top = np.argsort(distances, kind="stable")[:k]
+        # For unit vectors, ||a - b||^2 = 2 - 2cos(a, b)
+        return self.ids[rows[top]], (1.0 - distances[top] / 2.0).astype(np.float32)
+
+    def save(self, path: str):
+        """Writes every array as .npy (so `load` can memory-map them) plus a small JSON header."""
+        os.makedirs(path, exist_ok=True)
+        for name in ("coarse_centroids", "codebooks", "codes", "list_assignments", "ids", "vectors"):
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "index.json"), "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "n_lists": self.n_lists, "n_subvectors": self.n_subvectors,
+                       "store_vectors": self.store_vectors}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "IVFPQIndex":
+        """Loads an index; with `mmap` the codes, ids and vectors stay on disk until touched."""
+        with open(os.path.join(path, "index.json"), "r", encoding="utf-8") as f:
+            header = json.load(f)
+        index = cls(header["dim"], header["n_lists"], header["n_subvectors"], header["store_vectors"])
+        mmap_mode = 'r' if mmap else None
+        for name in ("coarse_centroids", "codebooks", "codes", "list_assignments", "ids", "vectors"):
+            setattr(index, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode))
+        return index
+
+
+def exact_search(vectors: np.ndarray, ids: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    """Brute-force cosine top-k ids, the ground truth for recall measurements."""
+    similarities = _normalize(vectors) @ _normalize(query.reshape(1, -1))[0]
+    top = np.argpartition(-similarities, min(k, len(similarities)) - 1)[:k]
+    return ids[top[np.argsort(-similarities[top], kind="stable")]]
+
+
+def benchmark_recall(index: IVFPQIndex, vectors: np.ndarray, ids: np.ndarray, queries: np.ndarray, k: int = 10,
+                     n_probes=(1, 4, 8, 16, 32), rerank: int = 0) -> List[Dict]:
+    """Recall@k against exact search and mean query latency for each `n_probe` setting."""
+    ground_truth = [set(exact_search(vectors, ids, q, k).tolist()) for q in queries]
+    started = time.perf_counter()
+    for q in queries:
+        exact_search(vectors, ids, q, k)
+    exact_ms = (time.perf_counter() - started) * 1000 / len(queries)
+    results = []
+    for n_probe in n_probes:
+        hits = 0
+        started = time.perf_counter()
+        for q, truth in zip(queries, ground_truth):
+            found, _ = index.search(q, k, n_probe=n_probe, rerank=rerank)
+            hits += len(truth.intersection(found.tolist()))
+        elapsed_ms = (time.perf_counter() - started) * 1000 / len(queries)
+        results.append({"n_probe": n_probe, "rerank": rerank, f"recall@{k}": round(hits / (k * len(queries)), 4),
+                        "latency_ms": round(elapsed_ms, 3), "exact_latency_ms": round(exact_ms, 3)})
+    return results
+
+
+def profile_text(skills: List[str], education: List[str] = ()) -> str:
+    """
+    The text embedded for a resume or a job: its skills, then its education keywords. Parsed fields
+    survive every pipeline (raw text is dropped early), and the result stays well inside the
+    model's token limit, where a whole resume would be silently truncated.
+    """
+    text = ", ".join(skills)
+    if education:
+        text += "; " + ", ".join(education)
+    return text
+
+
+class SemanticCandidateGenerator:
+    """
+    Candidate generator in front of `ResumeRanker`: embeds each resume's parsed profile (see
+    `profile_text`) with the SkillMatcher model, indexes them in an IVFPQIndex, and returns the
+    resumes semantically closest to a job's requirements so only those need full scoring.
+    """
+
+    def __init__(self, skill_matcher, index: IVFPQIndex = None, resume_ids: List[str] = None):
+        self.skill_matcher = skill_matcher
+        self.index = index
+        self.resume_ids = list(resume_ids or [])
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        # Whole profiles are one-offs, so keep them out of the skill embedding cache
+        embeddings = self.skill_matcher.embed_texts(texts, use_cache=False)
+        if embeddings is None:
+            raise RuntimeError("Semantic retrieval needs the embedding model, which is not loaded.")
+        return embeddings
+
+    def add_resumes(self, processed_resumes: List[Dict], n_lists: int = 256, n_subvectors: int = 8):
+        """Embeds and indexes resumes by their parsed skills and education; trains the index on the first call."""
+        if not processed_resumes:
+            return
+        embeddings = self._embed([profile_text(resume.get("parsed_data", {}).get("skills", []), resume.get("parsed_data", {}).get("education", []))
+                                  for resume in processed_resumes])
+        if self.index is None:
+            self.index = IVFPQIndex(embeddings.shape[1], n_lists=n_lists, n_subvectors=n_subvectors)
+        if not self.index.is_trained:
+            self.index.train(embeddings)
+        start = len(self.resume_ids)
+        self.resume_ids.extend(resume.get("resume_id") for resume in processed_resumes)
+        self.index.add(embeddings, np.arange(start, start + len(processed_resumes)))
+
+    def candidates(self, job_requirements: Dict, k: int = 200, n_probe: int = 8, rerank: int = 2) -> List[str]:
+        """Resume ids of the `k` resumes closest to the job's required skills and education."""
+        if self.index is None or len(self.index) == 0:
+            return []
+        query = profile_text(job_requirements.get("required_skills", []), job_requirements.get("required_education", []))
+        found, _ = self.index.search(self._embed([query])[0], k, n_probe=n_probe, rerank=rerank)
+        return [self.resume_ids[i] for i in found]
+
+    def rank(self, job_requirements: Dict, resumes_by_id: Dict[str, Dict], ranker, k: int = 200, n_probe: int = 8,
+             top_k: Optional[int] = None) -> List[Dict]:
+        """Retrieves the `k` nearest resumes and scores only those with `ranker`."""
+        shortlist = [resumes_by_id[resume_id] for resume_id in self.candidates(job_requirements, k, n_probe) if resume_id in resumes_by_id]
+        return ranker.rank_resumes_vectorized(shortlist, job_requirements, self.skill_matcher, top_k=top_k)
+
+    def save(self, path: str):
+        if self.index is None:
+            raise RuntimeError("Nothing to save: no resumes have been indexed.")
+        self.index.save(path)
+        with open(os.path.join(path, "resume_ids.json"), "w", encoding="utf-8") as f:
+            json.dump(self.resume_ids, f)
+
+    @classmethod
+    def load(cls, path: str, skill_matcher) -> "SemanticCandidateGenerator":
+        with open(os.path.join(path, "resume_ids.json"), "r", encoding="utf-8") as f:
+            resume_ids = json.load(f)
+        return cls(skill_matcher, IVFPQIndex.load(path), resume_ids)
+
+
+if __name__ == "__main__":
+    # Recall-vs-latency benchmark on synthetic clustered vectors (no model needed):
+    #   python -m src.ml.ann_index [--size N] [--dim D] [--queries Q] [--k K]
+    import argparse
+    arg_parser = argparse.ArgumentParser(description="Benchmark IVF-PQ recall@K against exact search.")
+    arg_parser.add_argument("--size", type=int, default=100000)
+    arg_parser.add_argument("--dim", type=int, default=384)
+    arg_parser.add_argument("--queries", type=int, default=100)
+    arg_parser.add_argument("--k", type=int, default=10)
+    arg_parser.add_argument("--n-lists", type=int, default=256)
+    arg_parser.add_argument("--n-subvectors", type=int, default=16)
+    args = arg_parser.parse_args()
+
+    # Two-level clustered data (roles -> specialisations -> resumes), loosely like real embeddings
+    rng = np.random.default_rng(0)
+    roles = rng.standard_normal((50, args.dim)).astype(np.float32)
+    specialisations = roles[rng.integers(0, len(roles), 2000)] + 0.6 * rng.standard_normal((2000, args.dim)).astype(np.float32)
+    def sample(n):
+        return specialisations[rng.integers(0, len(specialisations), n)] + 0.3 * rng.standard_normal((n, args.dim)).astype(np.float32)
+    base = sample(args.size)
+    queries = sample(args.queries)
+    base_ids = np.arange(args.size)
+
+    started = time.perf_counter()
+    ann = IVFPQIndex(args.dim, n_lists=args.n_lists, n_subvectors=args.n_subvectors)
+    ann.train(base)
+    ann.add(base, base_ids)
+    print(f"Built index over {args.size} vectors in {time.perf_counter() - started:.1f}s")
+    for rerank in (0, 4):
+        for row in benchmark_recall(ann, base, base_ids, queries, args.k, rerank=rerank):
+            print(json.dumps(row))
@@ -0,0 +1,202 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.ml.ranker import ResumeRanker
+
+# Parsed fields whose terms get posting lists; job requirements are matched against the same fields
+INDEXED_FIELDS = {"skills": "required_skills", "education": "required_education"}
+
+
+def _compress(doc_ids: np.ndarray) -> np.ndarray:
+    """Delta-encodes a sorted id array and stores it in the narrowest unsigned dtype that fits."""
+    if len(doc_ids) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    deltas = np.diff(doc_ids, prepend=np.int64(0)).astype(np.int64)
+    largest = int(deltas.max())
+    dtype = np.uint8 if largest < 2 ** 8 else np.uint16 if largest < 2 ** 16 else np.uint32
+    return deltas.astype(dtype)
+
+
+def _decompress(deltas: np.ndarray) -> np.ndarray:
+    return np.cumsum(deltas, dtype=np.int64)
+
+
+class CandidateIndex:
+    """
+    Persistent inverted index over the candidate pool.
+    Each resume's parsed skills, education terms and experience estimate are stored once; every
+    term has a posting list of internal document ids, kept sorted and delta-compressed. New
+    resumes are buffered and merged into the compressed lists lazily; deletes are tombstones
+    that `compact` (run on save) removes, renumbering the remaining doc ids. A job description
+    first retrieves a shortlist by posting-list union/intersection, and only that shortlist is
+    scored, reusing the stored experience estimates.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.docs: List[Optional[Dict]] = [] # internal doc id -> stored record (None once deleted, until `compact`)
+        self.doc_ids: Dict[str, int] = {} # resume_id -> internal doc id
+        self._postings: Dict[str, np.ndarray] = {} # term -> compressed sorted doc ids
+        self._pending: Dict[str, List[int]] = {} # term -> doc ids added since the last merge
+        self._deleted = set() # deleted doc ids still present in posting lists (until `compact`)
+        self._experience_estimator = ResumeRanker()
+        if path and os.path.exists(os.path.join(path, "docs.json")):
+            self._load()
+
+    @staticmethod
+    def _terms(field: str, values: Iterable[str]) -> List[str]:
+        return [f"{field}:{value.lower()}" for value in dict.fromkeys(values)]
+
+    def add(self, resume_id: str, parsed_data: Dict, original_source: str = None):
+        """Indexes one parsed resume (replacing any earlier version with the same id)."""
+        if resume_id in self.doc_ids:
+            self.delete(resume_id)
+        doc_id = len(self.docs)
+        self.docs.append({
+            "resume_id": resume_id,
+            "original_source": original_source,
+            "parsed_data": {k: v for k, v in parsed_data.items() if k != "rawContent"},
+            "experience_years": self._experience_estimator.estimate_experience_years(parsed_data.get("experience", [])),
+        })
+        self.doc_ids[resume_id] = doc_id
+        for field in INDEXED_FIELDS:
+            # Ids only grow, so appending keeps every posting list sorted
+            for term in self._terms(field, parsed_data.get(field, [])):
+                self._pending.setdefault(term, []).append(doc_id)
+
+    def delete(self, resume_id: str) -> bool:
+        doc_id = self.doc_ids.pop(resume_id, None)
+        if doc_id is None:
+            return False
+        self.docs[doc_id] = None
+        self._deleted.add(doc_id)
+        return True
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def postings(self, term: str) -> np.ndarray:
+        """Sorted live doc ids for a term (a `field:value` string)."""
+        self._merge_pending(term)
+        doc_ids = _decompress(self._postings.get(term, np.zeros(0, dtype=np.uint8)))
+        if self._deleted and len(doc_ids):
+            doc_ids = doc_ids[~np.isin(doc_ids, np.fromiter(self._deleted, dtype=np.int64))]
+        return doc_ids
+
+    def _merge_pending(self, term: str):
+        pending = self._pending.pop(term, None)
+        if pending:
+            existing = _decompress(self._postings.get(term, np.zeros(0, dtype=np.uint8)))
+            self._postings[term] = _compress(np.concatenate([existing, np.array(pending, dtype=np.int64)]))
+
+    def retrieve(self, job_requirements: Dict, min_overlap: int = 1) -> np.ndarray:
+        """
+        Doc ids of candidates sharing at least `min_overlap` of the job's skill/education terms.
+        `min_overlap=1` is a union of the posting lists; setting it to the number of job terms
+        is an intersection. A job with no indexed terms returns every live candidate.
+        """
+        terms = []
+        for field, requirement in INDEXED_FIELDS.items():
+            terms.extend(self._terms(field, job_requirements.get(requirement, [])))
+        if not terms:
+            return np.array(sorted(self.doc_ids.values()), dtype=np.int64)
+        lists = [self.postings(term) for term in terms]
+        doc_ids, overlap = np.unique(np.concatenate(lists), return_counts=True)
+        return doc_ids[overlap >= min_overlap]
+
+    def rank(self, job_requirements: Dict, skill_matcher, ranker, min_overlap: int = 1, top_k: Optional[int] = None) -> List[Dict]:
+        """Retrieves the shortlist for a job and scores only those candidates with `ranker`."""
+        shortlist = [self.docs[doc_id] for doc_id in self.retrieve(job_requirements, min_overlap)]
+        experience_years = np.array([doc["experience_years"] for doc in shortlist], dtype=np.float64)
+        return ranker.rank_resumes_vectorized(shortlist, job_requirements, skill_matcher, top_k=top_k, experience_years=experience_years)
+
+    def compact(self):
+        """
+        Merges buffered additions and drops deleted docs from `docs` and every posting list.
+        Live docs keep their relative order but get new, dense doc ids.
+        """
+        for term in list(self._pending):
+            self._merge_pending(term)
+        live = np.array([doc_id for doc_id, doc in enumerate(self.docs) if doc is not None], dtype=np.int64)
+        if len(live) < len(self.docs):
+            # Old doc id -> new doc id (-1 for deleted); monotone, so posting lists stay sorted
+            new_ids = np.full(len(self.docs), -1, dtype=np.int64)
+            new_ids[live] = np.arange(len(live))
+            for term in list(self._postings):
+                doc_ids = new_ids[_decompress(self._postings[term])]
+                doc_ids = doc_ids[doc_ids >= 0]
+                if len(doc_ids):
+                    self._postings[term] = _compress(doc_ids)
+                else:
+                    del self._postings[term]
+            self.docs = [self.docs[doc_id] for doc_id in live]
+            self.doc_ids = {doc["resume_id"]: doc_id for doc_id, doc in enumerate(self.docs)}
+        self._deleted = set()
+
+    def save(self, path: Optional[str] = None):
+        """Compacts and writes the index to `path` (docs.json + postings.npz)."""
+        path = path or self.path
+        os.makedirs(path, exist_ok=True)
+        self.compact()
+        docs_tmp = os.path.join(path, "docs.tmp.json")
+        postings_tmp = os.path.join(path, "postings.tmp.npz")
+        with open(docs_tmp, "w", encoding="utf-8") as f:
+            json.dump({"docs": self.docs}, f)
+        terms = list(self._postings)
+        np.savez(postings_tmp, terms=np.array(terms, dtype=np.str_), **{f"p{i}": self._postings[t] for i, t in enumerate(terms)})
+        os.replace(postings_tmp, os.path.join(path, "postings.npz"))
+        os.replace(docs_tmp, os.path.join(path, "docs.json"))
+
+    def _load(self):
+        with open(os.path.join(self.path, "docs.json"), "r", encoding="utf-8") as f:
+            self.docs = json.load(f)["docs"]
+        self.doc_ids = {doc["resume_id"]: doc_id for doc_id, doc in enumerate(self.docs) if doc is not None}
+        # Saved indexes are compacted, so no posting list still references a deleted doc
+        with np.load(os.path.join(self.path, "postings.npz")) as data:
+            self._postings = {str(term): data[f"p{i}"] for i, term in enumerate(data["terms"])}
+
+
+if __name__ == "__main__":
+    # Maintain the index from the command line:
+    #   python -m src.ml.candidate_index add --index DIR --input resumes/
+    #   python -m src.ml.candidate_index query --index DIR --job-description jd.txt [--min-overlap N] [--top-k K]
+    import argparse
+    import sys
+    from src.batch_rank import iter_documents, iter_parsed_resumes, write_results
+    from src.ml.job_description import process_job_description
+    from src.ml.resume_parser import ResumeParser
+    from src.ml.skill_matcher import SkillMatcher
+
+    arg_parser = argparse.ArgumentParser(description="Build or query the persistent candidate index.")
+    arg_parser.add_argument("command", choices=["add", "delete", "query"])
+    arg_parser.add_argument("--index", required=True, help="Index directory.")
+    arg_parser.add_argument("--input", help="add: directory, tarball or JSONL file of resumes.")
+    arg_parser.add_argument("--resume-id", action="append", default=[], help="delete: resume id to remove (repeatable).")
+    arg_parser.add_argument("--job-description", help="query: text file with the job description.")
+    arg_parser.add_argument("--min-overlap", type=int, default=1, help="query: minimum shared skill/education terms.")
+    arg_parser.add_argument("--top-k", type=int, default=100)
+    arg_parser.add_argument("--output", default="-", help="query: output file (.jsonl or .csv); '-' for stdout.")
+    args = arg_parser.parse_args()
+
+    index = CandidateIndex(args.index)
+    parser = ResumeParser()
+    if args.command == "add":
+        stats = {"failed": 0}
+        for resume in iter_parsed_resumes(iter_documents(args.input), parser, stats):
+            index.add(resume["resume_id"], resume["parsed_data"], resume["original_source"])
+        index.save()
+        print(f"Index now holds {len(index)} candidates ({stats['failed']} files failed).", file=sys.stderr)
+    elif args.command == "delete":
+        removed = sum(index.delete(resume_id) for resume_id in args.resume_id)
+        index.save()
+        print(f"Removed {removed} candidates; index now holds {len(index)}.", file=sys.stderr)
+    else:
+        with open(args.job_description, "r", encoding="utf-8") as f:
+            job_requirements = process_job_description(f.read(), parser.taxonomy)
+        shortlist_size = len(index.retrieve(job_requirements, args.min_overlap))
+        ranked = index.rank(job_requirements, SkillMatcher(), ResumeRanker(), args.min_overlap, args.top_k)
+        write_results(ranked, args.output)
+        print(f"Scored {shortlist_size} of {len(index)} candidates.", file=sys.stderr)
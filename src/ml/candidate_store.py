@@ -0,0 +1,226 @@
+import json
+import mmap
+import os
+import sys
+import tempfile
+import threading
+import weakref
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.ml.ranker import ResumeRanker
+
+# Parsed keyword fields stored as interned term ids
+TERM_FIELDS = ("skills", "experience", "education")
+# Fixed-size per-candidate columns; variable-length data lives in the term id arrays and the blob file
+RECORD_DTYPE = np.dtype([
+    ("raw_offset", np.uint64),
+    ("raw_length", np.uint32),
+    ("meta_offset", np.uint64), # JSON [resume_id, original_source, email, phone] in the blob file
+    ("meta_length", np.uint32),
+    ("id_hash", np.int64), # hash(resume_id), for `index_of` without a per-candidate dict
+    ("experience_years", np.float64),
+])
+
+
+class TermVocabulary:
+    """Interns terms (skills, education keywords, ...) to dense integer ids shared by all candidates."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+
+    def intern(self, term: str) -> int:
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(sys.intern(term))
+        return term_id
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+
+class BlobStore:
+    """
+    Append-only file of UTF-8 text blobs addressed by (offset, length), read back through a
+    memory map so raw resume text lives in the page cache instead of the Python heap.
+    Without a `path`, a temporary file is used and deleted when the store is closed or collected.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="resume_blobs_", suffix=".bin")
+            os.close(fd)
+            self._finalizer = weakref.finalize(self, os.remove, path)
+        else:
+            self._finalizer = None
+        self.path = path
+        self._file = open(path, "a+b")
+        self._file.seek(0, os.SEEK_END)
+        self.size = self._file.tell()
+        self._map = None
+        self._lock = threading.Lock()
+
+    def append(self, text: str) -> Tuple[int, int]:
+        data = text.encode("utf-8")
+        with self._lock:
+            offset = self.size
+            self._file.write(data)
+            self.size += len(data)
+        return offset, len(data)
+
+    def read(self, offset: int, length: int) -> str:
+        if length == 0:
+            return ""
+        with self._lock:
+            if self._map is None or offset + length > len(self._map):
+                # The file grew past the current mapping: flush pending writes and remap
+                self._file.flush()
+                if self._map is not None:
+                    self._map.close()
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._map[offset:offset + length].decode("utf-8")
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+class CandidateStore:
+    """
+    Compact columnar store for a candidate pool.
+    Instead of one nested dict per resume, fixed-size fields live in a structured NumPy array,
+    keyword fields are flat arrays of interned term ids (with per-candidate offsets), and the raw
+    resume text and per-candidate strings (id, source, contact) are spilled to a memory-mapped
+    `BlobStore`; raw text is fetched on demand with `raw_text`.
+    """
+
+    def __init__(self, blob_path: Optional[str] = None, ranker: ResumeRanker = None):
+        self.vocabulary = TermVocabulary()
+        self.blobs = BlobStore(blob_path)
+        self._count = 0
+        self._records = np.zeros(64, dtype=RECORD_DTYPE)
+        # field -> flat uint32 term ids, and field -> start offset of each candidate's ids (plus a final end)
+        self._term_ids = {field: array("I") for field in TERM_FIELDS}
+        self._term_starts = {field: array("I", [0]) for field in TERM_FIELDS}
+        self._experience_estimator = ranker if ranker is not None else ResumeRanker()
+
+    @classmethod
+    def from_resumes(cls, processed_resumes: List[Dict], blob_path: Optional[str] = None, ranker: ResumeRanker = None) -> "CandidateStore":
+        store = cls(blob_path, ranker)
+        for resume in processed_resumes:
+            store.add(resume["resume_id"], resume.get("parsed_data", {}), resume.get("original_source"))
+        return store
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, resume_id: str, parsed_data: Dict, original_source: Optional[str] = None) -> int:
+        """Appends one parsed resume and returns its position; `rawContent` goes to the blob file."""
+        position = self._count
+        if position == len(self._records):
+            self._records = np.resize(self._records, 2 * len(self._records)) # Amortized growth
+        contact = parsed_data.get("contact") or {}
+        raw_offset, raw_length = self.blobs.append(parsed_data.get("rawContent") or "")
+        meta_offset, meta_length = self.blobs.append(json.dumps([resume_id, original_source, contact.get("email"), contact.get("phone")]))
+        experience_years = self._experience_estimator.estimate_experience_years(parsed_data.get("experience", []))
+        self._records[position] = (raw_offset, raw_length, meta_offset, meta_length, hash(resume_id), experience_years)
+        for field in TERM_FIELDS:
+            ids = self._term_ids[field]
+            ids.extend(self.vocabulary.intern(term) for term in parsed_data.get(field, []))
+            self._term_starts[field].append(len(ids))
+        self._count += 1
+        return position
+
+    def _meta(self, position: int) -> List:
+        record = self._records[position]
+        return json.loads(self.blobs.read(int(record["meta_offset"]), int(record["meta_length"])))
+
+    def resume_id(self, position: int) -> str:
+        return self._meta(position)[0]
+
+    def index_of(self, resume_id: str) -> Optional[int]:
+        """Position of `resume_id` (the latest one if it was added more than once), or None."""
+        for position in np.flatnonzero(self._records["id_hash"][:self._count] == hash(resume_id))[::-1]:
+            if self.resume_id(int(position)) == resume_id: # Rule out hash collisions
+                return int(position)
+        return None
+
+    @property
+    def experience_years(self) -> np.ndarray:
+        """Every candidate's experience estimate (a copy, so it doesn't change as the store grows)."""
+        return self._records["experience_years"][:self._count].copy()
+
+    def terms(self, position: int, field: str) -> List[str]:
+        starts = self._term_starts[field]
+        vocabulary = self.vocabulary.terms
+        return [vocabulary[term_id] for term_id in self._term_ids[field][starts[position]:starts[position + 1]]]
+
+    def term_lists(self, field: str, start: int = 0, stop: Optional[int] = None) -> Iterator[List[str]]:
+        """Terms for `field` of each candidate in positions [start, stop), in order (lists are built on the fly)."""
+        for position in range(start, min(self._count, stop) if stop is not None else self._count):
+            yield self.terms(position, field)
+
+    def field_terms(self, field: str) -> List[str]:
+        """Distinct terms used in `field` by any candidate, in term id order."""
+        vocabulary = self.vocabulary.terms
+        return [vocabulary[term_id] for term_id in np.unique(np.array(self._term_ids[field], dtype=np.uint32))]
+
+    def resume(self, position: int) -> Dict:
+        """A processed-resume dict, as the ranker and UI expect, built on demand (without `rawContent`)."""
+        resume_id, original_source, email, phone = self._meta(position)
+        parsed_data = {field: self.terms(position, field) for field in TERM_FIELDS}
+        parsed_data["contact"] = {"email": email, "phone": phone}
+        return {"resume_id": resume_id, "original_source": original_source, "parsed_data": parsed_data}
+
+    def raw_text(self, position: int) -> str:
+        record = self._records[position]
+        return self.blobs.read(int(record["raw_offset"]), int(record["raw_length"]))
+
+    def nbytes(self) -> int:
+        """Approximate heap footprint (records, term ids and vocabulary; the blob file is excluded)."""
+        total = self._records.nbytes
+        total += sum(ids.itemsize * len(ids) + starts.itemsize * len(starts) for ids, starts in zip(self._term_ids.values(), self._term_starts.values()))
+        return total + sum(sys.getsizeof(term) for term in self.vocabulary.terms)
+
+    def close(self):
+        self.blobs.close()
+
+
+if __name__ == "__main__":
+    # Memory comparison on a synthetic pool:  python -m src.ml.candidate_store --count 10000
+    import argparse
+    import tracemalloc
+    from src.benchmarks.corpus import CorpusGenerator
+    from src.ml.resume_parser import ResumeParser
+
+    arg_parser = argparse.ArgumentParser(description="Compare heap usage of dict-based resumes and the compact candidate store.")
+    arg_parser.add_argument("--count", type=int, default=10000)
+    args = arg_parser.parse_args()
+
+    generator, parser = CorpusGenerator(), ResumeParser()
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    resumes = [{"resume_id": f"resume_{i:06d}", "original_source": f"resume_{i:06d}.pdf", "parsed_data": parser.parse_text(generator.resume_text(i))}
+               for i in range(args.count)]
+    dict_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    del resumes
+
+    baseline = tracemalloc.get_traced_memory()[0]
+    store = CandidateStore()
+    for i in range(args.count):
+        store.add(f"resume_{i:06d}", parser.parse_text(generator.resume_text(i)), f"resume_{i:06d}.pdf")
+    store_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    print(f"{args.count} candidates: dicts {dict_bytes / 1e6:.1f} MB, compact store {store_bytes / 1e6:.1f} MB "
+          f"({dict_bytes / max(store_bytes, 1):.1f}x smaller); raw text on disk: {store.blobs.size / 1e6:.1f} MB")
+    store.close()
@@ -0,0 +1,233 @@
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.ml.embedding_cache import normalize_text
+
+BACKENDS = ("fp32", "int8", "static")
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_STATIC_TABLE_DIR = os.environ.get("STATIC_EMBEDDING_DIR", os.path.join("data", "static_embeddings"))
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class TransformerBackend:
+    """
+    Runs the transformer on CPU/GPU: full fp32, or with the linear layers dynamically
+    quantized to int8 (`quantize=True`), which is typically ~2x faster on CPU.
+    `num_threads` sets torch's intra-op thread count (a process-wide setting).
+    """
+
+    def __init__(self, model_name: str, quantize: bool = False, num_threads: Optional[int] = None):
+        import torch
+        from transformers import AutoTokenizer, AutoModel
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name)
+        self.model.eval()
+        if quantize:
+            # Dynamic quantization only applies on CPU
+            self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+            self.device = torch.device("cpu")
+        else:
+            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model.to(self.device)
+        self.dim = self.model.config.hidden_size
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Runs the model over `texts` in mini-batches and returns an (n, dim) array.
+        Texts are sorted by length before batching so dynamic padding stays small, and the
+        mean pool only averages real tokens (padding is masked out via the attention mask).
+        """
+        import torch
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        # Group texts of similar length together to minimise padding per batch
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            batch_texts = [texts[i] for i in batch_indices]
+            inputs = self.tokenizer(batch_texts, return_tensors='pt', truncation=True, padding=True).to(self.device)
+            with torch.no_grad():
+                outputs = self.model(**inputs)
+            # Attention-mask-aware mean pooling over token embeddings
+            mask = inputs['attention_mask'].unsqueeze(-1).type_as(outputs.last_hidden_state)
+            summed = (outputs.last_hidden_state * mask).sum(dim=1)
+            counts = mask.sum(dim=1).clamp(min=1e-9)
+            embeddings[batch_indices] = (summed / counts).cpu().numpy()
+        return embeddings
+
+
+class StaticEmbeddingBackend:
+    """
+    Transformer-free backend: a precomputed table of phrase and word vectors distilled from the
+    fp32 model. Known phrases (e.g. taxonomy skills) are looked up directly; anything else is
+    the mean of its known word vectors (a zero vector if no word is known).
+    """
+
+    def __init__(self, phrases: Dict[str, int], words: Dict[str, int], vectors: np.ndarray):
+        self.phrases = phrases
+        self.words = words
+        self.vectors = vectors
+        self.dim = vectors.shape[1]
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            text = normalize_text(text)
+            row = self.phrases.get(text)
+            if row is not None:
+                embeddings[i] = self.vectors[row]
+                continue
+            rows = [self.words[word] for word in _WORD_PATTERN.findall(text) if word in self.words]
+            if rows:
+                embeddings[i] = self.vectors[rows].mean(axis=0)
+        return embeddings
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_STATIC_TABLE_DIR) -> "StaticEmbeddingBackend":
+        with open(os.path.join(path, "table.json"), "r", encoding="utf-8") as f:
+            table = json.load(f)
+        return cls(table["phrases"], table["words"], np.load(os.path.join(path, "vectors.npy"), mmap_mode='r'))
+
+    @staticmethod
+    def build(source_backend: TransformerBackend, phrases: List[str], extra_words: List[str] = (), path: str = DEFAULT_STATIC_TABLE_DIR):
+        """Distills a table from `source_backend`: every phrase, plus every word in them and in `extra_words`."""
+        phrases = list(dict.fromkeys(normalize_text(p) for p in phrases if p.strip()))
+        words = list(dict.fromkeys(w for text in list(phrases) + list(extra_words) for w in _WORD_PATTERN.findall(normalize_text(text))))
+        entries = phrases + words
+        vectors = source_backend.encode(entries)
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "vectors.npy"), vectors)
+        with open(os.path.join(path, "table.json"), "w", encoding="utf-8") as f:
+            json.dump({"phrases": {p: i for i, p in enumerate(phrases)},
+                       "words": {w: len(phrases) + i for i, w in enumerate(words)}}, f)
+        print(f"Wrote static embedding table ({len(phrases)} phrases, {len(words)} words) to {path}.")
+
+
+def create_backend(backend: str, model_name: str, num_threads: Optional[int] = None, static_table_path: str = DEFAULT_STATIC_TABLE_DIR):
+    """Builds the named inference backend ('fp32', 'int8' or 'static')."""
+    if backend == "fp32":
+        return TransformerBackend(model_name, quantize=False, num_threads=num_threads)
+    if backend == "int8":
+        return TransformerBackend(model_name, quantize=True, num_threads=num_threads)
+    if backend == "static":
+        return StaticEmbeddingBackend.load(static_table_path)
+    raise ValueError(f"Unknown embedding backend '{backend}'; expected one of {BACKENDS}.")
+
+
+# --- Accuracy check against fp32 ---
+
+REFERENCE_JOBS = [
+    "Senior Data Scientist with 5+ years experience in Python, Machine Learning, Deep Learning and Vertex AI. Master's degree.",
+    "Backend engineer with 3+ years experience in Java, SQL, Docker and Kubernetes. Bachelor's in Computer Science.",
+    "Data engineer: big data pipelines with Spark and Hadoop on AWS or GCP, strong SQL.",
+    "Frontend developer with JavaScript and React; some cloud exposure (Azure).",
+]
+REFERENCE_RESUMES = [
+    "Senior Data Scientist, 6 years experience. Python, TensorFlow, PyTorch, machine learning, NLP. Master of Science, Stanford University.",
+    "Junior analyst. SQL, statistics, Excel. Bachelor degree in Mathematics.",
+    "Lead engineer. Java, Spring, Docker, Kubernetes, AWS. 8 years experience. B.Tech Computer Science.",
+    "Data engineer with Spark, Hadoop, big data, SQL and GCP. Developed pipelines. Bachelor of Engineering.",
+    "Frontend developer: JavaScript, React, Azure. Associate. College graduate.",
+    "ML engineer: deep learning, pytorch, vertex ai, kubernetes, python. PhD in Computer Science.",
+    "RPA specialist: RPA, cloud, AI. MBA.",
+    "Software engineer. Python, Java, JavaScript, SQL, Docker. Worked as senior engineer. Master degree.",
+    "Statistician: statistics, R, data science, machine learning. PhD, University.",
+    "Cloud architect: AWS, Azure, GCP, Kubernetes, Docker. 10 years experience. Managed teams.",
+]
+
+
+def _kendall_tau(order_a: List, order_b: List) -> float:
+    """Kendall rank correlation between two orderings of the same items (1.0 = identical)."""
+    position_b = {item: i for i, item in enumerate(order_b)}
+    ranks = [position_b[item] for item in order_a]
+    n = len(ranks)
+    if n < 2:
+        return 1.0
+    concordant = sum(1 for i in range(n) for j in range(i + 1, n) if ranks[i] < ranks[j])
+    pairs = n * (n - 1) // 2
+    return (2 * concordant - pairs) / pairs
+
+
+def compare_backends(reference_matcher, candidate_matcher, jobs: List[str] = None, resumes: List[str] = None, top_k: int = 3) -> Dict:
+    """
+    Reports how far `candidate_matcher`'s similarities and rankings drift from `reference_matcher`
+    (normally fp32) on a reference set of job descriptions and resumes.
+    """
+    from sklearn.metrics.pairwise import cosine_similarity
+    from src.ml.job_description import process_job_description
+    from src.ml.ranker import ResumeRanker
+    from src.ml.resume_parser import ResumeParser
+    from src.nlp.taxonomy import get_default_taxonomy
+
+    jobs = jobs or REFERENCE_JOBS
+    resumes = resumes or REFERENCE_RESUMES
+    parser, ranker = ResumeParser(), ResumeRanker()
+
+    # Skill-to-skill similarity drift over the taxonomy's skill vocabulary
+    skills = get_default_taxonomy().terms("skills")
+    reference_similarity = cosine_similarity(reference_matcher.embed_texts(skills, use_cache=False))
+    candidate_similarity = cosine_similarity(candidate_matcher.embed_texts(skills, use_cache=False))
+    similarity_error = np.abs(reference_similarity - candidate_similarity)
+
+    processed = [{"resume_id": f"resume_{i}", "parsed_data": parser.parse_text(text)} for i, text in enumerate(resumes)]
+    score_errors, skill_score_errors, taus, top_k_overlaps = [], [], [], []
+    for job_text in jobs:
+        requirements = process_job_description(job_text, parser.taxonomy)
+        reference = ranker.rank_resumes_vectorized(processed, requirements, reference_matcher)
+        candidate = ranker.rank_resumes_vectorized(processed, requirements, candidate_matcher)
+        candidate_by_id = {record["resume_id"]: record for record in candidate}
+        for record in reference:
+            score_errors.append(abs(record["score"] - candidate_by_id[record["resume_id"]]["score"]))
+            skill_score_errors.append(abs(record["skill_match_score"] - candidate_by_id[record["resume_id"]]["skill_match_score"]))
+        reference_order = [record["resume_id"] for record in reference]
+        candidate_order = [record["resume_id"] for record in candidate]
+        taus.append(_kendall_tau(reference_order, candidate_order))
+        top_k_overlaps.append(len(set(reference_order[:top_k]) & set(candidate_order[:top_k])) / top_k)
+
+    return {
+        "skill_similarity_mean_abs_error": round(float(similarity_error.mean()), 4),
+        "skill_similarity_max_abs_error": round(float(similarity_error.max()), 4),
+        "final_score_mean_abs_error": round(float(np.mean(score_errors)), 3),
+        "final_score_max_abs_error": int(np.max(score_errors)),
+        "skill_match_pct_mean_abs_error": round(float(np.mean(skill_score_errors)), 3),
+        "ranking_kendall_tau_mean": round(float(np.mean(taus)), 4),
+        f"top{top_k}_overlap_mean": round(float(np.mean(top_k_overlaps)), 4),
+    }
+
+
+if __name__ == "__main__":
+    #   python -m src.ml.embedding_backends build-static [--model NAME] [--output DIR] [--words-file FILE]
+    #   python -m src.ml.embedding_backends check --backend int8|static [--threads N]
+    import argparse
+    from src.ml.skill_matcher import SkillMatcher
+    from src.nlp.taxonomy import get_default_taxonomy
+
+    arg_parser = argparse.ArgumentParser(description="Build the static embedding table or check backend accuracy against fp32.")
+    arg_parser.add_argument("command", choices=["build-static", "check"])
+    arg_parser.add_argument("--backend", choices=BACKENDS, default="int8", help="check: backend to compare with fp32.")
+    arg_parser.add_argument("--model", default=DEFAULT_MODEL_NAME, help="Transformer model to distill (build-static) or compare (check).")
+    arg_parser.add_argument("--threads", type=int, help="Intra-op threads for transformer backends.")
+    arg_parser.add_argument("--output", default=DEFAULT_STATIC_TABLE_DIR, help="build-static: table directory.")
+    arg_parser.add_argument("--words-file", help="build-static: optional file with extra words, one per line.")
+    args = arg_parser.parse_args()
+
+    if args.command == "build-static":
+        extra_words = []
+        if args.words_file:
+            with open(args.words_file, "r", encoding="utf-8") as f:
+                extra_words = [line.strip() for line in f if line.strip()]
+        taxonomy = get_default_taxonomy()
+        phrases = [term for category in taxonomy.categories for term in taxonomy.terms(category)]
+        StaticEmbeddingBackend.build(TransformerBackend(args.model, num_threads=args.threads), phrases, extra_words, args.output)
+    else:
+        reference = SkillMatcher(args.model, backend="fp32", cache_dir=None, num_threads=args.threads)
+        candidate = SkillMatcher(args.model, backend=args.backend, cache_dir=None, num_threads=args.threads, static_table_path=args.output)
+        if not (reference.model_loaded and candidate.model_loaded):
+            raise SystemExit("Both backends must load to compare them.")
+        print(json.dumps(compare_backends(reference, candidate), indent=2))
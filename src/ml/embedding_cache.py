@@ -0,0 +1,219 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.environ.get("SKILL_EMBEDDING_CACHE_DIR", os.path.join("data", "embedding_cache"))
+DEFAULT_MEMORY_BUDGET_BYTES = 64 * 1024 * 1024 # 64 MB of vectors kept in-process
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes a skill/phrase so trivially different spellings share one cache entry."""
+    return ' '.join(text.lower().split())
+
+
+class LRUEmbeddingCache:
+    """In-process LRU of {key: vector} bounded by the total bytes of the stored vectors."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def peek(self, key):
+        """Like `get`, but leaves the LRU order alone."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, vector: np.ndarray):
+        entry_bytes = vector.nbytes
+        if entry_bytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key).nbytes
+            self._entries[key] = vector
+            self.current_bytes += entry_bytes
+            # Evict least recently used entries until we are back under budget
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class MmapVectorStore:
+    """
+    Read-only, memory-mapped on-disk vector store for one model.
+    Layout: `<path>/vectors.npy` (float32, one row per text) and `<path>/index.json`
+    ({"model_name", "dim", "texts"}). Because vectors are opened with mmap_mode='r',
+    every worker process shares the same page cache instead of its own copy.
+    """
+
+    def __init__(self, path: str, model_name: str):
+        self.path = path
+        self.model_name = model_name
+        self.rows = {}
+        self.vectors = None
+        index_path = os.path.join(path, "index.json")
+        vectors_path = os.path.join(path, "vectors.npy")
+        if not (os.path.exists(index_path) and os.path.exists(vectors_path)):
+            return
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("model_name") != model_name:
+                print(f"Warning: embedding store at {path} was built for {index.get('model_name')}, not {model_name}; ignoring it.")
+                return
+            self.vectors = np.load(vectors_path, mmap_mode='r')
+            self.rows = {text: row for row, text in enumerate(index.get("texts", []))}
+        except Exception as e:
+            print(f"Warning: Could not open embedding store at {path} ({e}).")
+            self.rows = {}
+            self.vectors = None
+
+    def get(self, text: str):
+        row = self.rows.get(text)
+        if row is None:
+            return None
+        return np.asarray(self.vectors[row])
+
+    def __len__(self):
+        return len(self.rows)
+
+    @staticmethod
+    def write(path: str, model_name: str, texts: list, vectors: np.ndarray):
+        """Writes a store atomically (temp files + rename) so readers never see a partial store."""
+        os.makedirs(path, exist_ok=True)
+        vectors_tmp = os.path.join(path, "vectors.tmp.npy")
+        index_tmp = os.path.join(path, "index.tmp.json")
+        np.save(vectors_tmp, np.asarray(vectors, dtype=np.float32))
+        with open(index_tmp, "w", encoding="utf-8") as f:
+            json.dump({"model_name": model_name, "dim": int(vectors.shape[1]) if len(texts) else 0, "texts": list(texts)}, f)
+        os.replace(vectors_tmp, os.path.join(path, "vectors.npy"))
+        os.replace(index_tmp, os.path.join(path, "index.json"))
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache keyed by (model name, normalized text).
+    Tier 1 is an in-process LRU with a byte budget; tier 2 is a memory-mapped on-disk
+    store, typically prebuilt at image build time and shared read-only between workers.
+    """
+
+    def __init__(self, model_name: str, disk_path: str = DEFAULT_CACHE_DIR, max_memory_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES):
+        self.model_name = model_name
+        self.memory = LRUEmbeddingCache(max_memory_bytes)
+        self.disk = MmapVectorStore(disk_path, model_name) if disk_path else None
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock() # The cache is shared by the warm-up thread and request threads
+
+    def _count(self, counter: str):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, text: str):
+        """Returns the cached vector for `text`, or None on a miss."""
+        key = (self.model_name, normalize_text(text))
+        vector = self.memory.get(key)
+        if vector is not None:
+            self._count("hits_memory")
+            return vector
+        if self.disk is not None:
+            vector = self.disk.get(key[1])
+            if vector is not None:
+                self._count("hits_disk")
+                self.memory.put(key, vector) # Promote to the in-process tier
+                return vector
+        self._count("misses")
+        return None
+
+    def peek(self, text: str):
+        """
+        Returns the cached vector for `text`, or None, without counting a hit or miss or changing
+        either tier. For probes that don't embed on a miss, which would otherwise skew `stats()`.
+        """
+        key = (self.model_name, normalize_text(text))
+        vector = self.memory.peek(key)
+        if vector is None and self.disk is not None:
+            vector = self.disk.get(key[1])
+        return vector
+
+    def put(self, text: str, vector: np.ndarray):
+        self.memory.put((self.model_name, normalize_text(text)), vector)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for both tiers."""
+        with self._stats_lock:
+            hits_memory, hits_disk, misses = self.hits_memory, self.hits_disk, self.misses
+        lookups = hits_memory + hits_disk + misses
+        return {
+            "hits_memory": hits_memory,
+            "hits_disk": hits_disk,
+            "misses": misses,
+            "hit_rate": (hits_memory + hits_disk) / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.current_bytes,
+            "disk_entries": len(self.disk) if self.disk is not None else 0,
+        }
+
+
+def build_disk_cache(skill_matcher, texts: list, path: str = DEFAULT_CACHE_DIR):
+    """
+    Prebuilds (or extends) the on-disk store for `skill_matcher`'s model.
+    Existing entries are kept, so the store can be grown incrementally.
+    """
+    existing = MmapVectorStore(path, skill_matcher.embedding_id)
+    known_texts = list(existing.rows)
+    # normalized key -> first original spelling; the model embeds the original, the store is keyed by the normalized text
+    new_texts = {}
+    for text in texts:
+        key = normalize_text(text)
+        if key and key not in existing.rows:
+            new_texts.setdefault(key, text)
+    if not new_texts:
+        print(f"Embedding store at {path} is already up to date ({len(known_texts)} entries).")
+        return
+    new_vectors = skill_matcher.embed_texts(list(new_texts.values()), use_cache=False)
+    if new_vectors is None:
+        raise RuntimeError("Cannot build the embedding store: the embedding model is not loaded.")
+    if known_texts:
+        vectors = np.vstack([np.asarray(existing.vectors), new_vectors])
+    else:
+        vectors = new_vectors
+    MmapVectorStore.write(path, skill_matcher.embedding_id, known_texts + list(new_texts), vectors)
+    print(f"Wrote {len(known_texts) + len(new_texts)} embeddings to {path}.")
+
+
+if __name__ == "__main__":
+    # Prebuild the on-disk store, e.g. at image build time:
+    #   python -m src.ml.embedding_cache [--output DIR] [--terms-file FILE] [--backend fp32|int8|static]
+    import argparse
+    from src.nlp.taxonomy import get_default_taxonomy
+    from src.ml.skill_matcher import SkillMatcher
+
+    arg_parser = argparse.ArgumentParser(description="Prebuild the on-disk skill embedding cache.")
+    arg_parser.add_argument("--output", default=DEFAULT_CACHE_DIR, help="Directory of the vector store.")
+    arg_parser.add_argument("--terms-file", help="Optional file with one extra skill/phrase per line.")
+    arg_parser.add_argument("--backend", default="fp32", help="Inference backend the store is built for (non-fp32 stores go in a subdirectory).")
+    args = arg_parser.parse_args()
+
+    terms = get_default_taxonomy().terms("skills")
+    if args.terms_file:
+        with open(args.terms_file, "r", encoding="utf-8") as f:
+            terms.extend(line.strip() for line in f if line.strip())
+    output = args.output if args.backend == "fp32" else os.path.join(args.output, args.backend)
+    build_disk_cache(SkillMatcher(cache_dir=None, backend=args.backend), terms, output)
@@ -0,0 +1,155 @@
+import time
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from src.ml.candidate_store import CandidateStore
+from src.ml.ranker import ResumeRanker
+from src.utils.metrics import increment, instrumented
+
+# Candidates whose skill lists are materialized as Python lists at a time while scoring
+SCORING_CHUNK_SIZE = 4096
+
+
+class ResumeFeatureStore:
+    """
+    Per-resume features for one candidate pool, kept between re-rankings (e.g. in Streamlit
+    session state).
+
+    Candidates are held in a compact `CandidateStore` (raw text spilled to a memory-mapped
+    blob file); skill lists are only materialized chunk by chunk while scoring. Resume skill
+    embeddings are computed once per pool size. Each job-dependent feature column is cached under
+    the requirement it depends on (and the pool size), so a job description edit only recomputes
+    the columns whose requirement changed, and a weight change reuses every column and only
+    redoes the weighted combination and sort.
+    """
+
+    def __init__(self, candidates: Union[CandidateStore, List[Dict]], ranker: ResumeRanker = None):
+        if not isinstance(candidates, CandidateStore):
+            candidates = CandidateStore.from_resumes(candidates, ranker=ranker)
+        self.candidates = candidates
+        # (pool size, {skill: embedding}) for every resume skill; filled on first use once the model is loaded
+        self._resume_skill_embeddings: Optional[tuple] = None
+        # column -> (requirement key, values)
+        self._columns: Dict[str, tuple] = {}
+        self.last_recomputed: List[str] = []
+        self.last_rank_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    @property
+    def experience_years(self) -> np.ndarray:
+        return self.candidates.experience_years
+
+    def _skill_embeddings(self, job_skills: List[str], skill_matcher) -> Dict:
+        if not skill_matcher.model_loaded:
+            return {}
+        if self._resume_skill_embeddings is None or self._resume_skill_embeddings[0] != len(self.candidates):
+            self._resume_skill_embeddings = (len(self.candidates), skill_matcher.embed_skills(self.candidates.field_terms("skills")))
+        # Only the job side needs embedding; known skills come from the embedding cache
+        return {**self._resume_skill_embeddings[1], **skill_matcher.embed_skills(job_skills)}
+
+    def _skill_chunks(self):
+        """Candidates' skill lists, SCORING_CHUNK_SIZE candidates at a time."""
+        for start in range(0, len(self.candidates), SCORING_CHUNK_SIZE):
+            yield list(self.candidates.term_lists("skills", start, start + SCORING_CHUNK_SIZE))
+
+    def _skill_scores(self, job_skills: List[str], skill_matcher, ranker: ResumeRanker) -> np.ndarray:
+        embeddings = self._skill_embeddings(job_skills, skill_matcher)
+        return np.concatenate([np.zeros(0)] + [ranker.skill_scores_from_embeddings(skill_lists, job_skills, embeddings, skill_matcher)
+                                               for skill_lists in self._skill_chunks()])
+
+    def _column(self, name: str, key, compute) -> np.ndarray:
+        key = (len(self.candidates), key) # Columns computed before the pool grew are stale
+        cached = self._columns.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        values = compute()
+        self._columns[name] = (key, values)
+        self.last_recomputed.append(name)
+        return values
+
+    def features(self, job_requirements: Dict, skill_matcher, ranker: ResumeRanker) -> Dict[str, np.ndarray]:
+        """Feature columns for `job_requirements`, in the shape `ResumeRanker.build_features` returns."""
+        self.last_recomputed = []
+        job_skills = list(job_requirements.get("required_skills", []))
+        min_experience_years = job_requirements.get("min_experience_years", 0)
+        required_education = list(job_requirements.get("required_education", []))
+
+        # The skill column also depends on whether the model was loaded (keyword fallback otherwise)
+        skill = self._column("skill", (tuple(job_skills), skill_matcher.model_loaded), lambda: self._skill_scores(job_skills, skill_matcher, ranker))
+        experience_years = self.experience_years
+        experience = self._column("experience", min_experience_years,
+                                  lambda: ranker.experience_scores(experience_years, min_experience_years))
+        education = self._column("education", tuple(required_education), lambda: np.array(
+            [ranker.education_score({"education": education}, required_education) for education in self.candidates.term_lists("education")],
+            dtype=np.float64))
+        return {"skill": skill, "experience_years": experience_years, "experience": experience, "education": education}
+
+    @instrumented("feature_store_rank")
+    def rank(self, job_requirements: Dict, skill_matcher, ranker: ResumeRanker, top_k: Optional[int] = None) -> List[Dict]:
+        """
+        Same output as `ranker.rank_resumes_vectorized` (minus `rawContent`, see `candidates.raw_text`),
+        recomputing only what changed since the last call.
+        """
+        started = time.perf_counter()
+        increment("resumes_ranked", len(self))
+        features = self.features(job_requirements, skill_matcher, ranker)
+        scores = ranker.combine_scores(features)
+        ranked = [ranker.ranked_record(self.candidates.resume(i), scores, features, i) for i in ranker.top_k_indices(scores, top_k)]
+        self.last_rank_seconds = time.perf_counter() - started
+        return ranked
+
+    @instrumented("feature_store_rank_jobs")
+    def rank_jobs(self, job_requirements_list: List[Dict], skill_matcher, ranker: ResumeRanker, top_k: Optional[int] = None,
+                  jobs_per_candidate: int = 1) -> Dict:
+        """
+        Ranks the pool against several jobs at once. Resume-side work (skill embeddings, experience
+        years, education terms) is shared, the job skills of all openings are embedded in one batch
+        and compared with every resume skill in a single similarity computation (see
+        `ResumeRanker.skill_score_matrix`); each job's column matches `rank` for that job exactly.
+
+        Returns {"scores": (resumes, jobs) int array, "skill_scores": (resumes, jobs) float array,
+        "rankings": per-job top-K lists (same records as `rank`), "best_jobs": per-candidate
+        {"resume_id", "original_source", "jobs": [{"job", "score", "skill_match_score"}, ...]},
+        best `jobs_per_candidate` jobs first}.
+        """
+        started = time.perf_counter()
+        increment("resumes_ranked", len(self) * len(job_requirements_list))
+        job_skill_lists = [list(job_requirements.get("required_skills", [])) for job_requirements in job_requirements_list]
+        all_job_skills = list(dict.fromkeys(skill for job_skills in job_skill_lists for skill in job_skills))
+        embeddings = self._skill_embeddings(all_job_skills, skill_matcher)
+        skill = np.vstack([np.zeros((0, len(job_skill_lists)))] + [ranker.skill_score_matrix(skill_lists, job_skill_lists, embeddings, skill_matcher)
+                                                                  for skill_lists in self._skill_chunks()])
+
+        experience_years = self.experience_years
+        experience_by_requirement, education_by_requirement = {}, {}
+        scores = np.zeros(skill.shape, dtype=np.int64)
+        rankings = []
+        for n, job_requirements in enumerate(job_requirements_list):
+            # Openings often share requirements, so the cheap columns are computed once per distinct value
+            min_experience_years = job_requirements.get("min_experience_years", 0)
+            if min_experience_years not in experience_by_requirement:
+                experience_by_requirement[min_experience_years] = ranker.experience_scores(experience_years, min_experience_years)
+            required_education = tuple(job_requirements.get("required_education", []))
+            if required_education not in education_by_requirement:
+                education_by_requirement[required_education] = np.array(
+                    [ranker.education_score({"education": education}, list(required_education)) for education in self.candidates.term_lists("education")],
+                    dtype=np.float64)
+            features = {"skill": skill[:, n], "experience_years": experience_years,
+                        "experience": experience_by_requirement[min_experience_years], "education": education_by_requirement[required_education]}
+            scores[:, n] = ranker.combine_scores(features)
+            rankings.append([ranker.ranked_record(self.candidates.resume(i), scores[:, n], features, i)
+                             for i in ranker.top_k_indices(scores[:, n], top_k)])
+
+        best_jobs = []
+        if len(job_requirements_list):
+            # Stable sort: ties go to the job listed first
+            job_order = np.argsort(-scores, axis=1, kind="stable")[:, :jobs_per_candidate]
+            for i, jobs in enumerate(job_order):
+                resume = self.candidates.resume(i)
+                best_jobs.append({"resume_id": resume["resume_id"], "original_source": resume["original_source"],
+                                  "jobs": [{"job": int(n), "score": int(scores[i, n]), "skill_match_score": round(float(skill[i, n]) * 100)} for n in jobs]})
+        self.last_rank_seconds = time.perf_counter() - started
+        return {"scores": scores, "skill_scores": skill, "rankings": rankings, "best_jobs": best_jobs}
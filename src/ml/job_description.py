@@ -0,0 +1,33 @@
+import re
+from src.nlp.taxonomy import Taxonomy, get_default_taxonomy
+from src.utils.metrics import instrumented
+
+_MIN_EXPERIENCE_PATTERN = re.compile(r'(\d+)\+\s*years?\s*experience')
+
+@instrumented("process_job_description")
+def process_job_description(job_description_text: str, taxonomy: Taxonomy = None) -> dict:
+    """
+    Processes the job description to extract requirements.
+    In a real application, this would use more sophisticated NLP/ML
+    (e.g., Named Entity Recognition for specific skills, experience ranges).
+    """
+    taxonomy = taxonomy if taxonomy is not None else get_default_taxonomy()
+    lower_case_jd = job_description_text.lower()
+
+    # Skills and education are matched against the same compiled taxonomy the resume parser uses,
+    # so job requirements and resume keywords share one vocabulary.
+    taxonomy_matches = taxonomy.match(lower_case_jd)
+    job_skills_keywords = taxonomy_matches.get("skills", [])
+
+    # Simple estimation of min experience (e.g., looking for "X years experience")
+    min_experience_match = _MIN_EXPERIENCE_PATTERN.search(lower_case_jd)
+    min_experience_years = int(min_experience_match.group(1)) if min_experience_match else 0
+
+    # Required education keywords, from the same taxonomy
+    required_education_keywords = taxonomy_matches.get("education", [])
+
+    return {
+        "required_skills": list(dict.fromkeys(job_skills_keywords)), # Get unique skills
+        "min_experience_years": min_experience_years,
+        "required_education": list(dict.fromkeys(required_education_keywords))
+    }
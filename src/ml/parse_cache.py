@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from src.utils.metrics import register_collector
+
+DEFAULT_PARSE_CACHE_PATH = os.environ.get("PARSE_CACHE_PATH", os.path.join("data", "parse_cache.sqlite3"))
+DEFAULT_PARSE_CACHE_MAX_BYTES = int(os.environ.get("PARSE_CACHE_MAX_MB", 512)) * 1024 * 1024
+
+
+def content_digest(file_bytes: bytes) -> str:
+    """SHA-256 of the raw file bytes; identical uploads share one cache entry."""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+class ParseCache:
+    """
+    Content-addressed cache of parse results, backed by a local SQLite file.
+    Entries are keyed by (hash of the raw file bytes, parser version) and store the extracted
+    text plus the `parsed_data` dict. Least recently used entries are evicted once the stored
+    size exceeds `max_bytes`; entries written by any other parser version are purged on startup.
+    A cache file that isn't a readable database is recreated, and unreadable rows count as misses.
+    """
+
+    def __init__(self, path: str = DEFAULT_PARSE_CACHE_PATH, max_bytes: int = DEFAULT_PARSE_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        try:
+            self._conn = self._connect()
+        except sqlite3.DatabaseError as e:
+            # Only a cache: start over rather than fail every parse
+            print(f"Warning: parse cache {path} is unreadable ({e}); recreating it.", file=sys.stderr)
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            self._conn = self._connect()
+        register_collector("parse_cache", self.stats)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Streamlit runs each session on its own thread, so share one connection behind a lock
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL") # Lets several worker processes read concurrently
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS parse_results (
+                    digest TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    parsed_data TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (digest, version)
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_results_last_access ON parse_results (last_access)")
+            conn.commit()
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
+    def get(self, digest: str, version: str) -> Optional[Tuple[str, Dict]]:
+        """Returns (text, parsed_data) for a cached file, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT text, parsed_data FROM parse_results WHERE digest = ? AND version = ?",
+                                     (digest, version)).fetchone()
+            parsed_data = None
+            if row is not None:
+                try:
+                    parsed_data = json.loads(row[1])
+                except ValueError:
+                    pass
+            if not isinstance(parsed_data, dict):
+                if row is not None: # Unreadable row: drop it so the file is parsed and stored again
+                    self._conn.execute("DELETE FROM parse_results WHERE digest = ? AND version = ?", (digest, version))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE parse_results SET last_access = ? WHERE digest = ? AND version = ?",
+                               (time.time(), digest, version))
+            self._conn.commit()
+            self.hits += 1
+        text = row[0]
+        parsed_data["rawContent"] = text # Stored once, in the text column
+        return text, parsed_data
+
+    def put(self, digest: str, version: str, text: str, parsed_data: Dict):
+        """Stores a parse result and evicts the least recently used entries if over budget."""
+        parsed_json = json.dumps({k: v for k, v in parsed_data.items() if k != "rawContent"})
+        size = len(text.encode("utf-8")) + len(parsed_json)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO parse_results VALUES (?, ?, ?, ?, ?, ?)",
+                               (digest, version, text, parsed_json, size, time.time()))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM parse_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        for digest, version, size in self._conn.execute("SELECT digest, version, size FROM parse_results ORDER BY last_access"):
+            stale.append((digest, version))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM parse_results WHERE digest = ? AND version = ?", stale)
+
+    def purge_other_versions(self, version: str) -> int:
+        """Deletes entries written by any other parser/taxonomy version; returns how many."""
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM parse_results WHERE version != ?", (version,)).rowcount
+            self._conn.commit()
+        return deleted
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_results").fetchone()
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries, "bytes": total}
+
+    def close(self):
+        self._conn.close()
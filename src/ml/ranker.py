@@ -1,5 +1,42 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 import re
+import numpy as np
+from src.utils.metrics import increment, instrumented
+
+_DIGITS_PATTERN = re.compile(r'\d+')
+# Headroom added to skill score upper bounds for float32 rounding in cosine similarities
+SKILL_BOUND_SLACK = 1e-5
+
+def skill_similarity(skill_rows: np.ndarray, job_rows: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of every row of `skill_rows` against every row of `job_rows`.
+    Each entry is a plain per-pair dot product (einsum) rather than a BLAS matrix product, whose
+    rounding depends on the matrix shapes: the single-job, multi-job and pruned scoring paths
+    batch different skills together and must still agree to the last bit.
+    """
+    from sklearn.preprocessing import normalize
+    return np.einsum("ik,jk->ij", normalize(skill_rows), normalize(job_rows))
+
+
+def mean_skill_similarity(skill_lists: List[List[str]], skill_positions: Dict[str, int], best_similarity: np.ndarray):
+    """
+    Returns ((resumes, jobs) mean of each resume's rows of `best_similarity` (unique skills x
+    jobs), number of embedded skills per resume). Skills missing from `skill_positions` are
+    skipped; resumes with none get 0. The sums go through a sparse resume x skill membership
+    matrix, which adds each resume's terms in its own skill order for every job, so a score
+    doesn't depend on which other jobs or resumes are scored alongside it.
+    """
+    from scipy.sparse import csr_matrix
+    indices, indptr = [], [0]
+    for skills in skill_lists:
+        indices.extend(skill_positions[skill] for skill in skills if skill in skill_positions)
+        indptr.append(len(indices))
+    counts = np.diff(np.array(indptr, dtype=np.int64))
+    membership = csr_matrix((np.ones(len(indices)), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+                            shape=(len(skill_lists), best_similarity.shape[0]))
+    sums = membership @ best_similarity
+    return sums / np.maximum(counts, 1)[:, None], counts
+
 
 class ResumeRanker:
     def __init__(self, skill_weight: float = 0.6, experience_weight: float = 0.3, education_weight: float = 0.1):
@@ -14,7 +51,7 @@ class ResumeRanker:
         from work history entries (e.g., "Jan 2020 - Present") or use ML models trained on experience data.
         """
         # Look for explicit "X years"
-        years_keywords = [int(re.findall(r'\d+', kw)[0]) for kw in experience_keywords if 'years' in kw and re.findall(r'\d+', kw)]
+        years_keywords = [int(digits[0]) for digits in (_DIGITS_PATTERN.findall(kw) for kw in experience_keywords if 'years' in kw) if digits]
         if years_keywords:
             return max(years_keywords) # Return highest mentioned "years"
 
@@ -74,18 +111,27 @@ class ResumeRanker:
         return min(100, round(total_score * 100))
 
 
+    @instrumented("rank_resumes")
     def rank_resumes(self, processed_resumes: List[Dict], job_requirements: Dict, skill_matcher) -> List[Dict]:
         """Ranks a list of processed resumes based on job requirements."""
+        increment("resumes_ranked", len(processed_resumes))
         ranked_resumes = []
+        # Use job_requirements extracted in app.py
+        job_skills = job_requirements.get("required_skills", [])
+
+        # Embed every unique skill across the job and all resumes in one batched pass,
+        # so per-resume scoring below is just a lookup into this table.
+        all_skills = list(job_skills)
+        for resume in processed_resumes:
+            all_skills.extend(resume.get("parsed_data", {}).get("skills", []))
+        skill_embeddings = skill_matcher.embed_skills(all_skills)
+
         for resume in processed_resumes:
             # Get skills from the processed resume data
             resume_skills = resume.get("parsed_data", {}).get("skills", [])
 
-            # Use job_requirements extracted in app.py
-            job_skills = job_requirements.get("required_skills", [])
-
             # Calculate skill match score using the provided skill_matcher instance
-            skill_match_score = skill_matcher.calculate_skill_match_score(resume_skills, job_skills)
+            skill_match_score = skill_matcher.calculate_skill_match_score(resume_skills, job_skills, skill_embeddings)
 
             # Calculate overall score for the resume
             overall_score = self.calculate_score(
@@ -104,4 +150,281 @@ class ResumeRanker:
 
         # Sort in descending order of score
         ranked_resumes.sort(key=lambda x: x["score"], reverse=True)
-        return ranked_resumes
\ No newline at end of file
+        return ranked_resumes
+
+    # --- Columnar scoring path ---
+    # `rank_resumes` above is the per-dict reference implementation; the methods below compute the
+    # same scores over NumPy feature arrays for the whole pool at once. Use `compare_ranking_paths`
+    # to check that both paths agree.
+
+    def skill_match_scores(self, processed_resumes: List[Dict], job_skills: List[str], skill_matcher,
+                           skill_embeddings: Optional[Dict] = None) -> np.ndarray:
+        """
+        Skill match score (0-1) for every resume. Each unique skill is compared with the job skills
+        once; a resume's score is then the mean of its skills' best similarities. Callers that have
+        already embedded every skill involved can pass the {skill: embedding} lookup.
+        """
+        skill_lists = [resume.get("parsed_data", {}).get("skills", []) for resume in processed_resumes]
+        if not job_skills:
+            return np.zeros(len(processed_resumes), dtype=np.float64)
+
+        if skill_embeddings is None:
+            all_skills = list(job_skills)
+            for skills in skill_lists:
+                all_skills.extend(skills)
+            skill_embeddings = skill_matcher.embed_skills(all_skills)
+        return self.skill_scores_from_embeddings(skill_lists, job_skills, skill_embeddings, skill_matcher)
+
+    def skill_scores_from_embeddings(self, skill_lists: List[List[str]], job_skills: List[str], skill_embeddings: Dict,
+                                     skill_matcher) -> np.ndarray:
+        """
+        Scoring half of `skill_match_scores`, given a {skill: embedding} lookup that covers the job
+        and resume skills (empty when the model isn't loaded). Lets callers that keep resume skill
+        embeddings around (see `ResumeFeatureStore`) only embed the job side.
+        """
+        return self.skill_score_matrix(skill_lists, [job_skills], skill_embeddings, skill_matcher)[:, 0]
+
+    def skill_score_matrix(self, skill_lists: List[List[str]], job_skill_lists: List[List[str]], skill_embeddings: Dict,
+                           skill_matcher) -> np.ndarray:
+        """
+        (resumes, jobs) matrix of skill match scores: column n equals
+        `skill_scores_from_embeddings(skill_lists, job_skill_lists[n], ...)`, bit for bit. Every
+        unique resume skill is compared with the union of all job skills in one similarity
+        computation, and each job's best similarities are then a max over its own columns.
+        """
+        scores = np.zeros((len(skill_lists), len(job_skill_lists)), dtype=np.float64)
+        job_columns = {skill: None for job_skills in job_skill_lists for skill in job_skills if skill in skill_embeddings}
+        embedded_jobs = [n for n, job_skills in enumerate(job_skill_lists) if any(skill in job_columns for skill in job_skills)]
+        embedded_counts = np.zeros(len(skill_lists), dtype=np.int64)
+
+        if skill_embeddings and embedded_jobs:
+            unique_skills = list(skill_embeddings)
+            skill_positions = {skill: i for i, skill in enumerate(unique_skills)}
+            for column, skill in enumerate(job_columns):
+                job_columns[skill] = column
+            similarity = skill_similarity(np.vstack([skill_embeddings[s] for s in unique_skills]), np.vstack([skill_embeddings[s] for s in job_columns]))
+            best_similarity = np.empty((len(unique_skills), len(embedded_jobs)), dtype=np.float64)
+            for column, n in enumerate(embedded_jobs):
+                best_similarity[:, column] = np.max(similarity[:, [job_columns[s] for s in job_skill_lists[n] if s in job_columns]], axis=1)
+            means, embedded_counts = mean_skill_similarity(skill_lists, skill_positions, best_similarity)
+            scores[:, embedded_jobs] = means
+        # Jobs whose skills have no embeddings, and resumes none of whose skills have one, fall back
+        # to keyword matching, as in SkillMatcher
+        embedded = set(embedded_jobs)
+        keyword_jobs = [n for n, job_skills in enumerate(job_skill_lists) if job_skills and n not in embedded]
+        jobs_with_skills = [n for n, job_skills in enumerate(job_skill_lists) if job_skills]
+        for i, skills in enumerate(skill_lists):
+            if not skills:
+                continue
+            for n in (keyword_jobs if embedded_counts[i] else jobs_with_skills):
+                scores[i, n] = skill_matcher._simple_keyword_match(skills, job_skill_lists[n])
+        return scores
+
+    def experience_scores(self, experience_years: np.ndarray, required_experience_years: float) -> np.ndarray:
+        """Vectorized experience component (0-1), mirroring `calculate_score`."""
+        if required_experience_years > 0:
+            return np.where(experience_years >= required_experience_years, 1.0,
+                            np.minimum(experience_years / required_experience_years, 1.0))
+        return np.where(experience_years > 0, 0.5, 0.0)
+
+    def education_score(self, resume_data: Dict, required_education: List[str]) -> float:
+        """Education component (0-1) for one resume, mirroring `calculate_score`."""
+        if not required_education:
+            return 0.0
+        candidate_education_lower = [e.lower() for e in resume_data.get("education", [])]
+        if any(req_edu.lower() in cand_edu for req_edu in required_education for cand_edu in candidate_education_lower):
+            return 1.0
+        elif any(degree_type in cand_edu for degree_type in ['bachelor', 'master', 'phd'] for cand_edu in candidate_education_lower):
+            return 0.5
+        return 0.0
+
+    @instrumented("build_features")
+    def build_features(self, processed_resumes: List[Dict], job_requirements: Dict, skill_matcher,
+                       experience_years: Optional[np.ndarray] = None, skill_embeddings: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+        """
+        Turns the candidate pool into columnar features: skill score, experience years and
+        education score, plus the derived experience score. Callers that already store each
+        resume's experience estimate (e.g. `CandidateIndex`) can pass them as `experience_years`,
+        and callers that embedded a larger batch up front can pass those `skill_embeddings`.
+        """
+        parsed = [resume.get("parsed_data", {}) for resume in processed_resumes]
+        if experience_years is None:
+            experience_years = np.array([self.estimate_experience_years(p.get("experience", [])) for p in parsed], dtype=np.float64)
+        required_education = job_requirements.get("required_education", [])
+        return {
+            "skill": self.skill_match_scores(processed_resumes, job_requirements.get("required_skills", []), skill_matcher, skill_embeddings),
+            "experience_years": experience_years,
+            "experience": self.experience_scores(experience_years, job_requirements.get("min_experience_years", 0)),
+            "education": np.array([self.education_score(p, required_education) for p in parsed], dtype=np.float64),
+        }
+
+    def combine_scores(self, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Weighted combination of the feature columns into 0-100 integer scores: the feature
+        matrix times the weight vector, one vectorized multiply-add per column.
+        """
+        # Deliberately not `feature_matrix @ weights`: BLAS may reorder or fuse the three
+        # multiply-adds, and a total landing a rounding error away from .5 then rounds to a
+        # different integer than `calculate_score`. Accumulating in `calculate_score`'s order
+        # keeps the scores bit-identical at the cost of three passes over n instead of one.
+        total = features["skill"] * self.skill_weight
+        total = total + features["experience"] * self.experience_weight
+        total = total + features["education"] * self.education_weight
+        return np.minimum(100, np.round(total * 100)).astype(np.int64)
+
+    @staticmethod
+    def top_k_indices(scores: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+        """
+        Indices of the top K scores, best first. Ties are broken by input position (earlier first),
+        which matches the stable sort used by `rank_resumes`. Uses partial selection when K < n.
+        """
+        n = len(scores)
+        if top_k is None or top_k >= n:
+            candidates = np.arange(n)
+        elif top_k <= 0:
+            return np.arange(0)
+        else:
+            # Score of the K-th best; keep every candidate tied with it so the tie-break stays deterministic
+            kth_score = -np.partition(-scores, top_k - 1)[top_k - 1]
+            candidates = np.flatnonzero(scores >= kth_score)
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order][:top_k] if top_k is not None else candidates[order]
+
+    @instrumented("rank_resumes_vectorized")
+    def rank_resumes_vectorized(self, processed_resumes: List[Dict], job_requirements: Dict, skill_matcher, top_k: Optional[int] = None,
+                                experience_years: Optional[np.ndarray] = None) -> List[Dict]:
+        """Columnar equivalent of `rank_resumes`; returns only the top K when `top_k` is given."""
+        increment("resumes_ranked", len(processed_resumes))
+        features = self.build_features(processed_resumes, job_requirements, skill_matcher, experience_years)
+        scores = self.combine_scores(features)
+        return [self.ranked_record(processed_resumes[i], scores, features, i) for i in self.top_k_indices(scores, top_k)]
+
+    def ranked_record(self, resume: Dict, scores: np.ndarray, features: Dict[str, np.ndarray], i: int) -> Dict:
+        """Output record for row `i` of a columnar scoring run (same shape as `rank_resumes` output)."""
+        return {
+            "resume_id": resume.get("resume_id"),
+            "original_source": resume.get("original_source"),
+            "score": int(scores[i]),
+            "skill_match_score": round(float(features["skill"][i]) * 100), # Convert to percentage for display
+            "estimated_experience_years": float(features["experience_years"][i]),
+            "parsed_data": resume.get("parsed_data", {})
+        }
+
+    # --- Bound-based pruning ---
+    # Only the skill term needs the embedding model. The cheap terms plus an upper bound on the skill
+    # term give an upper bound on each resume's final score, so resumes whose bound can't reach the
+    # current K-th best score never have their skills embedded.
+
+    def skill_score_bounds(self, skill_lists: List[List[str]], job_skills: List[str], skill_matcher):
+        """
+        Returns (upper bounds, exact mask, known embeddings). A resume's skill score is the mean of
+        its skills' best cosine similarities, so a skill whose embedding is already cached adds
+        its exact similarity and any other skill adds at most 1. Resumes with every skill cached
+        (or none embeddable, which means the keyword fallback) are exact without running the model.
+        """
+        bounds = np.zeros(len(skill_lists), dtype=np.float64)
+        exact = np.ones(len(skill_lists), dtype=bool)
+        known = skill_matcher.embed_skills(job_skills) if job_skills else {} # Only the job side may hit the model
+        if not known:
+            return bounds, exact, known # Keyword fallback (or no job skills): cheap, computed exactly
+        known.update(skill_matcher.cached_skill_embeddings([skill for skills in skill_lists for skill in skills]))
+
+        # Same similarity as the exact scoring paths, so a cached skill's bound is its exact contribution
+        known_skills = list(known)
+        best_similarity = dict(zip(known_skills, np.max(skill_similarity(
+            np.vstack([known[s] for s in known_skills]), np.vstack([known[s] for s in job_skills if s in known])), axis=1)))
+        for i, skills in enumerate(skill_lists):
+            embeddable = [skill for skill in skills if skill.strip()]
+            if not embeddable:
+                continue
+            skill_bounds = [float(best_similarity[skill]) if skill in best_similarity else 1.0 for skill in embeddable]
+            exact[i] = all(skill in best_similarity for skill in embeddable)
+            # Slack covers float32 rounding (a cosine can come out a hair above 1)
+            bounds[i] = float(np.mean(skill_bounds)) + SKILL_BOUND_SLACK
+        return bounds, exact, known
+
+    def top_k_pruned(self, processed_resumes: List[Dict], job_requirements: Dict, skill_matcher, top_k: int,
+                     chunk_size: int = 256, min_score: Optional[int] = None, stats: Dict = None):
+        """
+        Two-phase top-K selection returning (indices, scores, features) with exactly the indices
+        `top_k_indices` picks on the exhaustive scores.
+
+        Phase one computes the experience and education terms, a keyword-overlap estimate of the
+        skill term and an upper bound on every final score. Phase two embeds and scores resumes
+        in chunks, best bound first (ties: best estimate first), and stops once no remaining
+        bound can reach the K-th best exact score (or `min_score`, e.g. the K-th best of earlier
+        batches). `stats` receives "scored", "scored_from_cache" and "pruned" counts.
+        """
+        stats = stats if stats is not None else {}
+        parsed = [resume.get("parsed_data", {}) for resume in processed_resumes]
+        skill_lists = [p.get("skills", []) for p in parsed]
+        job_skills = list(job_requirements.get("required_skills", []))
+        required_education = job_requirements.get("required_education", [])
+        experience_years = np.array([self.estimate_experience_years(p.get("experience", [])) for p in parsed], dtype=np.float64)
+        features = {
+            "skill": np.zeros(len(processed_resumes), dtype=np.float64),
+            "experience_years": experience_years,
+            "experience": self.experience_scores(experience_years, job_requirements.get("min_experience_years", 0)),
+            "education": np.array([self.education_score(p, required_education) for p in parsed], dtype=np.float64),
+        }
+
+        # Phase one: bounds, plus exact scores for resumes that need no model call
+        skill_bounds, exact, known = self.skill_score_bounds(skill_lists, job_skills, skill_matcher)
+        exact_indices = np.flatnonzero(exact)
+        if len(exact_indices):
+            features["skill"][exact_indices] = self.skill_scores_from_embeddings(
+                [skill_lists[i] for i in exact_indices], job_skills, known, skill_matcher)
+        scored = exact.copy()
+        scores = np.where(exact, self.combine_scores(features), -1)
+        bound_scores = self.combine_scores({**features, "skill": np.where(exact, features["skill"], skill_bounds)})
+        estimate_scores = self.combine_scores({**features, "skill": np.array(
+            [min(skill_matcher._simple_keyword_match(skills, job_skills), 1.0) if job_skills else 0.0 for skills in skill_lists])})
+
+        # Phase two: the bound order means that once a chunk has a pruned resume, every later one is pruned too
+        pending = np.flatnonzero(~exact)
+        pending = pending[np.lexsort((pending, -estimate_scores[pending], -bound_scores[pending]))]
+        pruned = 0
+        for start in range(0, len(pending), chunk_size):
+            threshold = min_score if min_score is not None else -1
+            if top_k and np.count_nonzero(scored) >= top_k:
+                threshold = max(threshold, int(-np.partition(-scores[scored], top_k - 1)[top_k - 1]))
+            chunk = pending[start:start + chunk_size]
+            live = chunk[bound_scores[chunk] >= threshold]
+            if len(live):
+                live_skills = [skill_lists[i] for i in live]
+                embeddings = skill_matcher.embed_skills(job_skills + [skill for skills in live_skills for skill in skills])
+                features["skill"][live] = self.skill_scores_from_embeddings(live_skills, job_skills, embeddings, skill_matcher)
+                scores[live] = self.combine_scores({name: column[live] for name, column in features.items()})
+                scored[live] = True
+            if len(live) < len(chunk):
+                pruned = len(pending) - start - len(live)
+                break
+
+        stats["scored"] = stats.get("scored", 0) + int(np.count_nonzero(scored))
+        stats["scored_from_cache"] = stats.get("scored_from_cache", 0) + len(exact_indices)
+        stats["pruned"] = stats.get("pruned", 0) + pruned
+        increment("resumes_pruned", pruned)
+        indices = self.top_k_indices(scores, top_k)
+        return indices[scored[indices]], scores, features
+
+    @instrumented("rank_resumes_pruned")
+    def rank_resumes_pruned(self, processed_resumes: List[Dict], job_requirements: Dict, skill_matcher, top_k: int,
+                            chunk_size: int = 256, stats: Dict = None) -> List[Dict]:
+        """Same top K as `rank_resumes_vectorized(..., top_k)`, embedding only resumes that can still make it (see `top_k_pruned`)."""
+        increment("resumes_ranked", len(processed_resumes))
+        indices, scores, features = self.top_k_pruned(processed_resumes, job_requirements, skill_matcher, top_k, chunk_size, stats=stats)
+        return [self.ranked_record(processed_resumes[i], scores, features, i) for i in indices]
+
+    def compare_ranking_paths(self, processed_resumes: List[Dict], job_requirements: Dict, skill_matcher) -> List[Dict]:
+        """
+        Runs the reference and columnar paths on the same input and returns every resume whose
+        rank, score or skill match differs between them (an empty list means they agree).
+        """
+        reference = self.rank_resumes(processed_resumes, job_requirements, skill_matcher)
+        vectorized = self.rank_resumes_vectorized(processed_resumes, job_requirements, skill_matcher)
+        mismatches = []
+        for rank, (ref, vec) in enumerate(zip(reference, vectorized), start=1):
+            if (ref["resume_id"], ref["score"], ref["skill_match_score"]) != (vec["resume_id"], vec["score"], vec["skill_match_score"]):
+                mismatches.append({"rank": rank, "reference": {k: ref[k] for k in ("resume_id", "score", "skill_match_score")},
+                                   "vectorized": {k: vec[k] for k in ("resume_id", "score", "skill_match_score")}})
+        return mismatches
\ No newline at end of file
@@ -1,16 +1,53 @@
+import os
 import re
 from io import StringIO, BytesIO
-from pdfminer.high_level import extract_text_to_fp # For PDF parsing
-from docx import Document # For DOCX parsing
+# pdfminer.six (PDF) and python-docx (DOCX) are imported on first use to keep startup fast
+from src.nlp.taxonomy import Taxonomy, get_default_taxonomy
+from src.ml.parse_cache import ParseCache, content_digest
+from src.utils.metrics import instrumented
+
+# Bump whenever extraction or `parse_text` output changes, so cached parse results are invalidated
+PARSER_VERSION = "2"
 
 class ResumeParser:
+    def __init__(self, taxonomy: Taxonomy = None, cache: ParseCache = None):
+        # Skill/experience/education vocabulary, compiled into a single-pass keyword matcher
+        self.taxonomy = taxonomy if taxonomy is not None else get_default_taxonomy()
+        # Cached parse results are only valid for this exact parser + taxonomy combination
+        self.version = f"{PARSER_VERSION}:{self.taxonomy.version}"
+        self.cache = cache
+        if self.cache is not None:
+            self.cache.purge_other_versions(self.version)
+
+    def get_cached(self, file_bytes: bytes):
+        """Returns (text, parsed_data) if these exact file bytes were parsed before, else None."""
+        if self.cache is None:
+            return None
+        return self.cache.get(content_digest(file_bytes), self.version)
+
+    def store_cached(self, file_bytes: bytes, text: str, parsed_data: dict):
+        """Records a parse result for these file bytes (no-op without a cache)."""
+        if self.cache is not None:
+            self.cache.put(content_digest(file_bytes), self.version, text, parsed_data)
+
+    def parse_file(self, file_name: str, file_bytes: bytes):
+        """
+        Extracts and parses a file, consulting the parse cache first.
+        Returns (text, parsed_data); extraction errors are raised as in `extract_text`.
+        """
+        cached = self.get_cached(file_bytes)
+        if cached is not None:
+            return cached
+        text = self.extract_text(file_name, file_bytes)
+        parsed_data = self.parse_text(text)
+        if text.strip():
+            self.store_cached(file_bytes, text, parsed_data)
+        return text, parsed_data
+
     def parse_pdf(self, file_stream: BytesIO) -> str:
         """Extracts text from a PDF file stream."""
-        output_string = StringIO()
         try:
-            # pdfminer.six expects a file-like object
-            extract_text_to_fp(file_stream, output_string)
-            return output_string.getvalue()
+            return self._extract_pdf_text(file_stream)
         except Exception as e:
             print(f"Error parsing PDF: {e}")
             return ""
@@ -18,16 +55,44 @@ class ResumeParser:
     def parse_docx(self, file_stream: BytesIO) -> str:
         """Extracts text from a DOCX file stream."""
         try:
-            # python-docx expects a file-like object
-            document = Document(file_stream)
-            full_text = []
-            for para in document.paragraphs:
-                full_text.append(para.text)
-            return '\n'.join(full_text)
+            return self._extract_docx_text(file_stream)
         except Exception as e:
             print(f"Error parsing DOCX: {e}")
             return ""
 
+    def extract_text(self, file_name: str, file_bytes: bytes) -> str:
+        """
+        Extracts text from raw file bytes, choosing the extractor from the file extension
+        (anything that is not PDF/DOCX is decoded as plain text).
+        Unlike `parse_pdf`/`parse_docx`, extraction errors are raised to the caller.
+        """
+        file_extension = os.path.splitext(file_name)[1].lower()
+        if file_extension == ".pdf":
+            return self._extract_pdf_text(BytesIO(file_bytes))
+        elif file_extension == ".docx":
+            return self._extract_docx_text(BytesIO(file_bytes))
+        return file_bytes.decode('utf-8', errors='ignore')
+
+    # Spans sit on the extractors so both `parse_pdf`/`parse_docx` and `extract_text` are timed
+    @instrumented("parse_pdf")
+    def _extract_pdf_text(self, file_stream: BytesIO) -> str:
+        from pdfminer.high_level import extract_text_to_fp
+        output_string = StringIO()
+        # pdfminer.six expects a file-like object
+        extract_text_to_fp(file_stream, output_string)
+        return output_string.getvalue()
+
+    @instrumented("parse_docx")
+    def _extract_docx_text(self, file_stream: BytesIO) -> str:
+        from docx import Document
+        # python-docx expects a file-like object
+        document = Document(file_stream)
+        full_text = []
+        for para in document.paragraphs:
+            full_text.append(para.text)
+        return '\n'.join(full_text)
+
+    @instrumented("parse_text")
     def parse_text(self, text_content: str) -> dict:
         """
         Parses raw text content to extract structured information.
@@ -52,18 +117,12 @@ class ResumeParser:
         if phone_match:
             parsed_data["contact"]["phone"] = phone_match.group(0)
 
-        # Placeholder for skill extraction (would use NLP models)
-        # For demonstration, let's assume a simple keyword list
-        common_skills = ["python", "machine learning", "data science", "rpa", "vertex ai", "tensorflow", "pytorch", "sql", "java", "javascript", "react", "cloud", "aws", "azure", "gcp", "nlp", "deep learning", "statistics", "docker", "kubernetes", "ai", "ml", "big data", "spark", "hadoop"]
-        for skill in common_skills:
-            if skill in lower_case_text:
-                parsed_data["skills"].append(skill)
-
-        # Placeholder for experience & education keywords (for ranking contribution)
-        experience_indicators = ['experience', 'worked as', 'developed', 'implemented', 'managed', 'led', 'senior', 'junior', 'associate', 'engineer', 'scientist', 'analyst', 'specialist', 'years']
-        parsed_data["experience"] = [kw for kw in experience_indicators if kw in lower_case_text]
-
-        education_indicators = ['education', 'university', 'college', 'bachelor', 'master', 'ph.d', 'degree', 'graduate', 'alumni', 'b.tech', 'm.tech', 'mba', 'computer science', 'engineering', 'statistics', 'mathematics']
-        parsed_data["education"] = [kw for kw in education_indicators if kw in lower_case_text]
+        # Keyword extraction for skills, experience & education indicators (for ranking contribution).
+        # All categories are matched in one pass with word-boundary semantics; a real system
+        # would complement this with NLP models.
+        matches = self.taxonomy.match(lower_case_text)
+        parsed_data["skills"] = matches.get("skills", [])
+        parsed_data["experience"] = matches.get("experience", [])
+        parsed_data["education"] = matches.get("education", [])
 
         return parsed_data
\ No newline at end of file
@@ -1,50 +1,166 @@
-from transformers import AutoTokenizer, AutoModel
-import torch
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+import time
 import numpy as np
 import os
+from src.ml.embedding_cache import EmbeddingCache, DEFAULT_CACHE_DIR
+from src.ml.embedding_backends import BACKENDS, DEFAULT_MODEL_NAME, DEFAULT_STATIC_TABLE_DIR, create_backend
+from src.utils.startup import record_timing
+from src.utils.metrics import increment, instrumented, observe, register_collector
+# torch, transformers and sklearn are imported lazily: they dominate cold-start time
 
 class SkillMatcher:
-    def __init__(self, model_name='sentence-transformers/all-MiniLM-L6-v2'):
-        # Attempt to load the Sentence Transformer model
+    def __init__(self, model_name=DEFAULT_MODEL_NAME, cache_dir: str = DEFAULT_CACHE_DIR, cache: EmbeddingCache = None,
+                 load_in_background: bool = False, backend: str = None, num_threads: int = None,
+                 static_table_path: str = DEFAULT_STATIC_TABLE_DIR, load_model: bool = True):
+        self.model_name = model_name
+        # Inference backend: 'fp32' (full model), 'int8' (dynamically quantized linear layers, CPU)
+        # or 'static' (precomputed phrase/word vector table, no transformer). See embedding_backends.
+        self.backend_name = backend or os.environ.get("SKILL_MODEL_BACKEND", "fp32")
+        if self.backend_name not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend '{self.backend_name}'; expected one of {BACKENDS}.")
+        self.num_threads = num_threads or (int(os.environ["SKILL_MODEL_THREADS"]) if os.environ.get("SKILL_MODEL_THREADS") else None)
+        self.static_table_path = static_table_path
+        self.backend = None
+        # Vectors from different backends must never be mixed in the caches
+        self.embedding_id = model_name if self.backend_name == "fp32" else f"{model_name}:{self.backend_name}"
+        if cache_dir and self.backend_name != "fp32":
+            cache_dir = os.path.join(cache_dir, self.backend_name)
+        # Two-tier (in-process LRU + memory-mapped on-disk) embedding cache; warm lookups skip the model
+        self.cache = cache if cache is not None else EmbeddingCache(self.embedding_id, disk_path=cache_dir)
+        register_collector("embedding_cache", self.cache.stats)
+        # Until the model is ready, `model_loaded` is False and scoring uses the keyword fallback
+        self.model_loaded = False
+        self.load_seconds = None
+        self._ready = threading.Event()
+        if not load_model:
+            self._ready.set() # Keyword-only matcher: the model is never loaded
+        elif load_in_background:
+            threading.Thread(target=self._load_model, name="skill-matcher-warmup", daemon=True).start()
+        else:
+            self._load_model()
+
+    def _load_model(self):
+        """Attempts to load the configured inference backend (imports torch/transformers on first use)."""
+        started = time.perf_counter()
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModel.from_pretrained(model_name)
-            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-            self.model.to(self.device)
-            self.model_loaded = True
-            print(f"Successfully loaded Sentence Transformer model: {model_name}")
+            if self.backend_name != "static":
+                import torch
+                record_timing("import torch", time.perf_counter() - started)
+            self.backend = create_backend(self.backend_name, self.model_name, self.num_threads, self.static_table_path)
+            self.model_loaded = True # Set last: other threads may start using the model right away
+            print(f"Successfully loaded Sentence Transformer model: {self.model_name} ({self.backend_name} backend)")
         except Exception as e:
             print(f"Warning: Could not load Sentence Transformer model locally ({e}). "
                   "Skill matching will fall back to keyword-based. For full functionality, ensure `transformers` and model are available or integrate with Vertex AI.")
             self.model_loaded = False
+        finally:
+            self.load_seconds = time.perf_counter() - started
+            record_timing("load skill model", self.load_seconds)
+            self._ready.set()
+
+    @property
+    def is_loading(self) -> bool:
+        """True while a background load is still in progress."""
+        return not self._ready.is_set()
 
+    def wait_until_ready(self, timeout: float = None) -> bool:
+        """Blocks until the model load has finished (successfully or not); returns `model_loaded`."""
+        self._ready.wait(timeout)
+        return self.model_loaded
+
+    @instrumented("get_embedding")
     def get_embedding(self, text: str):
         """Generates embedding for a given text using the loaded model."""
         if not self.model_loaded:
             return None # Fallback if model isn't loaded
+        return self.embed_texts([text])[0]
+
+    @instrumented("embed_texts")
+    def embed_texts(self, texts: list, batch_size: int = 64, use_cache: bool = True):
+        """
+        Embeds a list of texts and returns an (n, dim) array aligned with `texts`.
+        Texts are deduplicated; cached vectors are reused and only the misses are sent through
+        the model (see `_encode_batch`), after which they are cached. The model sees the original
+        text; normalization only applies to the cache key (see `EmbeddingCache`).
+        """
+        if not self.model_loaded:
+            return None # Fallback if model isn't loaded
+
+        unique_texts = list(dict.fromkeys(texts))
+        vectors = {}
+        if use_cache:
+            for text in unique_texts:
+                vector = self.cache.get(text)
+                if vector is not None:
+                    vectors[text] = vector
+        missing = [text for text in unique_texts if text not in vectors]
+        increment("embedding_texts", len(unique_texts))
+        if missing:
+            observe("embedding_batch_size", len(missing))
+            encoded = self._encode_batch(missing, batch_size)
+            for i, text in enumerate(missing):
+                vectors[text] = encoded[i]
+                if use_cache:
+                    # A copy, not a row view: a view would keep the whole batch alive in the byte-budgeted LRU
+                    self.cache.put(text, encoded[i].copy())
 
-        inputs = self.tokenizer(text, return_tensors='pt', truncation=True, padding=True).to(self.device)
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-        # Use mean pooling over token embeddings
-        sentence_embedding = torch.mean(outputs.last_hidden_state, dim=1).squeeze().cpu().numpy()
-        return sentence_embedding
+        embeddings = np.zeros((len(texts), self.backend.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            embeddings[i] = vectors[text]
+        return embeddings
+
+    def _encode_batch(self, texts: list, batch_size: int = 64) -> np.ndarray:
+        """Runs the inference backend over `texts` and returns an (n, dim) array."""
+        return self.backend.encode(texts, batch_size)
+
+    def embed_skills(self, skills: list, batch_size: int = 64) -> dict:
+        """
+        Embeds every unique, non-empty skill string in one batched pass.
+        Returns a {skill: embedding} lookup; empty if the model isn't loaded.
+        """
+        if not self.model_loaded:
+            return {}
+        unique_skills = list(dict.fromkeys(skill for skill in skills if skill.strip()))
+        if not unique_skills:
+            return {}
+        embeddings = self.embed_texts(unique_skills, batch_size=batch_size)
+        return {skill: embeddings[i] for i, skill in enumerate(unique_skills)}
+
+    def cached_skill_embeddings(self, skills: list) -> dict:
+        """
+        {skill: embedding} for the skills already in the embedding cache; never runs the model.
+        Probes with `EmbeddingCache.peek`, so the cache's hit/miss counters aren't affected.
+        """
+        if not self.model_loaded:
+            return {}
+        cached = {}
+        for skill in dict.fromkeys(skills):
+            if skill.strip():
+                vector = self.cache.peek(skill)
+                if vector is not None:
+                    cached[skill] = vector
+        return cached
 
-    def calculate_skill_match_score(self, resume_skills: list, job_skills: list) -> float:
+    @instrumented("calculate_skill_match_score")
+    def calculate_skill_match_score(self, resume_skills: list, job_skills: list, skill_embeddings: dict = None) -> float:
         """
         Calculates a semantic similarity score between resume skills and job skills.
+        `skill_embeddings` is an optional {skill: embedding} lookup from `embed_skills`; when
+        ranking many resumes, pass one lookup built over all skills so scoring is a pure lookup.
         If the embedding model isn't loaded, falls back to a simple keyword match.
         """
         if not resume_skills or not job_skills:
             return 0.0
 
         if self.model_loaded:
-            # Generate embeddings for skills that are not empty strings
-            resume_skill_embeddings = [self.get_embedding(skill) for skill in resume_skills if skill.strip() and self.get_embedding(skill) is not None]
-            job_skill_embeddings = [self.get_embedding(skill) for skill in job_skills if skill.strip() and self.get_embedding(skill) is not None]
+            if skill_embeddings is None:
+                skill_embeddings = self.embed_skills(list(resume_skills) + list(job_skills))
+            # Look up embeddings for skills that are not empty strings
+            resume_skill_embeddings = [skill_embeddings[skill] for skill in resume_skills if skill in skill_embeddings]
+            job_skill_embeddings = [skill_embeddings[skill] for skill in job_skills if skill in skill_embeddings]
 
             if resume_skill_embeddings and job_skill_embeddings:
+                from sklearn.metrics.pairwise import cosine_similarity
                 similarity_matrix = cosine_similarity(resume_skill_embeddings, job_skill_embeddings)
                 # A simple aggregation: average of maximum similarity for each resume skill
                 # This ensures that if a resume has at least one strong match, it gets credit.
@@ -0,0 +1,75 @@
+from collections import deque
+from typing import Dict, List, Set
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of keywords.
+    The automaton is built once; `find` then locates every keyword in a single linear pass
+    over the text, regardless of how many keywords there are. Matches respect word boundaries
+    (like regex `\\b`): a keyword starting or ending with a word character must not be glued to
+    another word character, so "ai" does not match inside "maintained".
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        for keyword_id, keyword in enumerate(self.keywords):
+            self._add(keyword, keyword_id)
+        self._build_failure_links()
+
+    def _add(self, keyword: str, keyword_id: int):
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(keyword_id)
+
+    def _build_failure_links(self):
+        # Breadth-first, so a state's failure target is always resolved before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit the matches of the longest proper suffix that is also a keyword
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[int]:
+        """Returns the ids (positions in `keywords`) of every keyword found in `text`."""
+        found = set()
+        goto, fail, output, keywords = self._goto, self._fail, self._output, self.keywords
+        text_length = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword_id in output[state]:
+                if keyword_id in found:
+                    continue
+                keyword = keywords[keyword_id]
+                start = i - len(keyword) + 1
+                if _is_word_char(keyword[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(keyword[-1]) and i + 1 < text_length and _is_word_char(text[i + 1]):
+                    continue
+                found.add(keyword_id)
+        return found
@@ -0,0 +1,159 @@
+"""
+Near-duplicate detection for resume batches: MinHash signatures over word shingles of the
+`TextCleaner.clean_text` output, clustered with locality-sensitive hashing (banding).
+
+Documents are only compared with documents that share an LSH bucket, so clustering a batch is
+close to linear in its size instead of quadratic. Each cluster is represented by its earliest
+document; later documents within the threshold of it are attached to it as duplicates.
+"""
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.utils.metrics import increment, instrumented
+
+# Estimated Jaccard similarity (of the cleaned texts' shingle sets) at which two resumes count as duplicates
+DEFAULT_DUPLICATE_THRESHOLD = float(os.environ.get("DUPLICATE_THRESHOLD", 0.7))
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5 # Words per shingle
+# A missed duplicate costs a wasted scoring pass; a false candidate pair only costs a signature comparison
+LSH_FALSE_NEGATIVE_WEIGHT = 0.9
+# Besides its first document, each bucket member is compared with up to this many of the members just
+# before it. Caps the comparisons in the huge buckets that shared template boilerplate produces.
+DEFAULT_BUCKET_PARTNERS = 8
+_SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15) # Odd 64-bit constant mixing consecutive token hashes
+
+
+def lsh_parameters(threshold: float, num_perm: int, false_negative_weight: float = LSH_FALSE_NEGATIVE_WEIGHT) -> Tuple[int, int]:
+    """
+    (bands, rows per band) for `num_perm` MinHash values that minimize the weighted probability
+    of missing a pair above `threshold` and of bucketing a pair below it together. Bucketed pairs
+    are verified against their signatures anyway, so misses are weighted more heavily.
+    """
+    similarities = np.linspace(0.0, 1.0, 1001)
+    best, best_error = (1, num_perm), None
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        candidate_probability = 1.0 - (1.0 - similarities ** rows) ** bands
+        false_positives = candidate_probability[similarities < threshold].sum()
+        false_negatives = (1.0 - candidate_probability[similarities >= threshold]).sum()
+        error = (1.0 - false_negative_weight) * false_positives + false_negative_weight * false_negatives
+        if best_error is None or error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class NearDuplicateDetector:
+    """
+    Clusters near-duplicate texts. `threshold` is the estimated Jaccard similarity above which
+    two documents are duplicates (1.0 keeps only copies whose cleaned text is identical).
+    """
+
+    def __init__(self, threshold: float = DEFAULT_DUPLICATE_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 shingle_size: int = DEFAULT_SHINGLE_SIZE, cleaner=None, seed: int = 1, bucket_partners: int = DEFAULT_BUCKET_PARTNERS):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"Duplicate threshold must be in (0, 1], got {threshold}.")
+        if cleaner is None:
+            from src.nlp.text_cleaner import TextCleaner
+            cleaner = TextCleaner()
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bucket_partners = bucket_partners
+        self.cleaner = cleaner
+        self.bands, self.rows = lsh_parameters(threshold, num_perm)
+        # Multiply-shift hash family: h(x) = (a * x + b) >> 32 over 64-bit wraparound arithmetic, a odd
+        rng = np.random.default_rng(seed)
+        self._multipliers = (rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+        self._offsets = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)[:, None]
+        self._token_hashes: Dict[str, int] = {}
+
+    def shingle_hashes(self, text: str) -> np.ndarray:
+        """32-bit hashes of the word shingles of the cleaned text (one shingle if it is shorter than a shingle)."""
+        import zlib
+        tokens = self.cleaner.clean_text(text).split()
+        token_hashes = self._token_hashes
+        for token in tokens:
+            if token not in token_hashes:
+                token_hashes[token] = zlib.crc32(token.encode("utf-8"))
+        hashes = np.array([token_hashes[token] for token in tokens] or [0], dtype=np.uint64)
+        width = min(self.shingle_size, len(hashes))
+        shingles = hashes[:len(hashes) - width + 1].copy()
+        for offset in range(1, width):
+            shingles = shingles * _SHINGLE_MULTIPLIER + hashes[offset:len(hashes) - width + 1 + offset]
+        return (shingles >> np.uint64(32)) ^ (shingles & np.uint64(0xFFFFFFFF))
+
+    def signatures(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """(len(texts), num_perm) uint32 MinHash signatures; documents are hashed in batches."""
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for start in range(0, len(texts), batch_size):
+            shingle_sets = [self.shingle_hashes(text) for text in texts[start:start + batch_size]]
+            boundaries = np.cumsum([0] + [len(shingles) for shingles in shingle_sets[:-1]])
+            hashed = (self._multipliers * np.concatenate(shingle_sets)[None, :] + self._offsets) >> np.uint64(32)
+            signatures[start:start + len(shingle_sets)] = np.minimum.reduceat(hashed, boundaries, axis=1).T
+        return signatures
+
+    def cluster(self, signatures: np.ndarray, chunk_size: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (representative index of each document, its estimated similarity to that
+        representative). Each document is paired with the first document of every band bucket it
+        falls in and with up to `bucket_partners` members just before it there, so an unrelated
+        document leading a bucket can't hide two duplicates behind it. Pairs at or above the
+        threshold are kept. Documents are then assigned in
+        input order: each joins the earliest representative among its partners' representatives
+        that is itself within the threshold of it, or else represents itself. A duplicate is thus
+        always within the threshold of its own representative, never linked to it only through
+        a chain of intermediate documents.
+        """
+        n = len(signatures)
+        positions = np.arange(n)
+        pairs = [np.empty(0, dtype=np.int64)]
+        for band in range(self.bands):
+            band_rows = np.ascontiguousarray(signatures[:, band * self.rows:(band + 1) * self.rows])
+            keys = band_rows.view(np.dtype((np.void, band_rows.dtype.itemsize * self.rows))).ravel()
+            _, inverse = np.unique(keys, return_inverse=True)
+            order = np.argsort(inverse.ravel(), kind="stable") # Bucket by bucket, input order within a bucket
+            sorted_buckets = inverse.ravel()[order]
+            starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+            bucket_start = np.repeat(starts, np.diff(np.r_[starts, n]))
+            rank = positions - bucket_start # Position of order[p] within its bucket
+            followers = np.flatnonzero(rank > 0)
+            pairs.append(order[followers] * n + order[bucket_start[followers]]) # Sorts by the later document of the pair
+            for offset in range(1, self.bucket_partners + 1):
+                followers = np.flatnonzero(rank >= offset)
+                if not len(followers):
+                    break
+                pairs.append(order[followers] * n + order[followers - offset])
+        pairs = np.unique(np.concatenate(pairs))
+
+        linked = []
+        for start in range(0, len(pairs), chunk_size):
+            chunk = pairs[start:start + chunk_size]
+            similarity = (signatures[chunk // n] == signatures[chunk % n]).mean(axis=1)
+            linked.append(chunk[similarity >= self.threshold])
+        linked = np.concatenate(linked) if linked else np.empty(0, dtype=np.int64)
+
+        representatives = positions.copy()
+        documents, starts = np.unique(linked // n, return_index=True)
+        for i, partners in zip(documents.tolist(), np.split(linked % n, starts[1:])):
+            candidates = sorted(set(representatives[partners].tolist()))
+            matches = np.flatnonzero((signatures[candidates] == signatures[i]).mean(axis=1) >= self.threshold)
+            if len(matches):
+                representatives[i] = candidates[matches[0]]
+        return representatives, (signatures == signatures[representatives]).mean(axis=1)
+
+    @instrumented("find_near_duplicates")
+    def group(self, texts: List[str]) -> Tuple[List[int], Dict[int, List[Tuple[int, float]]]]:
+        """
+        Returns (indices of the cluster representatives, in input order,
+        {representative index: [(duplicate index, estimated similarity), ...]}).
+        """
+        if not texts:
+            return [], {}
+        representatives, similarity = self.cluster(self.signatures(texts))
+        duplicates: Dict[int, List[Tuple[int, float]]] = {}
+        for i in np.flatnonzero(representatives != np.arange(len(texts))):
+            duplicates.setdefault(int(representatives[i]), []).append((int(i), round(float(similarity[i]), 3)))
+        increment("near_duplicates", len(texts) - len(np.unique(representatives)))
+        return [int(i) for i in np.unique(representatives)], duplicates
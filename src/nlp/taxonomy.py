@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Union
+
+from src.nlp.keyword_matcher import KeywordMatcher
+
+# Default skill/education/experience vocabulary. Each category maps a canonical term to its
+# aliases (other spellings that should be reported as the canonical term); a plain list of
+# terms is also accepted when loading a taxonomy from JSON.
+DEFAULT_TAXONOMY = {
+    "skills": {
+        "python": [], "machine learning": [], "data science": [], "rpa": [], "vertex ai": [],
+        "tensorflow": [], "pytorch": [], "sql": [], "java": [], "javascript": [], "react": [],
+        "cloud": [], "aws": [], "azure": [], "gcp": [], "nlp": [], "deep learning": [],
+        "statistics": [], "docker": [], "kubernetes": [], "ai": [], "ml": [], "big data": [],
+        "spark": [], "hadoop": [],
+    },
+    "experience": {
+        "experience": [], "worked as": [], "developed": [], "implemented": [], "managed": [],
+        "led": [], "senior": [], "junior": [], "associate": [], "engineer": ["engineers"],
+        "scientist": ["scientists"], "analyst": ["analysts"], "specialist": ["specialists"], "years": [],
+    },
+    "education": {
+        "education": [], "university": [], "college": [], "bachelor": ["bachelors"],
+        "master": ["masters"], "ph.d": ["ph.d.", "phd"], "degree": [], "graduate": [], "alumni": [],
+        "b.tech": ["b. tech", "btech"], "m.tech": ["m. tech", "mtech"], "mba": [],
+        "computer science": [], "engineering": [], "statistics": [], "mathematics": [],
+    },
+}
+
+TAXONOMY_PATH = os.environ.get("RESUME_TAXONOMY_PATH")
+
+
+def _normalize_term(term: str) -> str:
+    return ' '.join(term.lower().split())
+
+
+class Taxonomy:
+    """
+    A categorized term dictionary compiled into one keyword automaton at load time.
+    `match` finds the terms of every category in a single pass over the text.
+    """
+
+    def __init__(self, categories: Dict[str, Union[Dict[str, List[str]], List[str]]]):
+        self.categories = {}
+        for category, terms in categories.items():
+            if isinstance(terms, dict):
+                self.categories[category] = {_normalize_term(t): [_normalize_term(a) for a in aliases] for t, aliases in terms.items()}
+            else:
+                self.categories[category] = {_normalize_term(t): [] for t in terms}
+
+        # One automaton for all categories; each surface form maps to the (category, canonical) pairs it reports
+        surface_forms: Dict[str, List[tuple]] = {}
+        self._term_order: Dict[tuple, int] = {}
+        for category, terms in self.categories.items():
+            for canonical, aliases in terms.items():
+                self._term_order[(category, canonical)] = len(self._term_order)
+                for form in [canonical] + aliases:
+                    surface_forms.setdefault(form, []).append((category, canonical))
+        self._forms = list(surface_forms.values())
+        self._matcher = KeywordMatcher(list(surface_forms))
+
+        digest = hashlib.sha256(json.dumps(self.categories, sort_keys=True).encode("utf-8")).hexdigest()
+        self.version = digest[:12] # Changes whenever the vocabulary changes
+
+    @classmethod
+    def from_file(cls, path: str) -> "Taxonomy":
+        """Loads a taxonomy from a JSON file shaped like DEFAULT_TAXONOMY."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def terms(self, category: str) -> List[str]:
+        """Canonical terms of a category, in taxonomy order."""
+        return list(self.categories.get(category, {}))
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """
+        Returns {category: [canonical terms found]} for every category, in taxonomy order.
+        Matching is case-insensitive and treats any run of whitespace as a single space.
+        """
+        normalized_text = re.sub(r'\s+', ' ', text.lower())
+        found = set()
+        for form_id in self._matcher.find(normalized_text):
+            found.update(self._forms[form_id])
+        results = {category: [] for category in self.categories}
+        for category, canonical in sorted(found, key=self._term_order.__getitem__):
+            results[category].append(canonical)
+        return results
+
+
+_default_taxonomy = None
+
+
+def get_default_taxonomy() -> Taxonomy:
+    """Returns the shared taxonomy (from RESUME_TAXONOMY_PATH if set), compiled once per process."""
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        _default_taxonomy = Taxonomy.from_file(TAXONOMY_PATH) if TAXONOMY_PATH else Taxonomy(DEFAULT_TAXONOMY)
+    return _default_taxonomy
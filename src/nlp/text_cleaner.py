@@ -1,16 +1,23 @@
 import re
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+# NLTK is imported and its corpora loaded on first use, so constructing a TextCleaner is free
 # import spacy # Uncomment and ensure 'en_core_web_sm' is downloaded for advanced use
 
 class TextCleaner:
     def __init__(self):
+        self.stop_words = None
+        self.lemmatizer = None
+        # self.nlp = spacy.load("en_core_web_sm") # Load SpaCy model if needed for NER
+
+    def _load_resources(self):
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
         self.stop_words = set(stopwords.words('english'))
         self.lemmatizer = WordNetLemmatizer()
-        # self.nlp = spacy.load("en_core_web_sm") # Load SpaCy model if needed for NER
 
     def clean_text(self, text: str) -> str:
         """Applies basic cleaning to text."""
+        if self.lemmatizer is None:
+            self._load_resources()
         text = text.lower()
         text = re.sub(r'[^a-zA-Z0-9\s]', '', text)  # Remove special characters
         tokens = text.split()
@@ -0,0 +1,109 @@
+import asyncio
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class QueueFullError(Exception):
+    """Raised by `MicroBatcher.submit` when the pending queue is at capacity (maps to HTTP 429)."""
+
+
+class BatcherStoppedError(Exception):
+    """Raised for items submitted to, or still waiting in, a stopped `MicroBatcher` (maps to HTTP 503)."""
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into batches for one model call.
+    A batch is dispatched as soon as it reaches `max_batch_size`, or `max_wait_ms` after its
+    first item arrived, whichever comes first. `process_batch` runs in a worker thread (so the
+    event loop keeps accepting requests) and must return one result per item, in order.
+    The queue is bounded: when `max_queue_size` items are waiting, `submit` fails fast.
+    `stop` fails every item that has not been answered yet with `BatcherStoppedError`.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]], max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, max_queue_size: int = 1024):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: List[Tuple[Any, asyncio.Future]] = [] # The batch being collected or processed
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self.largest_batch = 0
+
+    async def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            pending = self._in_flight
+            self._in_flight = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(BatcherStoppedError("Scoring service is shutting down."))
+
+    async def submit(self, item: Any) -> Any:
+        """Queues one item and waits for its result."""
+        if self._task is None:
+            raise BatcherStoppedError("Scoring service is not running.")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError(f"Scoring queue is full ({self.max_queue_size} pending requests).")
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._in_flight = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            items = [item for item, _ in batch]
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            try:
+                results = await loop.run_in_executor(None, self.process_batch, items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self._in_flight = []
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done(): # The client may have gone away
+                    future.set_result(result)
+            self._in_flight = []
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "rejected": self.rejected,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
@@ -0,0 +1,134 @@
+"""
+Load generator for the scoring service; reports latency percentiles and throughput.
+
+    python -m src.service.loadgen --requests 2000 --concurrency 64            # in-process service
+    python -m src.service.loadgen --url http://localhost:8081 --requests 2000  # running server
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+SAMPLE_JOB_DESCRIPTIONS = [
+    "Seeking a Senior Data Scientist with 5+ years experience in Python, Machine Learning and Vertex AI. Master's degree preferred.",
+    "Backend engineer with 3+ years experience in Java, SQL, Docker and Kubernetes. Bachelor's degree in Computer Science.",
+    "Cloud engineer: AWS, Azure or GCP, Docker, Kubernetes, big data with Spark and Hadoop.",
+]
+SAMPLE_SKILLS = ["python", "machine learning", "data science", "sql", "java", "javascript", "react", "aws", "azure", "gcp",
+                 "docker", "kubernetes", "spark", "hadoop", "tensorflow", "pytorch", "nlp", "deep learning", "statistics"]
+
+
+def sample_request(rng: random.Random) -> Dict:
+    skills = ", ".join(rng.sample(SAMPLE_SKILLS, rng.randint(2, 8)))
+    seniority = rng.choice(["Senior", "Junior", "Associate", "Lead"])
+    degree = rng.choice(["Bachelor of Engineering", "Master of Science in Computer Science", "MBA", "PhD in Statistics"])
+    return {
+        "job_description": rng.choice(SAMPLE_JOB_DESCRIPTIONS),
+        "resume_text": f"{seniority} Engineer with {rng.randint(1, 12)} years experience. Skills: {skills}. Education: {degree}, University.",
+    }
+
+
+class HttpClient:
+    """Tiny keep-alive HTTP/1.1 JSON client for a running service (one connection per client)."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, payload: Dict = None) -> Tuple[int, Dict]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self._writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                           f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+        await self._writer.drain()
+        status = int((await self._reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        response = json.loads(await self._reader.readexactly(int(headers.get("content-length", 0))))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, response
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = self._reader = None
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+async def run_load(make_client, total_requests: int = 1000, concurrency: int = 32, seed: int = 0) -> Dict:
+    """
+    Fires `total_requests` POST /score calls from `concurrency` concurrent workers and returns
+    latency percentiles (ms), throughput (requests/s) and a count per HTTP status.
+    `make_client` is called once per worker and must return an object with `request()`.
+    """
+    rng = random.Random(seed)
+    payloads = [sample_request(rng) for _ in range(total_requests)]
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    next_payload = iter(payloads)
+
+    async def worker():
+        client = make_client()
+        for payload in next_payload:
+            started = time.perf_counter()
+            status, _ = await client.request("POST", "/score", payload)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+        if hasattr(client, "close"):
+            await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "throughput_rps": round(total_requests / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "statuses": statuses,
+    }
+
+
+async def _main(args):
+    if args.url:
+        report = await run_load(lambda: HttpClient(args.url), args.requests, args.concurrency)
+    else:
+        from src.service.scoring_service import InProcessClient, build_service
+        service = build_service(args.max_batch_size, args.max_wait_ms, args.max_queue_size)
+        await service.start()
+        try:
+            report = await run_load(lambda: InProcessClient(service), args.requests, args.concurrency)
+            report["batcher"] = service.batcher.stats()
+        finally:
+            await service.stop()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Load-test the resume scoring service.")
+    arg_parser.add_argument("--url", help="Base URL of a running service; omit to run one in-process.")
+    arg_parser.add_argument("--requests", type=int, default=1000)
+    arg_parser.add_argument("--concurrency", type=int, default=32)
+    arg_parser.add_argument("--max-batch-size", type=int, default=32, help="In-process mode only.")
+    arg_parser.add_argument("--max-wait-ms", type=float, default=5.0, help="In-process mode only.")
+    arg_parser.add_argument("--max-queue-size", type=int, default=1024, help="In-process mode only.")
+    asyncio.run(_main(arg_parser.parse_args()))
@@ -0,0 +1,207 @@
+"""
+Asyncio HTTP scoring service for ATS integrations and RPA bots.
+
+    python -m src.service.scoring_service --port 8081
+
+    POST /score  {"job_description": "...", "resume_text": "...", "resume_id": "optional"}
+    GET  /healthz
+    GET  /stats
+    GET  /metrics   (Prometheus text format; requires RESUME_METRICS=1)
+
+Concurrent /score requests are coalesced by a MicroBatcher so one model batch serves many
+requests; when the queue is full the service answers 429.
+"""
+import argparse
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Dict, List, Tuple, Union
+
+from src.ml.job_description import process_job_description
+from src.ml.ranker import ResumeRanker
+from src.ml.resume_parser import ResumeParser
+from src.service.batcher import BatcherStoppedError, MicroBatcher, QueueFullError
+from src.utils.metrics import REGISTRY, register_collector
+
+MAX_BODY_BYTES = 2 * 1024 * 1024
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ScoringService:
+    """Request handling, independent of the transport (see `serve` and `InProcessClient`)."""
+
+    def __init__(self, parser: ResumeParser, skill_matcher, ranker: ResumeRanker, max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, max_queue_size: int = 1024):
+        self.parser = parser
+        self.skill_matcher = skill_matcher
+        self.ranker = ranker
+        self.batcher = MicroBatcher(self.score_batch, max_batch_size, max_wait_ms, max_queue_size)
+        register_collector("batcher", self.batcher.stats)
+
+    async def start(self):
+        await self.batcher.start()
+
+    async def stop(self):
+        await self.batcher.stop()
+
+    def score_batch(self, requests: List[Dict]) -> List[Dict]:
+        """
+        Scores a batch of {job_description, resume_text, resume_id} requests.
+        Every unique skill in the batch is embedded in one model call; requests are then
+        grouped by job description and scored with the columnar ranker.
+        """
+        job_requirements = {}
+        parsed = []
+        for request in requests:
+            job_text = request["job_description"]
+            if job_text not in job_requirements:
+                job_requirements[job_text] = process_job_description(job_text, self.parser.taxonomy)
+            parsed_data = self.parser.parse_text(request["resume_text"])
+            parsed_data.pop("rawContent", None) # The caller already has the text
+            parsed.append({"resume_id": request.get("resume_id"), "original_source": "api", "parsed_data": parsed_data})
+
+        # One batched forward pass for the whole batch; per-job scoring below reuses these vectors
+        all_skills = []
+        for requirements in job_requirements.values():
+            all_skills.extend(requirements["required_skills"])
+        for resume in parsed:
+            all_skills.extend(resume["parsed_data"]["skills"])
+        skill_embeddings = self.skill_matcher.embed_skills(all_skills)
+
+        results: List[Dict] = [None] * len(requests)
+        for job_text, requirements in job_requirements.items():
+            positions = [i for i, request in enumerate(requests) if request["job_description"] == job_text]
+            group = [parsed[i] for i in positions]
+            features = self.ranker.build_features(group, requirements, self.skill_matcher, skill_embeddings=skill_embeddings)
+            scores = self.ranker.combine_scores(features)
+            for row, position in enumerate(positions):
+                results[position] = self.ranker.ranked_record(group[row], scores, features, row)
+        return results
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Union[Dict, str]]:
+        """Routes one request and returns (HTTP status, payload); a str payload is sent as plain text."""
+        if method == "GET" and path == "/healthz":
+            return HTTPStatus.OK, {"status": "ok", "model_loaded": bool(getattr(self.skill_matcher, "model_loaded", False))}
+        if method == "GET" and path == "/stats":
+            return HTTPStatus.OK, {"batcher": self.batcher.stats()}
+        if method == "GET" and path == "/metrics":
+            if not REGISTRY.enabled:
+                return HTTPStatus.NOT_FOUND, {"error": "Metrics are disabled; start the service with RESUME_METRICS=1."}
+            return HTTPStatus.OK, REGISTRY.to_prometheus()
+        if path != "/score":
+            return HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {path}."}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST /score."}
+
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON body: {e}"}
+        if not isinstance(request, dict) or not isinstance(request.get("job_description"), str) or not isinstance(request.get("resume_text"), str):
+            return HTTPStatus.BAD_REQUEST, {"error": "Body must be an object with string fields 'job_description' and 'resume_text'."}
+        try:
+            result = await self.batcher.submit(request)
+        except QueueFullError as e:
+            return HTTPStatus.TOO_MANY_REQUESTS, {"error": str(e)}
+        except BatcherStoppedError as e:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Scoring failed: {e}"}
+        return HTTPStatus.OK, result
+
+
+async def _handle_connection(service: ScoringService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal HTTP/1.1 connection handler with keep-alive."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                method = target = version = None
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            try:
+                content_length = int(headers.get("content-length", 0) or 0)
+            except ValueError:
+                content_length = -1
+            if method is None:
+                status, payload = HTTPStatus.BAD_REQUEST, {"error": "Malformed request line."}
+                keep_alive = False
+            elif content_length < 0:
+                # The body can't be framed, so the connection can't be reused either
+                status, payload = HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length header."}
+                keep_alive = False
+            elif content_length > MAX_BODY_BYTES:
+                status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body too large."}
+                keep_alive = False
+            else:
+                body = await reader.readexactly(content_length) if content_length else b""
+                status, payload = await service.handle(method.upper(), target.split("?", 1)[0], body)
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+            if isinstance(payload, str):
+                response_body, content_type = payload.encode("utf-8"), PROMETHEUS_CONTENT_TYPE
+            else:
+                response_body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+            writer.write(
+                f"HTTP/1.1 {int(status)} {HTTPStatus(status).phrase}\r\n"
+                f"Content-Type: {content_type}\r\nContent-Length: {len(response_body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + response_body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service: ScoringService, host: str = "0.0.0.0", port: int = 8081):
+    """Runs the HTTP server until cancelled."""
+    await service.start()
+    server = await asyncio.start_server(lambda r, w: _handle_connection(service, r, w), host, port)
+    print(f"Scoring service listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+class InProcessClient:
+    """Calls a ScoringService directly (no sockets), for local testing and load generation."""
+
+    def __init__(self, service: ScoringService):
+        self.service = service
+
+    async def request(self, method: str, path: str, payload: Dict = None) -> Tuple[int, Union[Dict, str]]:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        status, response = await self.service.handle(method, path, body)
+        if isinstance(response, str):
+            return int(status), response
+        return int(status), json.loads(json.dumps(response)) # Same serialization round-trip as over HTTP
+
+
+def build_service(max_batch_size: int = 32, max_wait_ms: float = 5.0, max_queue_size: int = 1024) -> ScoringService:
+    from src.ml.skill_matcher import SkillMatcher
+    return ScoringService(ResumeParser(), SkillMatcher(), ResumeRanker(), max_batch_size, max_wait_ms, max_queue_size)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Run the asyncio resume scoring service.")
+    arg_parser.add_argument("--host", default="0.0.0.0")
+    arg_parser.add_argument("--port", type=int, default=8081)
+    arg_parser.add_argument("--max-batch-size", type=int, default=32)
+    arg_parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    arg_parser.add_argument("--max-queue-size", type=int, default=1024)
+    args = arg_parser.parse_args()
+    asyncio.run(serve(build_service(args.max_batch_size, args.max_wait_ms, args.max_queue_size), args.host, args.port))
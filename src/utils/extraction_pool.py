@@ -0,0 +1,204 @@
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import wait
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.utils.metrics import increment, observe_span
+
+DEFAULT_TIMEOUT_SECONDS = float(os.environ.get("EXTRACTION_TIMEOUT_SECONDS", 60))
+DEFAULT_MAX_WORKER_RSS_MB = int(os.environ.get("EXTRACTION_MAX_WORKER_RSS_MB", 1024))
+RSS_POLL_SECONDS = 0.5
+
+
+def _process_rss_bytes(pid="self") -> Optional[int]:
+    """Current resident set size of a process from /proc, or None where /proc isn't available."""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of the calling process (current on Linux, peak elsewhere)."""
+    rss = _process_rss_bytes()
+    if rss is not None:
+        return rss
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux and the BSDs
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _worker_main(conn, max_rss_bytes: int, extractor: Optional[Callable[[str, bytes], str]] = None):
+    """Worker loop: extract text for each (file_name, file_bytes) task until told to stop."""
+    if extractor is None:
+        from src.ml.resume_parser import ResumeParser
+        extractor = ResumeParser().extract_text
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        file_name, file_bytes = task
+        try:
+            text = extractor(file_name, file_bytes)
+            result = {"text": text, "error": None if text.strip() else "No text could be extracted."}
+        except Exception as e:
+            result = {"text": "", "error": f"{type(e).__name__}: {e}"}
+        # Ask to be recycled when this worker has grown past its memory ceiling
+        result["recycle"] = max_rss_bytes > 0 and _current_rss_bytes() > max_rss_bytes
+        conn.send(result)
+        if result["recycle"]:
+            return
+
+
+class _Worker:
+    def __init__(self, context, max_rss_bytes: int, extractor: Optional[Callable[[str, bytes], str]] = None):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, max_rss_bytes, extractor), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None # (index, file_name, started_at) while busy
+
+    def stop(self, force: bool = False):
+        if not force:
+            try:
+                self.conn.send(None)
+            except (OSError, BrokenPipeError):
+                force = True
+        if force and self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ExtractionPool:
+    """
+    Extracts text from resume files in a pool of worker processes.
+    Each document has a wall-clock timeout (the worker is killed and replaced if it overruns),
+    and workers whose RSS grows past `max_worker_rss_mb` are recycled. The parent polls each busy
+    worker's RSS (from /proc, where available) and kills one that overruns mid-file; elsewhere the
+    worker checks its own peak RSS after each file.
+    `extractor` is a picklable (file_name, file_bytes) -> text callable run in the workers;
+    it defaults to ResumeParser.extract_text.
+    Results are yielded in completion order, one record per file:
+        {"index", "file_name", "text", "ok", "error", "elapsed_seconds"}
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 max_worker_rss_mb: int = DEFAULT_MAX_WORKER_RSS_MB, start_method: str = "spawn",
+                 extractor: Optional[Callable[[str, bytes], str]] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_rss_bytes = max_worker_rss_mb * 1024 * 1024 if max_worker_rss_mb else 0
+        self.extractor = extractor
+        # 'spawn' keeps workers free of the parent's model/thread state (torch, Streamlit)
+        self._context = multiprocessing.get_context(start_method)
+        self._idle = []
+
+    def _acquire_worker(self) -> _Worker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.process.is_alive():
+                return worker
+            worker.stop(force=True)
+        return _Worker(self._context, self.max_rss_bytes, self.extractor)
+
+    def extract(self, documents: Iterable[Tuple[str, bytes]]) -> Iterator[Dict]:
+        """Extracts every (file_name, file_bytes) pair, yielding result records as files finish."""
+        pending = iter(enumerate(documents))
+        busy = {} # conn -> worker
+        exhausted = False
+        try:
+            while True:
+                # Keep every worker slot fed
+                while not exhausted and len(busy) < self.max_workers:
+                    try:
+                        index, (file_name, file_bytes) = next(pending)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    worker = self._acquire_worker()
+                    try:
+                        worker.conn.send((file_name, file_bytes))
+                    except (OSError, BrokenPipeError) as e:
+                        worker.stop(force=True)
+                        yield self._record(index, file_name, "", f"Could not dispatch to worker: {e}", 0.0)
+                        continue
+                    worker.task = (index, file_name, time.monotonic())
+                    busy[worker.conn] = worker
+                if not busy:
+                    return
+
+                now = time.monotonic()
+                next_deadline = min(worker.task[2] + self.timeout for worker in busy.values())
+                wait_seconds = max(0.0, next_deadline - now)
+                if self.max_rss_bytes:
+                    wait_seconds = min(wait_seconds, RSS_POLL_SECONDS)
+                for conn in wait(list(busy), timeout=wait_seconds):
+                    worker = busy.pop(conn)
+                    index, file_name, started_at = worker.task
+                    worker.task = None
+                    elapsed = time.monotonic() - started_at
+                    try:
+                        result = conn.recv()
+                    except (EOFError, OSError):
+                        # The worker died mid-file (e.g. killed by the OOM killer)
+                        worker.stop(force=True)
+                        yield self._record(index, file_name, "", f"Worker exited unexpectedly (exit code {worker.process.exitcode}).", elapsed)
+                        continue
+                    if result["recycle"]:
+                        worker.stop()
+                    else:
+                        self._idle.append(worker)
+                    yield self._record(index, file_name, result["text"], result["error"], elapsed)
+
+                # Kill workers stuck past their per-document deadline or grown past the memory ceiling
+                now = time.monotonic()
+                for conn, worker in list(busy.items()):
+                    index, file_name, started_at = worker.task
+                    if now - started_at >= self.timeout:
+                        error = f"Timed out after {self.timeout:.0f}s."
+                    elif self._over_memory_ceiling(worker):
+                        error = f"Worker exceeded the {self.max_rss_bytes // (1024 * 1024)} MB memory ceiling."
+                    else:
+                        continue
+                    del busy[conn]
+                    worker.stop(force=True)
+                    yield self._record(index, file_name, "", error, now - started_at)
+        finally:
+            # Abandoned or interrupted iteration: don't leave workers mid-task
+            for worker in busy.values():
+                worker.stop(force=True)
+
+    def _over_memory_ceiling(self, worker: _Worker) -> bool:
+        if not self.max_rss_bytes:
+            return False
+        rss = _process_rss_bytes(worker.process.pid)
+        return rss is not None and rss > self.max_rss_bytes
+
+    @staticmethod
+    def _record(index: int, file_name: str, text: str, error: Optional[str], elapsed: float) -> Dict:
+        # Extraction runs in the workers, so its spans are recorded here in the parent process
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension in (".pdf", ".docx"):
+            observe_span(f"parse_{extension[1:]}", elapsed)
+        increment("documents_extracted" if error is None else "extraction_failures")
+        return {"index": index, "file_name": file_name, "text": text, "ok": error is None,
+                "error": error, "elapsed_seconds": round(elapsed, 3)}
+
+    def close(self):
+        """Stops the idle workers kept between `extract` calls."""
+        while self._idle:
+            self._idle.pop().stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,17 +1,42 @@
-from google.cloud import storage
-import io
+import os
+import sys
+import threading
+# google-cloud-storage is optional (see requirements.txt); it is imported when a client is first needed
+
+DEFAULT_POOL_SIZE = int(os.environ.get("GCS_INGEST_WORKERS", 16)) # Sized for the default number of ingest workers
+_client = None
+_client_pool_size = None
+_client_lock = threading.Lock()
+
+def get_storage_client(pool_size: int = None):
+    """
+    Returns the process-wide `storage.Client`, creating it on first use.
+    Reusing one client keeps authentication and HTTP connections warm across calls; its
+    connection pool is sized for `pool_size` concurrent requests (DEFAULT_POOL_SIZE if not
+    given; requests' default is 10). The pool can't be resized once the client exists, so a
+    later call asking for a different `pool_size` gets a warning and the existing client.
+    """
+    global _client, _client_pool_size
+    with _client_lock:
+        if _client is None:
+            from google.cloud import storage
+            from requests.adapters import HTTPAdapter
+            size = pool_size or DEFAULT_POOL_SIZE
+            client = storage.Client()
+            # `_http` is the client's own authorized requests session (a private attribute of
+            # google-cloud-core, created on first access); see the version range in requirements.txt
+            client._http.mount("https://", HTTPAdapter(pool_connections=size, pool_maxsize=size))
+            _client, _client_pool_size = client, size
+        elif pool_size is not None and pool_size != _client_pool_size:
+            print(f"Warning: the storage client already exists with a connection pool of {_client_pool_size}; "
+                  f"not resizing it to {pool_size}.", file=sys.stderr)
+        return _client
 
 def download_blob_to_memory(bucket_name: str, source_blob_name: str) -> bytes:
     """Downloads a blob from the bucket into memory."""
     try:
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(source_blob_name)
-
-        file_content = io.BytesIO()
-        blob.download_to_file(file_content)
-        file_content.seek(0) # Rewind to the beginning
-        return file_content.read()
+        blob = get_storage_client().bucket(bucket_name).blob(source_blob_name)
+        return blob.download_as_bytes() # Straight into bytes, no intermediate BytesIO copy
     except Exception as e:
         print(f"Error downloading {source_blob_name} from {bucket_name}: {e}")
         raise
@@ -19,9 +44,7 @@ def download_blob_to_memory(bucket_name: str, source_blob_name: str) -> bytes:
 def upload_blob_from_memory(bucket_name: str, destination_blob_name: str, data: bytes, content_type: str = 'application/octet-stream'):
     """Uploads data from memory to a blob."""
     try:
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(destination_blob_name)
+        blob = get_storage_client().bucket(bucket_name).blob(destination_blob_name)
         blob.upload_from_string(data, content_type=content_type)
         print(f"File uploaded to gs://{bucket_name}/{destination_blob_name}")
     except Exception as e:
@@ -0,0 +1,227 @@
+"""
+Bulk resume ingestion from a Cloud Storage bucket prefix (or a local stand-in directory).
+
+    python -m src.utils.gcs_ingest --bucket my-resumes --prefix incoming/ --workers 32
+    python -m src.utils.gcs_ingest --local-bucket bench_corpus/ --latency-ms 40 --workers 32   # offline benchmark
+
+Objects are downloaded concurrently over one shared client (bounded parallelism, retries with
+backoff on transient errors) and each payload is parsed as soon as it arrives.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, Tuple
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+DEFAULT_INGEST_WORKERS = int(os.environ.get("GCS_INGEST_WORKERS", 16))
+# HTTP status codes worth retrying (timeouts, throttling, server-side errors)
+TRANSIENT_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+
+class TransientBucketError(ConnectionError):
+    """A retryable failure raised by `LocalBucket` to simulate flaky network reads."""
+
+
+class GCSBucket:
+    """
+    A Cloud Storage bucket behind the minimal interface used for ingestion (`list`, `read`).
+    Uses the shared client from `get_storage_client` unless `client` is given; `pool_size` only
+    applies if this creates that client.
+    """
+
+    def __init__(self, bucket_name: str, client=None, pool_size: int = None):
+        from src.utils.gcp_utils import get_storage_client
+        self.bucket_name = bucket_name
+        self.bucket = (client if client is not None else get_storage_client(pool_size)).bucket(bucket_name)
+
+    def uri(self, name: str) -> str:
+        return f"gs://{self.bucket_name}/{name}"
+
+    def list(self, prefix: str = "") -> Iterator[Tuple[str, int]]:
+        """Yields (object name, size in bytes) under `prefix`; listing pages are fetched lazily."""
+        for blob in self.bucket.client.list_blobs(self.bucket_name, prefix=prefix or None):
+            yield blob.name, blob.size or 0
+
+    def read(self, name: str) -> bytes:
+        return self.bucket.blob(name).download_as_bytes()
+
+
+class LocalBucket:
+    """
+    Filesystem-backed fake bucket: object names are paths relative to `root`.
+    `latency_seconds` adds a per-read delay and `transient_failure_rate` makes reads fail with
+    `TransientBucketError` at random, so concurrency and retries can be exercised offline.
+    """
+
+    def __init__(self, root: str, latency_seconds: float = 0.0, transient_failure_rate: float = 0.0, seed: int = 0):
+        self.root = root
+        self.latency_seconds = latency_seconds
+        self.transient_failure_rate = transient_failure_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def uri(self, name: str) -> str:
+        return f"file://{os.path.abspath(os.path.join(self.root, name))}"
+
+    def list(self, prefix: str = "") -> Iterator[Tuple[str, int]]:
+        # Listed in lexicographic name order, like Cloud Storage
+        names = []
+        for directory, _, files in os.walk(self.root):
+            for file_name in files:
+                name = os.path.relpath(os.path.join(directory, file_name), self.root).replace(os.sep, "/")
+                if name.startswith(prefix):
+                    names.append(name)
+        for name in sorted(names):
+            yield name, os.path.getsize(os.path.join(self.root, name))
+
+    def read(self, name: str) -> bytes:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        if self.transient_failure_rate:
+            with self._rng_lock:
+                failed = self._rng.random() < self.transient_failure_rate
+            if failed:
+                raise TransientBucketError(f"Simulated transient failure reading {name}.")
+        with open(os.path.join(self.root, name), "rb") as f:
+            return f.read()
+
+    def write(self, name: str, data: bytes):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+def is_transient(error: Exception) -> bool:
+    """True for errors worth retrying: connection problems, timeouts and retryable HTTP statuses."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    code = getattr(error, "code", None) # google.api_core exceptions carry the HTTP status here
+    if code in TRANSIENT_STATUS_CODES:
+        return True
+    try:
+        import requests
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+    except ImportError:
+        return False
+
+
+def read_with_retries(bucket, name: str, retries: int = 3, backoff_seconds: float = 0.2) -> Tuple[bytes, int]:
+    """Reads one object, retrying transient errors with jittered exponential backoff. Returns (data, attempts)."""
+    for attempt in range(1, retries + 2):
+        try:
+            return bucket.read(name), attempt
+        except Exception as e:
+            if attempt > retries or not is_transient(e):
+                e.attempts = attempt
+                raise
+            time.sleep(backoff_seconds * (2 ** (attempt - 1)) * (0.5 + random.random()))
+
+
+def iter_bucket_documents(bucket, prefix: str = "", max_workers: int = DEFAULT_INGEST_WORKERS, retries: int = 3,
+                          ordered: bool = False, extensions: Tuple[str, ...] = RESUME_EXTENSIONS,
+                          stats: Dict = None) -> Iterator[Dict]:
+    """
+    Downloads every object under `prefix` whose name ends with one of `extensions`, yielding
+    {"name", "data", "ok", "error", "attempts", "elapsed_seconds"} as downloads finish (or in
+    listing order with `ordered=True`). At most `max_workers * 2` downloads are in flight or
+    buffered at once, so memory stays bounded however large the prefix is.
+    """
+    stats = stats if stats is not None else {}
+    max_in_flight = max_workers * 2
+
+    def download(name: str) -> Dict:
+        started = time.monotonic()
+        try:
+            data, attempts = read_with_retries(bucket, name, retries)
+            return {"name": name, "data": data, "ok": True, "error": None, "attempts": attempts,
+                    "elapsed_seconds": round(time.monotonic() - started, 3)}
+        except Exception as e:
+            return {"name": name, "data": b"", "ok": False, "error": f"{e.__class__.__name__}: {e}", "attempts": getattr(e, "attempts", 1),
+                    "elapsed_seconds": round(time.monotonic() - started, 3)}
+
+    def record(result: Dict) -> Dict:
+        outcome = "downloaded" if result["ok"] else "failed"
+        stats[outcome] = stats.get(outcome, 0) + 1
+        stats["bytes"] = stats.get("bytes", 0) + len(result["data"])
+        stats["retries"] = stats.get("retries", 0) + result["attempts"] - 1
+        return result
+
+    in_flight = deque()
+
+    def finished() -> list:
+        if ordered:
+            return [in_flight.popleft().result()]
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            in_flight.remove(future)
+        return [future.result() for future in done]
+
+    names = (name for name, _ in bucket.list(prefix) if name.lower().endswith(extensions))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gcs-ingest") as executor:
+        try:
+            for name in names:
+                in_flight.append(executor.submit(download, name))
+                if len(in_flight) >= max_in_flight:
+                    for result in finished():
+                        yield record(result)
+            while in_flight:
+                for result in finished():
+                    yield record(result)
+        finally:
+            # Abandoned iteration: don't start downloads nobody will consume
+            for future in in_flight:
+                future.cancel()
+
+
+def ingest(bucket, parser, prefix: str = "", max_workers: int = DEFAULT_INGEST_WORKERS, retries: int = 3,
+           stats: Dict = None) -> Iterator[Dict]:
+    """
+    Streams every resume under `prefix` into `parser` as soon as its download completes and
+    yields processed resume dicts ({"resume_id", "original_source", "parsed_data"}).
+    Download and extraction failures are counted in `stats` and reported on stderr, not raised.
+    """
+    stats = stats if stats is not None else {}
+    for result in iter_bucket_documents(bucket, prefix, max_workers, retries, stats=stats):
+        if not result["ok"]:
+            print(f"Error downloading '{result['name']}': {result['error']}", file=sys.stderr)
+            continue
+        try:
+            text, parsed_data = parser.parse_file(result["name"], result["data"])
+        except Exception as e:
+            stats["parse_failed"] = stats.get("parse_failed", 0) + 1
+            print(f"Error processing '{result['name']}': {e}", file=sys.stderr)
+            continue
+        stats["parsed"] = stats.get("parsed", 0) + 1
+        yield {"resume_id": os.path.splitext(os.path.basename(result["name"]))[0],
+               "original_source": bucket.uri(result["name"]), "parsed_data": parsed_data}
+
+
+if __name__ == "__main__":
+    from src.ml.resume_parser import ResumeParser
+
+    arg_parser = argparse.ArgumentParser(description="Download and parse every resume under a bucket prefix.")
+    source = arg_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--bucket", help="Cloud Storage bucket name.")
+    source.add_argument("--local-bucket", help="Directory used as a fake bucket (offline testing/benchmarks).")
+    arg_parser.add_argument("--prefix", default="")
+    arg_parser.add_argument("--workers", type=int, default=DEFAULT_INGEST_WORKERS, help="Concurrent downloads.")
+    arg_parser.add_argument("--retries", type=int, default=3)
+    arg_parser.add_argument("--latency-ms", type=float, default=0.0, help="Local bucket only: simulated per-object latency.")
+    arg_parser.add_argument("--failure-rate", type=float, default=0.0, help="Local bucket only: simulated transient failure rate.")
+    args = arg_parser.parse_args()
+
+    if args.bucket:
+        bucket = GCSBucket(args.bucket, pool_size=args.workers)
+    else:
+        bucket = LocalBucket(args.local_bucket, args.latency_ms / 1000.0, args.failure_rate)
+    stats = {}
+    started = time.monotonic()
+    count = sum(1 for _ in ingest(bucket, ResumeParser(), args.prefix, args.workers, args.retries, stats))
+    elapsed = time.monotonic() - started
+    print(f"Parsed {count} resumes in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.1f}/s); stats: {stats}")
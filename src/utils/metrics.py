@@ -0,0 +1,215 @@
+"""
+Lightweight in-process instrumentation: latency spans, histograms, counters and gauges,
+exportable in Prometheus text format.
+
+Enable with RESUME_METRICS=1. When it is off at import time, `instrumented` returns the
+decorated function unchanged and `span`/`increment`/`observe` return after one flag check,
+so the hot paths pay nothing measurable.
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable
+
+METRICS_ENABLED = os.environ.get("RESUME_METRICS", "0") == "1"
+METRIC_PREFIX = "resume_"
+
+# Seconds; wide enough for a cache lookup (tens of µs) up to a slow pdfminer extraction
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts are computed on export, as Prometheus expects)."""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # Last slot is the +Inf overflow bucket
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimates the q-quantile by linear interpolation inside the bucket that contains it."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= target and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (target - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """Thread-safe store of span latencies, value histograms, counters and gauge collectors."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.spans: Dict[str, Histogram] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        # name -> callable returning {key: number}; evaluated only on export (e.g. cache stats)
+        self.collectors: Dict[str, Callable[[], Dict]] = {}
+
+    def observe_span(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.spans.get(name)
+            if histogram is None:
+                histogram = self.spans[name] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def observe(self, name: str, value: float, buckets: Iterable[float] = SIZE_BUCKETS):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    def increment(self, name: str, amount: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def register_collector(self, name: str, collector: Callable[[], Dict]):
+        """Registers (or replaces) a gauge source, e.g. `cache.stats`."""
+        self.collectors[name] = collector
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self.histograms.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+    def _gauges(self) -> Dict[str, float]:
+        gauges = {}
+        for name, collector in list(self.collectors.items()):
+            try:
+                values = collector()
+            except Exception:
+                continue # A collector whose owner has gone away must not break the export
+            for key, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    gauges[f"{name}_{key}"] = value
+        return gauges
+
+    def snapshot(self) -> Dict:
+        """Summary for dashboards: per-span count, mean/p50/p95 latency (ms) and throughput."""
+        with self._lock:
+            spans = {
+                name: {
+                    "count": h.count,
+                    "total_seconds": round(h.sum, 4),
+                    "mean_ms": round(1000 * h.sum / h.count, 3) if h.count else 0.0,
+                    "p50_ms": round(1000 * h.quantile(0.50), 3),
+                    "p95_ms": round(1000 * h.quantile(0.95), 3),
+                    # Calls per second of time spent inside the span (e.g. documents/sec for parse_pdf)
+                    "per_second": round(h.count / h.sum, 1) if h.sum else 0.0,
+                }
+                for name, h in sorted(self.spans.items())
+            }
+            histograms = {name: {"count": h.count, "mean": round(h.sum / h.count, 2) if h.count else 0.0, "p95": round(h.quantile(0.95), 2)}
+                          for name, h in sorted(self.histograms.items())}
+            counters = dict(sorted(self.counters.items()))
+        return {"uptime_seconds": round(time.time() - self.started, 1), "spans": spans, "histograms": histograms,
+                "counters": counters, "gauges": self._gauges()}
+
+    def to_prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+
+        def histogram_lines(metric: str, labels: str, histogram: Histogram):
+            cumulative = 0
+            for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{labels}le="{bound}"}} {cumulative}')
+            label_block = f"{{{labels.rstrip(',')}}}" if labels else ""
+            lines.append(f"{metric}_sum{label_block} {histogram.sum}")
+            lines.append(f"{metric}_count{label_block} {histogram.count}")
+
+        with self._lock:
+            if self.spans:
+                metric = f"{METRIC_PREFIX}span_seconds"
+                lines.append(f"# HELP {metric} Latency of instrumented operations.")
+                lines.append(f"# TYPE {metric} histogram")
+                for name, histogram in sorted(self.spans.items()):
+                    histogram_lines(metric, f'span="{name}",', histogram)
+            for name, histogram in sorted(self.histograms.items()):
+                metric = f"{METRIC_PREFIX}{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                histogram_lines(metric, "", histogram)
+            for name, value in sorted(self.counters.items()):
+                metric = f"{METRIC_PREFIX}{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+        for name, value in sorted(self._gauges().items()):
+            metric = f"{METRIC_PREFIX}{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry(enabled=METRICS_ENABLED)
+
+
+def instrumented(name: str):
+    """Decorator recording each call's latency under span `name` (a no-op when metrics are disabled)."""
+    def decorator(fn):
+        if not REGISTRY.enabled:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                REGISTRY.observe_span(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def span(name: str):
+    """Records the latency of the wrapped block under span `name`."""
+    if not REGISTRY.enabled:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.observe_span(name, time.perf_counter() - started)
+
+
+def increment(name: str, amount: float = 1):
+    if REGISTRY.enabled:
+        REGISTRY.increment(name, amount)
+
+
+def observe(name: str, value: float, buckets: Iterable[float] = SIZE_BUCKETS):
+    if REGISTRY.enabled:
+        REGISTRY.observe(name, value, buckets)
+
+
+def observe_span(name: str, seconds: float):
+    """Records a latency measured elsewhere (e.g. in a worker process)."""
+    if REGISTRY.enabled:
+        REGISTRY.observe_span(name, seconds)
+
+
+def register_collector(name: str, collector: Callable[[], Dict]):
+    if REGISTRY.enabled:
+        REGISTRY.register_collector(name, collector)
@@ -0,0 +1,19 @@
+import time
+from contextlib import contextmanager
+
+# Seconds spent in each named startup step (imports, model load, ...), in the order they ran
+STARTUP_TIMINGS = {}
+
+
+@contextmanager
+def timed(step: str):
+    """Records how long the wrapped block takes under `step` in STARTUP_TIMINGS."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS[step] = round(time.perf_counter() - started, 3)
+
+
+def record_timing(step: str, seconds: float):
+    STARTUP_TIMINGS[step] = round(seconds, 3)
@@ -0,0 +1,92 @@
+import re
+import zlib
+
+import numpy as np
+import pytest
+
+from src.benchmarks.corpus import CorpusGenerator
+from src.ml.embedding_backends import StaticEmbeddingBackend
+from src.ml.job_description import process_job_description
+from src.ml.resume_parser import ResumeParser
+from src.ml.skill_matcher import SkillMatcher
+from src.nlp.taxonomy import get_default_taxonomy
+
+POOL_SIZE = 150
+JOB_COUNT = 4
+
+
+class HashingBackend:
+    """
+    Stand-in for the transformer when distilling a static table: a fixed random vector per text,
+    optionally perturbed by `noise` times a second vector drawn from `seed` (a drifted backend).
+    """
+    dim = 16
+
+    def __init__(self, noise=0.0, seed=1):
+        self.noise = noise
+        self.seed = seed
+
+    def encode(self, texts, batch_size=64):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            key = zlib.crc32(text.encode("utf-8"))
+            vectors[i] = np.random.default_rng(key).standard_normal(self.dim)
+            if self.noise:
+                vectors[i] += self.noise * np.random.default_rng([self.seed, key]).standard_normal(self.dim)
+        return vectors
+
+
+class WordCleaner:
+    """Stand-in for TextCleaner (which needs the NLTK corpora): lowercased words without punctuation."""
+
+    def clean_text(self, text):
+        return " ".join(re.sub(r"[^a-z0-9\s]", "", text.lower()).split())
+
+
+@pytest.fixture(scope="session")
+def static_table(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("static_embeddings"))
+    StaticEmbeddingBackend.build(HashingBackend(), get_default_taxonomy().terms("skills"), path=path)
+    return path
+
+
+@pytest.fixture
+def static_matcher_factory(tmp_path):
+    """Builds SkillMatchers over static tables distilled from a HashingBackend with the given drift."""
+    def build(noise=0.0, seed=1):
+        path = str(tmp_path / f"static_{noise}_{seed}")
+        StaticEmbeddingBackend.build(HashingBackend(noise, seed), get_default_taxonomy().terms("skills"), path=path)
+        return SkillMatcher(backend="static", cache_dir=None, static_table_path=path)
+    return build
+
+
+@pytest.fixture
+def skill_matcher(static_table):
+    """A SkillMatcher with a loaded model (the static backend) and an empty in-memory cache."""
+    return SkillMatcher(backend="static", cache_dir=None, static_table_path=static_table)
+
+
+@pytest.fixture(scope="session")
+def parser():
+    return ResumeParser()
+
+
+@pytest.fixture(scope="session")
+def generator():
+    return CorpusGenerator(seed=7)
+
+
+@pytest.fixture(scope="session")
+def resume_pool(parser, generator):
+    return [{"resume_id": f"resume_{i:04d}", "original_source": f"resume_{i:04d}.txt", "parsed_data": parser.parse_text(generator.resume_text(i))}
+            for i in range(POOL_SIZE)]
+
+
+@pytest.fixture(scope="session")
+def job_requirements_list(parser, generator):
+    return [process_job_description(generator.job_description(n), parser.taxonomy) for n in range(JOB_COUNT)]
+
+
+@pytest.fixture
+def word_cleaner():
+    return WordCleaner()
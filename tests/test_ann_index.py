@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from src.ml.ann_index import IVFPQIndex, SemanticCandidateGenerator, benchmark_recall, exact_search, profile_text
+from src.ml.ranker import ResumeRanker
+from src.ml.skill_matcher import SkillMatcher
+
+DIM = 32
+
+
+@pytest.fixture(scope="module")
+def clustered_corpus():
+    """Two-level clustered vectors (roles -> specialisations -> resumes), as in the module benchmark."""
+    rng = np.random.default_rng(0)
+    roles = rng.standard_normal((10, DIM)).astype(np.float32)
+    specialisations = roles[rng.integers(0, len(roles), 200)] + 0.6 * rng.standard_normal((200, DIM)).astype(np.float32)
+
+    def sample(n):
+        return specialisations[rng.integers(0, len(specialisations), n)] + 0.3 * rng.standard_normal((n, DIM)).astype(np.float32)
+    return sample(3000), sample(30)
+
+
+@pytest.fixture(scope="module")
+def index(clustered_corpus):
+    base, _ = clustered_corpus
+    index = IVFPQIndex(DIM, n_lists=32, n_subvectors=8)
+    index.train(base)
+    index.add(base, np.arange(len(base)))
+    return index
+
+
+def recall(results, n_probe):
+    return next(row["recall@10"] for row in results if row["n_probe"] == n_probe)
+
+
+def test_recall_against_exact_search(index, clustered_corpus):
+    base, queries = clustered_corpus
+    ids = np.arange(len(base))
+    assert recall(benchmark_recall(index, base, ids, queries, 10, n_probes=(1, 32)), 32) >= 0.8
+    reranked = benchmark_recall(index, base, ids, queries, 10, n_probes=(1, 8), rerank=4)
+    assert recall(reranked, 8) >= 0.95
+    assert recall(reranked, 8) >= recall(reranked, 1)
+
+
+def test_save_load_round_trip(index, clustered_corpus, tmp_path):
+    base, queries = clustered_corpus
+    index.save(str(tmp_path))
+    for mmap in (True, False):
+        loaded = IVFPQIndex.load(str(tmp_path), mmap=mmap)
+        for query in queries[:5]:
+            expected_ids, expected_similarities = index.search(query, 10, n_probe=8, rerank=2)
+            found_ids, found_similarities = loaded.search(query, 10, n_probe=8, rerank=2)
+            assert np.array_equal(found_ids, expected_ids) and np.array_equal(found_similarities, expected_similarities)
+    loaded.add(base[:10], np.arange(len(base), len(base) + 10)) # A loaded index keeps growing
+    assert len(loaded) == len(base) + 10
+
+
+def test_empty_and_untrained_index(clustered_corpus):
+    base, queries = clustered_corpus
+    index = IVFPQIndex(DIM, n_lists=8, n_subvectors=8)
+    assert not index.is_trained
+    with pytest.raises(RuntimeError):
+        index.add(base[:10], np.arange(10))
+    with pytest.raises(ValueError):
+        index.train(base[:0])
+    index.train(base[:100])
+    found, similarities = index.search(queries[0], 10)
+    assert len(found) == 0 and len(similarities) == 0
+    with pytest.raises(ValueError):
+        IVFPQIndex(DIM, n_subvectors=5)
+
+
+def test_small_index_returns_every_vector(clustered_corpus):
+    base, queries = clustered_corpus
+    index = IVFPQIndex(DIM, n_lists=256, n_subvectors=8) # More lists than vectors
+    index.train(base[:5])
+    index.add(base[:5], np.arange(5))
+    found, _ = index.search(queries[0], 10, n_probe=index.n_lists, rerank=2)
+    assert sorted(found.tolist()) == list(range(5))
+    assert found.tolist() == exact_search(base[:5], np.arange(5), queries[0], 10).tolist()
+
+
+def test_candidate_generator_indexes_parsed_profiles(resume_pool, job_requirements_list, skill_matcher, tmp_path):
+    pool = [{**resume, "parsed_data": {k: v for k, v in resume["parsed_data"].items() if k != "rawContent"}} for resume in resume_pool]
+    generator = SemanticCandidateGenerator(skill_matcher)
+    assert generator.candidates(job_requirements_list[0]) == []
+    generator.add_resumes([])
+    assert generator.index is None
+    generator.add_resumes(pool, n_lists=8, n_subvectors=8)
+    # Profiles, not raw text: a pipeline that dropped rawContent still indexes distinct vectors
+    profiles = generator._embed([profile_text(r["parsed_data"]["skills"], r["parsed_data"]["education"]) for r in pool])
+    assert np.abs(profiles).sum(axis=1).all()
+
+    job_requirements = job_requirements_list[0]
+    shortlist = generator.candidates(job_requirements, k=20, n_probe=8)
+    assert len(shortlist) == 20 and len(set(shortlist)) == 20
+    resumes_by_id = {resume["resume_id"]: resume for resume in pool}
+    ranker = ResumeRanker()
+    assert generator.rank(job_requirements, resumes_by_id, ranker, k=20, n_probe=8) == \
+           ranker.rank_resumes_vectorized([resumes_by_id[resume_id] for resume_id in shortlist], job_requirements, skill_matcher)
+
+    generator.save(str(tmp_path))
+    assert SemanticCandidateGenerator.load(str(tmp_path), skill_matcher).candidates(job_requirements, k=20, n_probe=8) == shortlist
+
+
+def test_candidate_generator_needs_the_model(resume_pool):
+    with pytest.raises(RuntimeError):
+        SemanticCandidateGenerator(SkillMatcher(cache_dir=None, load_model=False)).add_resumes(resume_pool[:5])
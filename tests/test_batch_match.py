@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+from src.batch_match import main, read_job_descriptions
+
+
+@pytest.fixture
+def job_dirs(tmp_path, generator):
+    for directory, n in (("a", 0), ("b", 1)):
+        os.makedirs(tmp_path / directory)
+        (tmp_path / directory / "jd.txt").write_text(generator.job_description(n), encoding="utf-8")
+    (tmp_path / "b" / "analyst.txt").write_text(generator.job_description(2), encoding="utf-8")
+    return tmp_path
+
+
+def test_colliding_job_ids_are_rejected(job_dirs):
+    with pytest.raises(ValueError, match="same job id 'jd'"):
+        read_job_descriptions([str(job_dirs / "a"), str(job_dirs / "b")])
+    os.makedirs(job_dirs / "c")
+    (job_dirs / "c" / "best_jobs.txt").write_text("Python developer", encoding="utf-8")
+    with pytest.raises(ValueError, match="reserved"):
+        read_job_descriptions([str(job_dirs / "c")])
+    with pytest.raises(SystemExit):
+        main(["--job-descriptions", str(job_dirs / "a"), str(job_dirs / "b"), "--input", str(job_dirs), "--output-dir", str(job_dirs / "out")])
+
+
+def test_writes_one_ranking_per_job(job_dirs, generator, tmp_path):
+    resumes = tmp_path / "resumes"
+    os.makedirs(resumes)
+    for i in range(6):
+        (resumes / f"r{i}.txt").write_text(generator.resume_text(i), encoding="utf-8")
+    output = tmp_path / "out"
+    main(["--job-descriptions", str(job_dirs / "a"), str(job_dirs / "b" / "analyst.txt"), "--input", str(resumes),
+          "--output-dir", str(output), "--top-k", "3", "--jobs-per-candidate", "2"])
+    assert sorted(os.listdir(output)) == ["analyst.jsonl", "best_jobs.jsonl", "jd.jsonl"]
+    with open(output / "jd.jsonl", encoding="utf-8") as f:
+        assert len(f.readlines()) == 3
+    with open(output / "best_jobs.jsonl", encoding="utf-8") as f:
+        best_jobs = [json.loads(line) for line in f]
+    assert len(best_jobs) == 6
+    assert all({job["job"] for job in candidate["jobs"]} == {"jd", "analyst"} for candidate in best_jobs)
@@ -0,0 +1,106 @@
+import csv
+import json
+import os
+
+import pytest
+
+from src import batch_rank
+
+from src.batch_rank import OUTPUT_FIELDS, attach_duplicates, iter_deduplicated_resumes, iter_directory, main, rank_stream, write_results
+from src.ml.job_description import process_job_description
+from src.ml.ranker import ResumeRanker
+from src.ml.skill_matcher import SkillMatcher
+from src.nlp.near_duplicates import NearDuplicateDetector
+
+
+@pytest.fixture
+def resume_dir(tmp_path, generator):
+    """Two different resumes that share a file name in different directories, plus an edited copy of one of them."""
+    files = {"a/resume.txt": generator.resume_text(0), "b/resume.txt": generator.resume_text(1),
+             "b/resume_v2.txt": generator.near_duplicate_text(1), "c/other.txt": generator.resume_text(2)}
+    for name, text in files.items():
+        os.makedirs(tmp_path / "resumes" / os.path.dirname(name), exist_ok=True)
+        (tmp_path / "resumes" / name).write_text(text, encoding="utf-8")
+    return str(tmp_path / "resumes")
+
+
+@pytest.fixture
+def job_file(tmp_path, generator):
+    path = tmp_path / "job.txt"
+    path.write_text(generator.job_description(0), encoding="utf-8")
+    return str(path)
+
+
+def rank_deduplicated(resume_dir, parser, generator, cleaner):
+    stats = {}
+    resumes, duplicates = iter_deduplicated_resumes(iter_directory(resume_dir), parser, NearDuplicateDetector(cleaner=cleaner), stats)
+    job_requirements = process_job_description(generator.job_description(0), parser.taxonomy)
+    ranked = rank_stream(resumes, job_requirements, ResumeRanker(), SkillMatcher(cache_dir=None, load_model=False), 10, stats=stats)
+    return attach_duplicates(ranked, duplicates), stats
+
+
+def test_dedup_attaches_duplicates_by_source(resume_dir, parser, generator, word_cleaner):
+    ranked, stats = rank_deduplicated(resume_dir, parser, generator, word_cleaner)
+    assert stats["near_duplicates"] == 1
+    duplicates = {record["original_source"]: record["duplicates"] for record in ranked}
+    assert set(duplicates) == {os.path.join("a", "resume.txt"), os.path.join("b", "resume.txt"), os.path.join("c", "other.txt")}
+    # Same resume_id, different sources: only the edited copy's own original lists it
+    assert duplicates[os.path.join("a", "resume.txt")] == []
+    [duplicate] = duplicates[os.path.join("b", "resume.txt")]
+    assert duplicate["resume_id"] == "resume_v2" and duplicate["original_source"] == os.path.join("b", "resume_v2.txt")
+    assert duplicate["similarity"] >= 0.7
+
+
+def test_dedup_csv_lists_duplicate_ids(resume_dir, parser, generator, word_cleaner, tmp_path):
+    ranked, _ = rank_deduplicated(resume_dir, parser, generator, word_cleaner)
+    output = str(tmp_path / "top.csv")
+    write_results(ranked, output)
+    with open(output, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    assert reader.fieldnames == OUTPUT_FIELDS + ["duplicates"]
+    assert {row["original_source"]: row["duplicates"] for row in rows} == {
+        os.path.join("a", "resume.txt"): "", os.path.join("b", "resume.txt"): "resume_v2", os.path.join("c", "other.txt"): ""}
+
+
+def test_plain_output_has_no_duplicates(resume_dir, job_file, tmp_path):
+    jsonl_output, csv_output = str(tmp_path / "top.jsonl"), str(tmp_path / "top.csv")
+    main(["--job-description", job_file, "--input", resume_dir, "--output", jsonl_output])
+    main(["--job-description", job_file, "--input", resume_dir, "--output", csv_output])
+    with open(jsonl_output, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 4
+    assert all(list(row) == OUTPUT_FIELDS for row in rows)
+    with open(csv_output, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        assert len(list(reader)) == 4
+    assert reader.fieldnames == OUTPUT_FIELDS
+
+
+def test_prune_on_empty_input(tmp_path, job_file, capsys):
+    os.makedirs(tmp_path / "empty")
+    output = str(tmp_path / "top.jsonl")
+    main(["--job-description", job_file, "--input", str(tmp_path / "empty"), "--output", output, "--prune"])
+    with open(output, encoding="utf-8") as f:
+        assert f.read() == ""
+    assert "Pruning: 0 resumes skipped" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("prune", [False, True])
+def test_rank_stream_with_no_slots(resume_pool, job_requirements_list, prune):
+    matcher = SkillMatcher(cache_dir=None, load_model=False)
+    assert rank_stream(iter(resume_pool), job_requirements_list[0], ResumeRanker(), matcher, 0, chunk_size=50, prune=prune) == []
+
+
+def test_top_k_must_be_positive(job_file, resume_dir):
+    with pytest.raises(SystemExit):
+        main(["--job-description", job_file, "--input", resume_dir, "--top-k", "0"])
+
+
+def test_progress_is_throttled(resume_pool, job_requirements_list, monkeypatch, capsys):
+    matcher = SkillMatcher(cache_dir=None, load_model=False)
+    rank_stream(iter(resume_pool), job_requirements_list[0], ResumeRanker(), matcher, 5, chunk_size=10)
+    assert "Scored" not in capsys.readouterr().err
+    monkeypatch.setattr(batch_rank, "PROGRESS_INTERVAL_SECONDS", 0.0)
+    rank_stream(iter(resume_pool), job_requirements_list[0], ResumeRanker(), matcher, 5, chunk_size=10)
+    assert capsys.readouterr().err.count("Scored") == len(resume_pool) // 10
@@ -0,0 +1,20 @@
+from src.benchmarks.corpus import CorpusGenerator
+from src.benchmarks.run import BenchmarkSuite, compare_results
+
+
+def test_keyword_only_suite_runs_scoring_stages():
+    suite = BenchmarkSuite(CorpusGenerator(seed=3), repeats=1)
+    assert suite.backend is None
+    for stage in ("rank", "multi_job", "end_to_end"):
+        entry = suite.run_stage(stage, 20)
+        assert "skipped" not in entry, entry
+        assert entry["items"] > 0
+    assert suite.run_stage("embed", 20)["skipped"] == "the embedding model is not loaded"
+
+
+def test_compare_skips_rss_when_either_run_lacks_it():
+    baseline = {"results": [{"stage": "rank", "scale": 10, "items_per_second": 100.0, "peak_rss_mb": 50.0}]}
+    in_process = {"results": [{"stage": "rank", "scale": 10, "items_per_second": 100.0}]}
+    grown = {"results": [{"stage": "rank", "scale": 10, "items_per_second": 100.0, "peak_rss_mb": 80.0}]}
+    assert not compare_results(baseline, in_process)[0]["regressed"]
+    assert compare_results(baseline, grown)[0]["regressed"]
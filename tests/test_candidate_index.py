@@ -0,0 +1,53 @@
+import numpy as np
+
+from src.ml.candidate_index import CandidateIndex
+from src.ml.ranker import ResumeRanker
+
+
+def build_index(resume_pool, path=None):
+    index = CandidateIndex(path)
+    for resume in resume_pool:
+        index.add(resume["resume_id"], resume["parsed_data"], resume["original_source"])
+    return index
+
+
+def test_rank_matches_vectorized_ranking_of_shortlist(resume_pool, job_requirements_list, skill_matcher):
+    index = build_index(resume_pool)
+    ranker = ResumeRanker()
+    for job_requirements in job_requirements_list:
+        shortlist = [resume_pool[doc_id] for doc_id in index.retrieve(job_requirements)]
+        expected = ranker.rank_resumes_vectorized(shortlist, job_requirements, skill_matcher, top_k=20)
+        ranked = index.rank(job_requirements, skill_matcher, ranker, top_k=20)
+        assert [(r["resume_id"], r["score"], r["estimated_experience_years"]) for r in ranked] == \
+               [(r["resume_id"], r["score"], r["estimated_experience_years"]) for r in expected]
+
+
+def test_rank_reuses_stored_experience_estimates(resume_pool, job_requirements_list, skill_matcher, monkeypatch):
+    index = build_index(resume_pool)
+    ranker = ResumeRanker()
+
+    def fail(experience_keywords):
+        raise AssertionError("experience re-estimated at query time")
+
+    monkeypatch.setattr(ranker, "estimate_experience_years", fail)
+    assert index.rank(job_requirements_list[0], skill_matcher, ranker, top_k=5)
+
+
+def test_compact_drops_deleted_docs(resume_pool, job_requirements_list, tmp_path):
+    index = build_index(resume_pool[:40])
+    deleted = {resume["resume_id"] for resume in resume_pool[:40:3]}
+    for resume_id in deleted:
+        assert index.delete(resume_id)
+    index.add(resume_pool[1]["resume_id"], resume_pool[1]["parsed_data"]) # Re-add leaves one more tombstone
+    live_before = {index.docs[doc_id]["resume_id"] for doc_id in index.retrieve(job_requirements_list[0])}
+
+    index.compact()
+    assert len(index.docs) == len(index) == 40 - len(deleted)
+    assert all(doc is not None for doc in index.docs)
+    assert all(index.docs[doc_id]["resume_id"] == resume_id for resume_id, doc_id in index.doc_ids.items())
+    assert {index.docs[doc_id]["resume_id"] for doc_id in index.retrieve(job_requirements_list[0])} == live_before
+
+    index.save(str(tmp_path))
+    reloaded = CandidateIndex(str(tmp_path))
+    assert reloaded.docs == index.docs
+    assert np.array_equal(reloaded.retrieve(job_requirements_list[0]), index.retrieve(job_requirements_list[0]))
@@ -0,0 +1,54 @@
+import re
+
+import numpy as np
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.ml.embedding_backends import BACKENDS, _kendall_tau, compare_backends, create_backend
+from src.ml.skill_matcher import SkillMatcher
+from src.nlp.taxonomy import get_default_taxonomy
+
+
+def test_identical_backends_agree_exactly(static_matcher_factory):
+    report = compare_backends(static_matcher_factory(), static_matcher_factory())
+    assert report == {
+        "skill_similarity_mean_abs_error": 0.0, "skill_similarity_max_abs_error": 0.0,
+        "final_score_mean_abs_error": 0.0, "final_score_max_abs_error": 0, "skill_match_pct_mean_abs_error": 0.0,
+        "ranking_kendall_tau_mean": 1.0, "top3_overlap_mean": 1.0,
+    }
+
+
+def test_agreement_degrades_with_drift(static_matcher_factory):
+    reference = static_matcher_factory()
+    slight, heavy = static_matcher_factory(noise=0.05), static_matcher_factory(noise=2.0)
+    slight_report, heavy_report = compare_backends(reference, slight), compare_backends(reference, heavy)
+
+    skills = get_default_taxonomy().terms("skills")
+    error = np.abs(cosine_similarity(reference.embed_texts(skills)) - cosine_similarity(slight.embed_texts(skills)))
+    assert slight_report["skill_similarity_mean_abs_error"] == round(float(error.mean()), 4)
+    assert slight_report["skill_similarity_max_abs_error"] == round(float(error.max()), 4)
+
+    assert 0 < slight_report["skill_similarity_mean_abs_error"] < heavy_report["skill_similarity_mean_abs_error"]
+    assert slight_report["skill_match_pct_mean_abs_error"] <= heavy_report["skill_match_pct_mean_abs_error"]
+    for report in (slight_report, heavy_report):
+        assert -1.0 <= report["ranking_kendall_tau_mean"] <= 1.0
+        assert 0.0 <= report["top3_overlap_mean"] <= 1.0
+
+
+def test_top_k_names_the_overlap_metric(static_matcher_factory):
+    report = compare_backends(static_matcher_factory(), static_matcher_factory(noise=0.05), top_k=5)
+    assert "top5_overlap_mean" in report and "top3_overlap_mean" not in report
+
+
+def test_kendall_tau():
+    assert _kendall_tau(list("abcd"), list("abcd")) == 1.0
+    assert _kendall_tau(list("abcd"), list("dcba")) == -1.0
+    assert _kendall_tau(list("abc"), list("bac")) == pytest.approx(1 / 3)
+    assert _kendall_tau(["a"], ["a"]) == 1.0
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown embedding backend 'fp16'"):
+        create_backend("fp16", "model")
+    with pytest.raises(ValueError, match=re.escape(str(BACKENDS))):
+        SkillMatcher(backend="fp16", cache_dir=None)
@@ -0,0 +1,82 @@
+import threading
+
+import numpy as np
+
+from src.ml.embedding_cache import EmbeddingCache, LRUEmbeddingCache, MmapVectorStore, build_disk_cache
+from src.ml.skill_matcher import SkillMatcher
+
+
+def vector(value, dim=4):
+    return np.full(dim, value, dtype=np.float32)
+
+
+def test_lru_evicts_least_recently_used_by_bytes():
+    cache = LRUEmbeddingCache(max_bytes=3 * vector(0).nbytes)
+    for key in "abc":
+        cache.put(key, vector(ord(key)))
+    assert cache.get("a") is not None # "b" is now the least recently used
+    cache.put("d", vector(1))
+    assert cache.get("b") is None
+    assert [key for key in "acd" if cache.get(key) is not None] == ["a", "c", "d"]
+    assert cache.current_bytes == 3 * vector(0).nbytes
+
+    cache.put("e", vector(2, dim=8)) # Two slots' worth: evicts the two least recently used
+    assert len(cache) == 2 and cache.current_bytes == 3 * vector(0).nbytes
+    cache.put("huge", vector(3, dim=64)) # Larger than the whole budget: not cached at all
+    assert cache.get("huge") is None and len(cache) == 2
+
+    cache.put("e", vector(5)) # Replacing an entry accounts for the old vector's bytes
+    assert cache.current_bytes == 2 * vector(0).nbytes
+
+
+def test_disk_hits_are_promoted_to_memory(tmp_path):
+    MmapVectorStore.write(str(tmp_path), "model", ["python", "sql"], np.vstack([vector(1), vector(2)]))
+    cache = EmbeddingCache("model", disk_path=str(tmp_path))
+    assert np.array_equal(cache.get("  Python "), vector(1)) # Keys are normalized
+    assert np.array_equal(cache.get("python"), vector(1))
+    assert cache.get("java") is None
+    stats = cache.stats()
+    assert (stats["hits_disk"], stats["hits_memory"], stats["misses"]) == (1, 1, 1)
+    assert stats["memory_entries"] == 1 and stats["disk_entries"] == 2
+
+
+def test_caches_are_isolated_by_model_name(tmp_path, capsys):
+    MmapVectorStore.write(str(tmp_path), "model-a", ["python"], vector(1)[None, :])
+    other = EmbeddingCache("model-b", disk_path=str(tmp_path))
+    assert "built for model-a" in capsys.readouterr().out
+    assert other.get("python") is None and other.stats()["disk_entries"] == 0
+    same = EmbeddingCache("model-a", disk_path=str(tmp_path))
+    assert same.get("python") is not None
+
+
+def test_counters_are_exact_across_threads():
+    cache = EmbeddingCache("model", disk_path=None)
+    cache.put("python", vector(1))
+
+    def lookups():
+        for _ in range(2000):
+            cache.get("python")
+            cache.get("missing")
+
+    threads = [threading.Thread(target=lookups) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert (stats["hits_memory"], stats["misses"]) == (16000, 16000)
+
+
+def test_embed_texts_caches_rows_that_own_their_memory(skill_matcher):
+    skill_matcher.embed_texts(["python", "sql", "machine learning"])
+    cached = skill_matcher.cache.peek("sql")
+    assert cached is not None and cached.base is None
+    assert skill_matcher.cache.memory.current_bytes == 3 * cached.nbytes
+
+
+def test_build_disk_cache_stores_normalized_keys(static_table, tmp_path):
+    matcher = SkillMatcher(backend="static", cache_dir=None, static_table_path=static_table)
+    build_disk_cache(matcher, ["Machine Learning", "machine  learning", "python"], path=str(tmp_path))
+    store = MmapVectorStore(str(tmp_path), matcher.embedding_id)
+    assert sorted(store.rows) == ["machine learning", "python"]
+    assert np.array_equal(store.get("machine learning"), matcher.embed_texts(["Machine Learning"], use_cache=False)[0])
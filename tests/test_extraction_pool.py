@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+
+import pytest
+
+from src.utils import extraction_pool
+from src.utils.extraction_pool import ExtractionPool
+
+# Extractors run in spawned workers, so they live at module level where the children can import them
+_retained = []
+
+
+def resident_block(mb):
+    block = bytearray(mb * 1024 * 1024)
+    for offset in range(0, len(block), 4096): # Touch every page so it counts towards RSS
+        block[offset] = 1
+    return block
+
+
+def echo_pid(file_name, file_bytes):
+    return f"{file_bytes.decode()} {os.getpid()}"
+
+
+def misbehave(file_name, file_bytes):
+    if file_name == "hang.txt":
+        time.sleep(60)
+    elif file_name == "crash.txt":
+        os._exit(3)
+    elif file_name == "grow.txt":
+        _retained.append(resident_block(300)) # Held past the end of the file
+    elif file_name == "balloon.txt":
+        block = resident_block(300)
+        time.sleep(60)
+    return echo_pid(file_name, file_bytes)
+
+
+def extract_all(pool, names):
+    results = list(pool.extract((name, name.encode()) for name in names))
+    return {result["file_name"]: result for result in sorted(results, key=lambda result: result["index"])}
+
+
+def worker_pid(result):
+    return result["text"].split()[-1]
+
+
+def test_workers_are_reused_between_files():
+    with ExtractionPool(max_workers=1, extractor=echo_pid) as pool:
+        results = extract_all(pool, ["a.txt", "b.txt"])
+        assert all(result["ok"] for result in results.values())
+        assert worker_pid(results["a.txt"]) == worker_pid(results["b.txt"])
+
+
+def test_timeout_kills_and_replaces_the_worker():
+    with ExtractionPool(max_workers=1, timeout=1, extractor=misbehave) as pool:
+        started = time.monotonic()
+        results = extract_all(pool, ["hang.txt", "after.txt"])
+        assert time.monotonic() - started < 30
+        assert not results["hang.txt"]["ok"] and results["hang.txt"]["error"].startswith("Timed out")
+        assert results["after.txt"]["ok"] and results["after.txt"]["text"].startswith("after.txt")
+
+
+def test_crashed_worker_is_reported_and_replaced():
+    with ExtractionPool(max_workers=1, extractor=misbehave) as pool:
+        results = extract_all(pool, ["before.txt", "crash.txt", "after.txt"])
+        assert results["crash.txt"]["error"] == "Worker exited unexpectedly (exit code 3)."
+        assert results["before.txt"]["ok"] and results["after.txt"]["ok"]
+        assert worker_pid(results["before.txt"]) != worker_pid(results["after.txt"])
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RSS ceiling sizes assume Linux accounting")
+def test_worker_over_the_ceiling_is_recycled_after_its_file(monkeypatch):
+    # Without /proc in the parent (as on macOS) the worker's own post-file check is what recycles it
+    monkeypatch.setattr(extraction_pool, "_process_rss_bytes", lambda pid="self": None)
+    with ExtractionPool(max_workers=1, max_worker_rss_mb=200, extractor=misbehave) as pool:
+        results = extract_all(pool, ["grow.txt", "after.txt"])
+        assert results["grow.txt"]["ok"] and results["after.txt"]["ok"]
+        assert worker_pid(results["grow.txt"]) != worker_pid(results["after.txt"])
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="The parent reads worker RSS from /proc")
+def test_worker_growing_mid_file_is_killed_before_the_timeout():
+    with ExtractionPool(max_workers=1, timeout=60, max_worker_rss_mb=200, extractor=misbehave) as pool:
+        started = time.monotonic()
+        results = extract_all(pool, ["balloon.txt", "after.txt"])
+        assert time.monotonic() - started < 30
+        assert results["balloon.txt"]["error"] == "Worker exceeded the 200 MB memory ceiling."
+        assert results["after.txt"]["ok"]
+
+
+def test_peak_rss_fallback_scales_by_platform(monkeypatch):
+    import resource
+
+    class Usage:
+        ru_maxrss = 2048
+    monkeypatch.setattr(extraction_pool, "_process_rss_bytes", lambda pid="self": None)
+    monkeypatch.setattr(resource, "getrusage", lambda who: Usage())
+    monkeypatch.setattr(sys, "platform", "darwin")
+    assert extraction_pool._current_rss_bytes() == 2048
+    monkeypatch.setattr(sys, "platform", "linux")
+    assert extraction_pool._current_rss_bytes() == 2048 * 1024
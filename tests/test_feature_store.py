@@ -0,0 +1,63 @@
+import pytest
+
+from src.ml import feature_store as feature_store_module
+from src.ml.candidate_store import CandidateStore
+from src.ml.feature_store import ResumeFeatureStore
+from src.ml.ranker import ResumeRanker
+
+
+def summary(ranked):
+    return [(r["resume_id"], r["score"], r["skill_match_score"], r["estimated_experience_years"]) for r in ranked]
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(feature_store_module, "SCORING_CHUNK_SIZE", 7)
+
+
+def test_rank_matches_vectorized_ranking(resume_pool, job_requirements_list, skill_matcher, small_chunks):
+    ranker = ResumeRanker()
+    store = ResumeFeatureStore(resume_pool, ranker)
+    for job_requirements in job_requirements_list:
+        assert summary(store.rank(job_requirements, skill_matcher, ranker)) == \
+               summary(ranker.rank_resumes_vectorized(resume_pool, job_requirements, skill_matcher))
+    store.candidates.close()
+
+
+def test_rank_follows_store_growth(resume_pool, job_requirements_list, skill_matcher, small_chunks):
+    ranker = ResumeRanker()
+    candidates = CandidateStore.from_resumes(resume_pool[:50], ranker=ranker)
+    store = ResumeFeatureStore(candidates, ranker)
+    job_requirements = job_requirements_list[0]
+    assert len(store.rank(job_requirements, skill_matcher, ranker)) == 50
+    snapshot = candidates.experience_years
+
+    for resume in resume_pool[50:]:
+        candidates.add(resume["resume_id"], resume["parsed_data"], resume["original_source"])
+    assert len(snapshot) == 50
+    assert summary(store.rank(job_requirements, skill_matcher, ranker)) == \
+           summary(ranker.rank_resumes_vectorized(resume_pool, job_requirements, skill_matcher))
+    assert set(store.last_recomputed) == {"skill", "experience", "education"}
+    candidates.close()
+
+
+@pytest.mark.parametrize("model_loaded", [True, False])
+def test_rank_jobs_matches_single_job_rank(resume_pool, job_requirements_list, skill_matcher, small_chunks, model_loaded):
+    from src.ml.skill_matcher import SkillMatcher
+    matcher = skill_matcher if model_loaded else SkillMatcher(cache_dir=None, load_model=False)
+    ranker = ResumeRanker()
+    store = ResumeFeatureStore(resume_pool, ranker)
+    # Shared requirements, a job without skills and a job whose only skill has no embedding
+    jobs = job_requirements_list + [job_requirements_list[0], {"required_skills": [], "min_experience_years": 2},
+                                    {"required_skills": [" "], "required_education": ["bachelor"]}]
+    result = store.rank_jobs(jobs, matcher, ranker, top_k=25, jobs_per_candidate=2)
+    for n, job_requirements in enumerate(jobs):
+        features = store.features(job_requirements, matcher, ranker)
+        assert (result["skill_scores"][:, n] == features["skill"]).all()
+        assert (result["scores"][:, n] == ranker.combine_scores(features)).all()
+        assert summary(result["rankings"][n]) == summary(store.rank(job_requirements, matcher, ranker, top_k=25))
+
+    for i, candidate in enumerate(result["best_jobs"]):
+        best = sorted(range(len(jobs)), key=lambda n: -result["scores"][i, n])[:2]
+        assert [job["job"] for job in candidate["jobs"]] == best
+    store.candidates.close()
@@ -0,0 +1,44 @@
+from src.utils import gcp_utils
+from src.utils.gcs_ingest import LocalBucket, ingest
+
+
+class FailingParser:
+    def parse_file(self, name, data):
+        if name.startswith("bad"):
+            raise ValueError("unreadable")
+        return data.decode("utf-8"), {"skills": []}
+
+
+def test_ingest_reports_errors_on_stderr(tmp_path, capsys):
+    bucket = LocalBucket(str(tmp_path))
+    bucket.write("good.txt", b"Python developer")
+    bucket.write("bad.txt", b"garbage")
+    stats = {}
+    resumes = list(ingest(bucket, FailingParser(), max_workers=2, stats=stats))
+    assert [resume["resume_id"] for resume in resumes] == ["good"]
+    assert stats["parse_failed"] == 1
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Error processing 'bad.txt'" in captured.err
+
+
+def test_ingest_reports_download_failures_on_stderr(tmp_path, capsys):
+    bucket = LocalBucket(str(tmp_path), transient_failure_rate=1.0)
+    bucket.write("resume.txt", b"Python developer")
+    stats = {}
+    assert list(ingest(bucket, FailingParser(), max_workers=1, retries=0, stats=stats)) == []
+    assert stats["failed"] == 1
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Error downloading 'resume.txt'" in captured.err
+
+
+def test_storage_client_pool_size_is_fixed_by_the_first_call(monkeypatch, capsys):
+    client = object()
+    monkeypatch.setattr(gcp_utils, "_client", client)
+    monkeypatch.setattr(gcp_utils, "_client_pool_size", 16)
+    assert gcp_utils.get_storage_client() is client
+    assert gcp_utils.get_storage_client(16) is client
+    assert capsys.readouterr().err == ""
+    assert gcp_utils.get_storage_client(32) is client
+    assert "not resizing it to 32" in capsys.readouterr().err
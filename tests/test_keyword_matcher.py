@@ -0,0 +1,52 @@
+import pytest
+
+from src.ml.job_description import process_job_description
+from src.nlp.keyword_matcher import KeywordMatcher
+from src.nlp.taxonomy import Taxonomy
+
+
+def found(keywords, text):
+    return sorted(keywords[keyword_id] for keyword_id in KeywordMatcher(keywords).find(text))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("maintained the ai platform", ["ai"]),
+    ("maintained legacy systems", []), # "ai" inside a word
+    ("ai-driven tooling (ai)", ["ai"]),
+    ("sql,python;ai", ["ai", "python", "sql"]),
+    ("pythonic sqlite", []),
+])
+def test_matches_respect_word_boundaries(text, expected):
+    assert found(["ai", "python", "sql"], text) == expected
+
+
+def test_keywords_ending_in_punctuation_match_before_word_characters():
+    assert found(["ph.d.", "c++"], "ph.d.x and c++17") == ["c++", "ph.d."]
+
+
+def test_overlapping_keywords_are_all_found():
+    keywords = ["ai", "vertex ai", "big data", "data science", "science"]
+    # The longest keyword is reported along with the keywords it contains or overlaps
+    assert found(keywords, "vertex ai") == ["ai", "vertex ai"]
+    assert found(keywords, "big data science") == ["big data", "data science", "science"]
+    # Reaching "data science" needs a failure link out of the partial match "big data s..."
+    assert found(["big data systems", "data science"], "big data science") == ["data science"]
+
+
+def test_empty_keyword_list_and_text():
+    assert found([], "python") == []
+    assert found(["python"], "") == []
+
+
+def test_taxonomy_reports_aliases_as_canonical_terms():
+    taxonomy = Taxonomy({"education": {"ph.d": ["phd", "ph.d."], "master": ["masters"]}, "skills": ["Machine   Learning"]})
+    matches = taxonomy.match("PhD and a Ph.D. in\nMachine\tLearning; two Masters")
+    assert matches == {"education": ["ph.d", "master"], "skills": ["machine learning"]}
+
+
+def test_job_description_education_uses_canonical_terms():
+    requirements = process_job_description("Senior engineer, 5+ years experience in Python and Vertex AI. "
+                                           "Master's degree or PhD in Computer Science; B. Tech considered.")
+    assert requirements["required_education"] == ["master", "ph.d", "degree", "b.tech", "computer science"]
+    assert requirements["required_skills"] == ["python", "vertex ai", "ai"]
+    assert requirements["min_experience_years"] == 5
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+# Instrumentation is applied at import time, so the enabled path runs in a fresh interpreter
+RANK_WITH_METRICS = """
+import sys
+from src.benchmarks.corpus import CorpusGenerator
+from src.ml.feature_store import ResumeFeatureStore
+from src.ml.job_description import process_job_description
+from src.ml.ranker import ResumeRanker
+from src.ml.resume_parser import ResumeParser
+from src.ml.skill_matcher import SkillMatcher
+from src.utils.metrics import REGISTRY
+
+generator, parser, ranker = CorpusGenerator(seed=7), ResumeParser(), ResumeRanker()
+matcher = SkillMatcher(backend="static", cache_dir=None, static_table_path=sys.argv[1])
+resumes = [{"resume_id": str(i), "original_source": None, "parsed_data": parser.parse_text(generator.resume_text(i))} for i in range(20)]
+jobs = [process_job_description(generator.job_description(n), parser.taxonomy) for n in range(2)]
+store = ResumeFeatureStore(resumes, ranker)
+store.rank(jobs[0], matcher, ranker)
+store.rank_jobs(jobs, matcher, ranker)
+ranker.rank_resumes_vectorized(resumes, jobs[1], matcher)
+print(REGISTRY.to_prometheus())
+"""
+
+
+def test_main_ranking_paths_are_instrumented(static_table):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", RANK_WITH_METRICS, static_table], cwd=root, capture_output=True, text=True,
+                            env={**os.environ, "RESUME_METRICS": "1", "PYTHONPATH": root}, timeout=120)
+    assert result.returncode == 0, result.stderr
+    output = result.stdout
+    for name in ("feature_store_rank", "feature_store_rank_jobs", "build_features", "embed_texts", "parse_text", "process_job_description"):
+        assert f'resume_span_seconds_count{{span="{name}"}}' in output, name
+    assert 'resume_span_seconds_count{span="feature_store_rank"} 1' in output
+    assert "resume_resumes_ranked_total 80" in output # 20 + 2 jobs x 20 + 20
+    assert "resume_embedding_texts_total" in output
+    assert "resume_embedding_cache_misses" in output
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from src.nlp.near_duplicates import NearDuplicateDetector
+
+
+@pytest.fixture
+def detector(word_cleaner):
+    return NearDuplicateDetector(0.7, cleaner=word_cleaner)
+
+
+def edit_chain(length=10, words=400, block=40):
+    """Documents where each one rewrites one more block of words than the previous one."""
+    return [" ".join(f"edit{p}" if p // block < k else f"word{p}" for p in range(words)) for k in range(length)]
+
+
+def test_chained_edits_are_not_clustered_transitively(detector):
+    texts = edit_chain()
+    signatures = detector.signatures(texts)
+    assert (signatures[0] == signatures[-1]).mean() < detector.threshold
+    representatives, similarity = detector.cluster(signatures)
+    assert representatives[0] == 0 and representatives[-1] != 0
+    assert len(np.unique(representatives)) >= 3
+    for i, representative in enumerate(representatives):
+        assert representative <= i
+        assert (signatures[i] == signatures[representative]).mean() == similarity[i] >= detector.threshold
+
+
+def test_unrelated_resumes_stay_separate(detector, generator):
+    texts = [generator.resume_text(i) for i in range(40)] + [generator.near_duplicate_text(3, 1), generator.near_duplicate_text(17, 2)]
+    representatives, duplicates = detector.group(texts)
+    assert representatives == list(range(40))
+    assert {representative: [i for i, _ in members] for representative, members in duplicates.items()} == {3: [40], 17: [41]}
+    assert all(similarity >= detector.threshold for members in duplicates.values() for _, similarity in members)
+
+
+def test_bucketed_pairs_are_verified_against_the_threshold(detector):
+    rng = np.random.default_rng(0)
+    original = rng.integers(0, 2 ** 32, detector.num_perm, dtype=np.uint32)
+    band_only = original + np.uint32(1)
+    band_only[:detector.rows] = original[:detector.rows] # Shares the first band bucket, nothing else
+    close = original.copy()
+    close[-detector.num_perm // 10:] += np.uint32(1)
+    unrelated = rng.integers(0, 2 ** 32, detector.num_perm, dtype=np.uint32)
+    representatives, similarity = detector.cluster(np.vstack([original, band_only, close, unrelated]))
+    assert representatives.tolist() == [0, 1, 0, 3]
+    assert similarity[2] == (close == original).mean() >= detector.threshold
+
+
+def test_unrelated_bucket_leader_does_not_hide_duplicates(detector):
+    # B and C agree on the first half of the bands, where A leads every bucket, and on most other positions
+    rng = np.random.default_rng(1)
+    shared_bands = detector.bands // 2
+    b = rng.integers(0, 2 ** 32, detector.num_perm, dtype=np.uint32)
+    c = b + np.uint32(1)
+    a = b + np.uint32(2)
+    head = shared_bands * detector.rows
+    c[:head] = a[:head] = b[:head]
+    for band in range(shared_bands, detector.bands): # All but one row of each other band
+        c[band * detector.rows:(band + 1) * detector.rows - 1] = b[band * detector.rows:(band + 1) * detector.rows - 1]
+    c[detector.bands * detector.rows:] = b[detector.bands * detector.rows:]
+    signatures = np.vstack([a, b, c])
+    assert (a == b).mean() < detector.threshold and (a == c).mean() < detector.threshold <= (b == c).mean()
+    representatives, similarity = detector.cluster(signatures)
+    assert representatives.tolist() == [0, 1, 1]
+    assert similarity[2] == (b == c).mean()
+
+
+def test_exact_copies_cluster_at_threshold_one(word_cleaner):
+    detector = NearDuplicateDetector(1.0, cleaner=word_cleaner)
+    text = "Senior data engineer with Python, Spark and SQL experience across several teams."
+    representatives, duplicates = detector.group([text, text.upper(), text + " Also Kafka."])
+    assert representatives == [0, 2]
+    assert duplicates == {0: [(1, 1.0)]}
+
+
+def test_empty_and_short_texts_get_one_shingle(detector):
+    assert len(detector.shingle_hashes("")) == 1
+    assert len(detector.shingle_hashes("python sql")) == 1
+    assert len(detector.shingle_hashes("one two three four five six")) == 2
+    signatures = detector.signatures(["", "  ", "python sql", "java go"])
+    assert (signatures[0] == signatures[1]).all()
+    assert not (signatures[2] == signatures[3]).all()
+    representatives, _ = detector.group(["", "  ", "python sql", "java go"])
+    assert representatives == [0, 2, 3]
+
+
+def test_group_of_nothing(detector):
+    assert detector.group([]) == ([], {})
+
+
+@pytest.mark.parametrize("threshold", [0.0, 1.5])
+def test_threshold_must_be_a_similarity(threshold, word_cleaner):
+    with pytest.raises(ValueError):
+        NearDuplicateDetector(threshold, cleaner=word_cleaner)
@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+
+from src.ml import resume_parser
+from src.ml.parse_cache import ParseCache, content_digest
+from src.ml.resume_parser import ResumeParser
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache" / "parse.sqlite3"))
+    yield cache
+    cache.close()
+
+
+def test_second_parse_of_the_same_bytes_is_served_from_the_cache(cache, generator, monkeypatch):
+    parser = ResumeParser(cache=cache)
+    file_bytes = generator.resume_text(0).encode("utf-8")
+    text, parsed_data = parser.parse_file("resume.txt", file_bytes)
+
+    def fail(*args):
+        raise AssertionError("extracted again")
+    monkeypatch.setattr(parser, "extract_text", fail)
+    monkeypatch.setattr(parser, "parse_text", fail)
+    # Content-addressed: another file name with the same bytes is the same entry
+    assert parser.parse_file("copy.txt", file_bytes) == (text, parsed_data)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.stats()["entries"] == 1
+
+
+def test_empty_extractions_are_not_cached(cache):
+    parser = ResumeParser(cache=cache)
+    parser.parse_file("blank.txt", b"   ")
+    assert cache.stats()["entries"] == 0
+
+
+def test_parser_version_bump_invalidates_entries(tmp_path, generator, monkeypatch):
+    path = str(tmp_path / "parse.sqlite3")
+    file_bytes = generator.resume_text(1).encode("utf-8")
+    ResumeParser(cache=ParseCache(path)).parse_file("resume.txt", file_bytes)
+
+    monkeypatch.setattr(resume_parser, "PARSER_VERSION", resume_parser.PARSER_VERSION + "-next")
+    cache = ParseCache(path)
+    parser = ResumeParser(cache=cache)
+    assert cache.stats()["entries"] == 0 # Purged on startup
+    assert parser.get_cached(file_bytes) is None
+    parser.parse_file("resume.txt", file_bytes)
+    assert parser.get_cached(file_bytes) is not None
+
+
+def test_least_recently_used_entries_are_evicted_by_size(cache):
+    parsed_data = {"skills": [], "experience": [], "education": [], "contact": {"email": None, "phone": None}}
+    for name in "abc":
+        cache.put(name, "v", name * 1000, parsed_data)
+    entry_size = cache.stats()["bytes"] // 3
+    cache.max_bytes = 3 * entry_size
+    assert cache.get("a", "v") is not None # "b" is now the least recently used
+    cache.put("d", "v", "d" * 1000, parsed_data)
+    assert cache.get("b", "v") is None
+    assert [name for name in "acd" if cache.get(name, "v") is not None] == ["a", "c", "d"]
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_corrupt_row_is_a_miss_and_is_dropped(cache):
+    cache.put("digest", "v", "text", {"skills": ["python"]})
+    cache._conn.execute("UPDATE parse_results SET parsed_data = '{not json'")
+    cache._conn.commit()
+    assert cache.get("digest", "v") is None
+    assert cache.stats()["entries"] == 0 and cache.misses == 1
+    cache.put("digest", "v", "text", {"skills": ["python"]})
+    assert cache.get("digest", "v") == ("text", {"skills": ["python"], "rawContent": "text"})
+
+
+def test_corrupt_database_file_is_recreated(tmp_path, capsys):
+    path = tmp_path / "parse.sqlite3"
+    path.write_bytes(b"this is not a sqlite database" * 100)
+    cache = ParseCache(str(path))
+    assert "recreating it" in capsys.readouterr().err
+    cache.put(content_digest(b"resume"), "v", "text", {})
+    assert cache.get(content_digest(b"resume"), "v") == ("text", {"rawContent": "text"})
+    cache.close()
+    with sqlite3.connect(str(path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM parse_results").fetchone()[0] == 1
@@ -0,0 +1,102 @@
+import pytest
+
+from src.batch_rank import rank_stream
+from src.ml.ranker import ResumeRanker
+from src.ml.skill_matcher import SkillMatcher
+
+
+def summary(ranked):
+    return [(r["resume_id"], r["score"], r["skill_match_score"], r["estimated_experience_years"]) for r in ranked]
+
+
+def tied_pool(resume_pool):
+    """Every resume three times under different ids, so scores tie throughout the ranking."""
+    return [{**resume, "resume_id": f"{resume['resume_id']}_{copy}"} for copy in range(3) for resume in resume_pool[:60]]
+
+
+@pytest.mark.parametrize("top_k", [1, 10, 40])
+def test_pruned_matches_exhaustive_top_k(resume_pool, job_requirements_list, skill_matcher, top_k):
+    ranker = ResumeRanker()
+    for job_requirements in job_requirements_list:
+        stats = {}
+        pruned = ranker.rank_resumes_pruned(resume_pool, job_requirements, skill_matcher, top_k, chunk_size=16, stats=stats)
+        assert summary(pruned) == summary(ranker.rank_resumes_vectorized(resume_pool, job_requirements, skill_matcher, top_k=top_k))
+        assert stats["scored"] + stats["pruned"] == len(resume_pool)
+
+
+def test_pruned_breaks_ties_at_kth_score_like_exhaustive(resume_pool, job_requirements_list, skill_matcher):
+    ranker = ResumeRanker()
+    pool = tied_pool(resume_pool)
+    job_requirements = job_requirements_list[0]
+    exhaustive = ranker.rank_resumes_vectorized(pool, job_requirements, skill_matcher)
+    top_k = 20
+    assert exhaustive[top_k - 1]["score"] == exhaustive[top_k]["score"] # The K-th score is tied
+    pruned = ranker.rank_resumes_pruned(pool, job_requirements, skill_matcher, top_k, chunk_size=8)
+    assert summary(pruned) == summary(exhaustive[:top_k])
+
+
+def test_pruned_top_k_larger_than_pool(resume_pool, job_requirements_list, skill_matcher):
+    ranker = ResumeRanker()
+    pool = resume_pool[:30]
+    stats = {}
+    pruned = ranker.rank_resumes_pruned(pool, job_requirements_list[1], skill_matcher, len(pool) + 10, chunk_size=8, stats=stats)
+    assert summary(pruned) == summary(ranker.rank_resumes_vectorized(pool, job_requirements_list[1], skill_matcher))
+    assert stats["pruned"] == 0
+
+
+def test_pruned_without_model_uses_keyword_fallback(resume_pool, job_requirements_list):
+    ranker = ResumeRanker()
+    matcher = SkillMatcher(cache_dir=None, load_model=False)
+    for job_requirements in job_requirements_list:
+        stats = {}
+        pruned = ranker.rank_resumes_pruned(resume_pool, job_requirements, matcher, 10, chunk_size=16, stats=stats)
+        assert summary(pruned) == summary(ranker.rank_resumes_vectorized(resume_pool, job_requirements, matcher, top_k=10))
+        assert stats["scored_from_cache"] == len(resume_pool) # Keyword scores are exact in phase one
+
+
+def test_pruned_scores_cached_skills_exactly(resume_pool, job_requirements_list, skill_matcher):
+    ranker = ResumeRanker()
+    job_requirements = job_requirements_list[2]
+    skill_matcher.embed_skills([skill for resume in resume_pool[::2] for skill in resume["parsed_data"]["skills"]])
+    stats = {}
+    pruned = ranker.rank_resumes_pruned(resume_pool, job_requirements, skill_matcher, 15, chunk_size=16, stats=stats)
+    assert summary(pruned) == summary(ranker.rank_resumes_vectorized(resume_pool, job_requirements, skill_matcher, top_k=15))
+    assert stats["scored_from_cache"] > 0
+
+
+def test_cache_probe_does_not_count_lookups(resume_pool, skill_matcher):
+    skills = resume_pool[0]["parsed_data"]["skills"]
+    skill_matcher.embed_skills(skills[:1])
+    before = skill_matcher.cache.stats()
+    cached = skill_matcher.cached_skill_embeddings(skills + ["not a cached skill"])
+    assert set(cached) == set(skills[:1])
+    assert skill_matcher.cache.stats() == before
+
+
+@pytest.mark.parametrize("tied", [False, True])
+@pytest.mark.parametrize("model_loaded", [True, False])
+def test_streaming_prune_matches_exhaustive_stream(resume_pool, job_requirements_list, skill_matcher, model_loaded, tied):
+    # Chunks after the first are pruned against the heap's K-th best score (see the next test)
+    matcher = skill_matcher if model_loaded else SkillMatcher(cache_dir=None, load_model=False)
+    ranker = ResumeRanker()
+    pool = tied_pool(resume_pool) if tied else resume_pool
+    for n, job_requirements in enumerate(job_requirements_list):
+        stats = {}
+        pruned = rank_stream(iter(pool), job_requirements, ranker, matcher, 12, chunk_size=25, stats=stats, prune=True)
+        assert summary(pruned) == summary(rank_stream(iter(pool), job_requirements, ranker, matcher, 12, chunk_size=25))
+        assert summary(pruned) == summary(ranker.rank_resumes_vectorized(pool, job_requirements, matcher, top_k=12))
+
+
+def test_min_score_seed_prunes_below_earlier_kth_best(resume_pool, job_requirements_list, static_table):
+    ranker = ResumeRanker()
+    job_requirements = job_requirements_list[2]
+    reference_matcher = SkillMatcher(backend="static", cache_dir=None, static_table_path=static_table)
+    exhaustive = ranker.combine_scores(ranker.build_features(resume_pool, job_requirements, reference_matcher))
+    min_score = int(exhaustive.max()) # As if an earlier batch already filled the heap with this score
+    stats = {}
+    # A fresh cache, so phase one can't score any resume exactly
+    matcher = SkillMatcher(backend="static", cache_dir=None, static_table_path=static_table)
+    indices, scores, _ = ranker.top_k_pruned(resume_pool, job_requirements, matcher, 10, chunk_size=8, min_score=min_score, stats=stats)
+    assert [i for i in indices if scores[i] >= min_score] == [i for i in ranker.top_k_indices(exhaustive, 10) if exhaustive[i] >= min_score]
+    assert (scores[indices] == exhaustive[indices]).all()
+    assert stats["pruned"] > 0
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from src.ml.ranker import ResumeRanker
+
+EDGE_CASES = [
+    {"resume_id": "no_skills", "parsed_data": {"skills": [], "experience": ["senior"], "education": ["master"]}},
+    {"resume_id": "empty", "parsed_data": {}},
+    {"resume_id": "blank_skill", "parsed_data": {"skills": [" "], "experience": ["5 years"], "education": []}},
+]
+
+
+@pytest.mark.parametrize("weights", [(0.6, 0.3, 0.1), (0.5, 0.25, 0.25), (0.2, 0.7, 0.1)])
+def test_columnar_path_matches_reference(resume_pool, job_requirements_list, skill_matcher, weights):
+    ranker = ResumeRanker(*weights)
+    pool = resume_pool + EDGE_CASES
+    for job_requirements in job_requirements_list:
+        assert ranker.compare_ranking_paths(pool, job_requirements, skill_matcher) == []
+
+
+def test_combine_scores_matches_calculate_score(resume_pool, job_requirements_list, skill_matcher):
+    ranker = ResumeRanker()
+    job_requirements = job_requirements_list[0]
+    features = ranker.build_features(resume_pool, job_requirements, skill_matcher)
+    scores = ranker.combine_scores(features)
+    expected = [ranker.calculate_score(resume["parsed_data"], job_requirements, float(skill))
+                for resume, skill in zip(resume_pool, features["skill"])]
+    assert scores.tolist() == expected
+
+
+def test_top_k_indices_breaks_ties_by_position():
+    scores = np.array([50, 70, 50, 90, 50, 70])
+    assert ResumeRanker.top_k_indices(scores, 3).tolist() == [3, 1, 5]
+    assert ResumeRanker.top_k_indices(scores, 4).tolist() == [3, 1, 5, 0]
+    assert ResumeRanker.top_k_indices(scores, 10).tolist() == [3, 1, 5, 0, 2, 4]
+    assert ResumeRanker.top_k_indices(scores, 0).tolist() == []
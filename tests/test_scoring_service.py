@@ -0,0 +1,101 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src.ml.job_description import process_job_description
+from src.ml.ranker import ResumeRanker
+from src.service.batcher import BatcherStoppedError, MicroBatcher
+from src.service.scoring_service import ScoringService, _handle_connection
+
+
+def test_stop_fails_queued_and_in_flight_items():
+    release = threading.Event()
+
+    def process_batch(items):
+        release.wait(5)
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(process_batch, max_batch_size=1, max_wait_ms=0)
+        await batcher.start()
+        submissions = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0.05) # The first item is now in flight, the others queued
+        await batcher.stop()
+        release.set()
+        results = await asyncio.wait_for(asyncio.gather(*submissions, return_exceptions=True), 1)
+        with pytest.raises(BatcherStoppedError):
+            await batcher.submit(3)
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, BatcherStoppedError) for result in results)
+
+
+async def _exchange(service, raw_request: bytes):
+    server = await asyncio.start_server(lambda r, w: _handle_connection(service, r, w), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw_request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-5"])
+def test_invalid_content_length_is_a_bad_request(parser, skill_matcher, content_length):
+    service = ScoringService(parser, skill_matcher, ResumeRanker())
+    request = f"POST /score HTTP/1.1\r\nContent-Length: {content_length}\r\n\r\n".encode("latin-1")
+    status, payload = asyncio.run(_exchange(service, request))
+    assert status == 400
+    assert "Content-Length" in payload["error"]
+
+
+def test_score_request_round_trip(parser, skill_matcher):
+    service = ScoringService(parser, skill_matcher, ResumeRanker())
+    body = json.dumps({"job_description": "Python and SQL developer with 3+ years experience.",
+                       "resume_text": "Senior engineer, 5 years experience with Python, SQL and Docker.", "resume_id": "r1"}).encode("utf-8")
+    request = b"POST /score HTTP/1.1\r\nConnection: close\r\nContent-Length: " + str(len(body)).encode("latin-1") + b"\r\n\r\n" + body
+
+    async def scenario():
+        await service.start()
+        try:
+            return await _exchange(service, request)
+        finally:
+            await service.stop()
+
+    status, payload = asyncio.run(scenario())
+    assert status == 200
+    assert payload["resume_id"] == "r1" and 0 <= payload["score"] <= 100
+
+
+@pytest.mark.parametrize("request_line", [b"GARBAGE\r\n", b"GET /healthz\r\n", b"GET /healthz HTTP/1.1 extra\r\n"])
+def test_malformed_request_line_is_a_bad_request(parser, skill_matcher, request_line):
+    service = ScoringService(parser, skill_matcher, ResumeRanker())
+    status, payload = asyncio.run(_exchange(service, request_line + b"Host: localhost\r\n\r\n"))
+    assert status == 400
+    assert payload["error"] == "Malformed request line."
+
+
+def test_score_batch_looks_each_skill_up_once(parser, skill_matcher, generator):
+    service = ScoringService(parser, skill_matcher, ResumeRanker())
+    jobs = [generator.job_description(n) for n in range(2)]
+    requests = [{"job_description": jobs[i % 2], "resume_text": generator.resume_text(i), "resume_id": str(i)} for i in range(6)]
+    results = service.score_batch(requests)
+
+    job_skills = [process_job_description(job, parser.taxonomy)["required_skills"] for job in jobs]
+    resume_skills = [parser.parse_text(request["resume_text"])["skills"] for request in requests]
+    unique_skills = {skill for skills in job_skills + resume_skills for skill in skills}
+    stats = skill_matcher.cache.stats()
+    assert stats["hits_memory"] + stats["hits_disk"] + stats["misses"] == len(unique_skills)
+
+    ranker = ResumeRanker()
+    for i, result in enumerate(results):
+        resume = {"resume_id": str(i), "original_source": "api", "parsed_data": {**parser.parse_text(requests[i]["resume_text"])}}
+        resume["parsed_data"].pop("rawContent")
+        requirements = process_job_description(requests[i]["job_description"], parser.taxonomy)
+        assert result == ranker.rank_resumes_vectorized([resume], requirements, skill_matcher)[0]